@@ -0,0 +1 @@
+ALTER TABLE `recipe_ingredients` ADD `cooking_factor` real;
\ No newline at end of file
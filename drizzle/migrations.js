@@ -7,6 +7,8 @@ import m0002 from './0002_aberrant_kate_bishop.sql';
 import m0003 from './0003_clear_kylun.sql';
 import m0004 from './0004_deep_invaders.sql';
 import m0005 from './0005_puzzling_jetstream.sql';
+import m0006 from './0006_wandering_reverse_flash.sql';
+import m0007 from './0007_steady_silver_sable.sql';
 
   export default {
     journal,
@@ -16,7 +18,9 @@ m0001,
 m0002,
 m0003,
 m0004,
-m0005
+m0005,
+m0006,
+m0007
     }
   }
   
\ No newline at end of file
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: HtmlDocument (parse once, scripts/styles dropped) vs the legacy soup scrapers.
+
+Pages are HTML as the scraper receives it:
+- --pages DIR: saved .html pages; the file name decides the site parser
+  (containing "soscuisine" or "giallozafferano", else generic JSON-LD)
+- default: GialloZafferano-style pages rebuilt from ../docs/DB-esempio/ricette.db,
+  with inline scripts, styles and menus mimicking the real site's weight
+
+Also checks that title, ingredients and steps match the legacy scrapers on every page.
+
+Usage:
+    uv run python scripts/bench_html.py
+    uv run python scripts/bench_html.py --backend html.parser --pages saved_pages/
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from recipe_manager.services.html_doc import available_backends, default_backend
+from recipe_manager.services.parser import parse_ingredient_line, scan_recipe_text
+from recipe_manager.services.scraper import parse_recipe_html
+
+LEGACY_DB = Path(__file__).parents[2] / "docs" / "DB-esempio" / "ricette.db"
+
+
+# ============ Legacy implementation (soup per page, html.parser, repeated get_text) ============
+
+def legacy_giallozafferano(html: str) -> tuple:
+    soup = BeautifulSoup(html, "html.parser")
+    title_elem = soup.find("h1")
+    name_it = title_elem.get_text(strip=True) if title_elem else "Unknown Recipe"
+    facts = scan_recipe_text(soup.get_text())
+    ingredients = []
+    for item in soup.select(".gz-ingredient"):
+        parsed = parse_ingredient_line(item.get_text(strip=True))
+        if parsed:
+            ingredients.append(parsed.model_dump())
+    steps = [text for step in soup.select(".gz-content-recipe-step") if (text := step.get_text(strip=True))]
+    return name_it, ingredients, steps, tuple(facts)
+
+
+def legacy_soscuisine(html: str) -> tuple:
+    soup = BeautifulSoup(html, "html.parser")
+    title_elem = soup.find("h1")
+    name_it = title_elem.get_text(strip=True) if title_elem else "Unknown Recipe"
+    facts = scan_recipe_text(soup.get_text())
+    ingredients = []
+    for selector in (".recipe-ingredients li", ".ingredients li", "[class*='ingredient'] li", "ul.ingredients li"):
+        items = soup.select(selector)
+        if items:
+            for item in items:
+                parsed = parse_ingredient_line(item.get_text(strip=True))
+                if parsed:
+                    ingredients.append(parsed.model_dump())
+            break
+    if not ingredients:
+        soup.get_text()  # the legacy scraper re-extracted the page text for its fallbacks
+    steps = []
+    for selector in (".recipe-method li", ".method li", ".instructions li", "[class*='step']"):
+        items = soup.select(selector)
+        if items:
+            steps = [text for item in items if (text := item.get_text(strip=True)) and len(text) > 20]
+            break
+    if not steps:
+        soup.get_text()
+    return name_it, ingredients, steps, tuple(facts)
+
+
+def legacy_generic(html: str) -> tuple:
+    soup = BeautifulSoup(html, "html.parser")
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string)
+        except (json.JSONDecodeError, TypeError):
+            continue
+        if isinstance(data, dict) and data.get("@type") == "Recipe":
+            return data.get("name", "Unknown Recipe"), None, None, None
+    title = soup.find("h1")
+    return title.get_text(strip=True) if title else "Unknown Recipe", None, None, None
+
+
+def legacy_parse(url: str, html: str) -> tuple:
+    if "soscuisine.com" in url:
+        return legacy_soscuisine(html)
+    elif "giallozafferano" in url:
+        return legacy_giallozafferano(html)
+    return legacy_generic(html)
+
+
+def new_parse(url: str, html: str, backend: str) -> tuple:
+    recipe = parse_recipe_html(url, html, backend)
+    if "soscuisine.com" in url or "giallozafferano" in url:
+        return (
+            recipe.name_it,
+            [ing.model_dump() for ing in recipe.ingredients],
+            recipe.steps,
+            (recipe.nutrition, recipe.prep_time_min, recipe.cook_time_min, recipe.servings, recipe.difficulty),
+        )
+    return recipe.name_it, None, None, None
+
+
+# ============ Corpus ============
+
+def load_saved_pages(directory: Path) -> list[tuple[str, str]]:
+    pages = []
+    for path in sorted(directory.iterdir()):
+        if path.suffix in (".html", ".htm"):
+            name = path.name.lower()
+            site = "soscuisine.com" if "soscuisine" in name else "giallozafferano.it" if "giallozafferano" in name else "example.com"
+            pages.append((f"https://{site}/{path.stem}", path.read_text(encoding="utf-8", errors="replace")))
+    return pages
+
+
+def build_corpus(db_path: Path) -> list[tuple[str, str]]:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    rows = conn.execute(
+        "SELECT URL, Titolo, Presentazione, Calorie_per_porzione, Difficolta, Dosi_per, "
+        "Preparazione, Cottura, Ingredienti_JSON, Istruzioni FROM ricette"
+    ).fetchall()
+    conn.close()
+
+    # Roughly the non-content weight of a recipe page: analytics/ads scripts, CSS, menus
+    scripts = "".join(
+        f"<script>window.__cfg{i} = {json.dumps({'k': 'x' * 200, 'list': list(range(300))})};</script>\n"
+        for i in range(40)
+    )
+    styles = "<style>" + "".join(f".c{i} {{ margin: {i}px; color: #{i:06x}; }}\n" for i in range(1500)) + "</style>"
+    menu = "<nav><ul>" + "".join(f'<li><a href="/c/{i}">Categoria {i}</a></li>' for i in range(300)) + "</ul></nav>"
+
+    pages = []
+    for url, title, intro, kcal, difficulty, servings, prep, cook, ingredients, steps in rows:
+        ingredient_items = "".join(
+            f'<dd class="gz-ingredient"><a>{name}</a> <span>{qty if isinstance(qty, str) else f"{qty} g"}</span></dd>'
+            for name, qty in json.loads(ingredients or "{}").items()
+        )
+        step_items = "".join(
+            f'<div class="gz-content-recipe-step"><p>{sentence.strip()}.</p></div>'
+            for sentence in (steps or "").split(". ") if sentence.strip()
+        )
+        pages.append((url, (
+            f"<html><head><title>{title}</title>{styles}{scripts}</head><body>{menu}"
+            f"<h1>{title}</h1><p>{intro or ''}</p>"
+            f"<ul><li>Difficoltà: {difficulty}</li><li>Preparazione: {prep}</li>"
+            f"<li>Cottura: {cook}</li><li>Dosi per: {servings} persone</li></ul>"
+            f"<div>Energia {kcal} Kcal</div>"
+            f"<dl>{ingredient_items}</dl>{step_items}"
+            f"<!-- tracking pixel -->{scripts}</body></html>"
+        )))
+    return pages
+
+
+def bench(func, pages: list[tuple[str, str]], repeat: int) -> float:
+    """Best-of-repeat seconds for one pass over all pages."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for url, html in pages:
+            func(url, html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=Path, help="Directory of saved .html pages")
+    parser.add_argument("--backend", choices=available_backends(), default=default_backend())
+    parser.add_argument("--limit", type=int, default=100, help="Max pages to benchmark")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_saved_pages(args.pages) if args.pages else build_corpus(LEGACY_DB)
+    pages = pages[:args.limit]
+    total_kb = sum(len(html) for _, html in pages) / 1024
+    print(f"{len(pages)} pages, {total_kb:,.0f} KB of HTML, backend {args.backend}")
+
+    mismatches = sum(1 for url, html in pages if legacy_parse(url, html) != new_parse(url, html, args.backend))
+    print(f"Result mismatches: {mismatches}")
+
+    legacy = bench(legacy_parse, pages, args.repeat)
+    new = bench(lambda url, html: new_parse(url, html, args.backend), pages, args.repeat)
+    print(f"legacy (html.parser, full page):  {legacy * 1000 / len(pages):8.2f} ms/page")
+    print(f"HtmlDocument ({args.backend}):{' ' * max(0, 19 - len(args.backend))}{new * 1000 / len(pages):8.2f} ms/page")
+    print(f"speedup: {legacy / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
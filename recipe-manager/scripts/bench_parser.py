@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: scan_recipe_text (lowercase once, precompiled scanners) vs the legacy per-field regex scans.
+
+Pages are page texts as the scraper sees them (soup.get_text()):
+- --pages DIR: saved .html pages (text extracted with BeautifulSoup) or .txt files
+- default: GialloZafferano-style texts rebuilt from ../docs/DB-esempio/ricette.db,
+  padded with other recipes' text up to --page-kb to mimic menus/comments/related blocks
+
+Also checks that both implementations return identical results on every page.
+
+Usage:
+    uv run python scripts/bench_parser.py
+    uv run python scripts/bench_parser.py --pages saved_pages/ --repeat 5
+"""
+
+import argparse
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from recipe_manager.services.parser import ParsedNutrition, scan_recipe_text
+
+LEGACY_DB = Path(__file__).parents[2] / "docs" / "DB-esempio" / "ricette.db"
+
+
+# ============ Legacy implementation (before the precompiled scanners) ============
+
+def legacy_parse_nutrition_text(text: str) -> ParsedNutrition:
+    """
+    Extract nutrition info from text.
+
+    Examples:
+    - "610 calorie/porzione"
+    - "Calorie 610 | Grassi 21g | Carboidrati 69g | Proteine 37g"
+    - "Tabella nutrizionale per porzione (460g)"
+    """
+    nutrition = ParsedNutrition()
+
+    # Calories - multiple patterns (SOSCuisine + GialloZafferano)
+    kcal_patterns = [
+        r"Energia\s*[:,]?\s*(\d+(?:[.,]\d+)?)\s*[Kk]cal",  # GialloZafferano: "Energia: 558,7 Kcal"
+        r"Calorie\s+(\d+)",  # SOSCuisine: "Calorie  610"
+        r"(\d+)\s*calorie[/\s]porzione",  # "610 calorie/porzione"
+        r"(\d+)\s*(?:kcal|cal)\b",  # "610 kcal"
+    ]
+    for pattern in kcal_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            # Handle decimal comma (e.g., "558,7" -> 558)
+            kcal_str = match.group(1).replace(",", ".")
+            nutrition.kcal = int(float(kcal_str))
+            break
+
+    # Protein - SOSCuisine format: "Proteine  37 g"
+    protein_patterns = [
+        r"Proteine?\s+(\d+(?:[.,]\d+)?)\s*g",  # "Proteine  37 g"
+        r"protein[ea]?\s*[:,]?\s*(\d+(?:[.,]\d+)?)\s*g",
+    ]
+    for pattern in protein_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            nutrition.protein = float(match.group(1).replace(",", "."))
+            break
+
+    # Carbs - SOSCuisine: "Carboidrati  69 g"
+    carbs_patterns = [
+        r"Carboidrati\s+(\d+(?:[.,]\d+)?)\s*g",  # "Carboidrati  69 g"
+        r"carb[oidrat]*\s*[:,]?\s*(\d+(?:[.,]\d+)?)\s*g",
+    ]
+    for pattern in carbs_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            nutrition.carbs = float(match.group(1).replace(",", "."))
+            break
+
+    # Fat - SOSCuisine: "Grassi  21 g"
+    fat_patterns = [
+        r"Grassi\s+(\d+(?:[.,]\d+)?)\s*g",  # "Grassi  21 g"
+        r"grass[io]?\s*[:,]?\s*(\d+(?:[.,]\d+)?)\s*g",
+    ]
+    for pattern in fat_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            nutrition.fat = float(match.group(1).replace(",", "."))
+            break
+
+    # Fiber - SOSCuisine + GialloZafferano: "Fibre 7 g" or "Fibre: 2,7 g"
+    fiber_patterns = [
+        r"Fibre?\s*[:,]?\s*(\d+(?:[.,]\d+)?)\s*g",
+        r"fiber\s*[:,]?\s*(\d+(?:[.,]\d+)?)\s*g",
+    ]
+    for pattern in fiber_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            nutrition.fiber = float(match.group(1).replace(",", "."))
+            break
+
+    # Serving weight - SOSCuisine: "per porzione (460g)" or "Tabella nutrizionale per porzione (460g)"
+    weight_patterns = [
+        r"per\s+porzione\s*\((\d+)\s*g\)",  # "per porzione (460g)"
+        r"porzione\s*\((\d+)\s*g\)",  # "porzione (460g)"
+        r"\((\d+)\s*g\)\s*$",  # "(460g)" at end of line
+    ]
+    for pattern in weight_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            nutrition.serving_weight_g = int(match.group(1))
+            break
+
+    return nutrition
+
+
+def legacy_parse_time_text(text: str) -> tuple[int, int]:
+    """
+    Extract prep and cook time from text.
+    Returns (prep_min, cook_min)
+
+    Examples:
+    - "Preparazione : 30 min Cottura : 4 h"
+    - "Prep: 10 min | Cook: 20 min"
+    """
+    prep_min = 0
+    cook_min = 0
+
+    # Prep time (SOSCuisine + GialloZafferano)
+    prep_patterns = [
+        r"Tempo\s+di\s+preparazione\s*:?\s*(\d+)\s*(min|minut|h|ore?)",  # GialloZafferano
+        r"Preparazione\s*:?\s*(\d+)\s*(min|h|ore?)",  # SOSCuisine
+        r"Prep\s*:?\s*(\d+)\s*(min|h|ore?)",
+    ]
+    for pattern in prep_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            value = int(match.group(1))
+            unit = match.group(2).lower()
+            if unit in ("h", "ore", "ora"):
+                value *= 60
+            prep_min = value
+            break
+
+    # Cook time (SOSCuisine + GialloZafferano)
+    cook_patterns = [
+        r"Tempo\s+di\s+cottura\s*:?\s*(\d+)\s*(min|minut|h|ore?)",  # GialloZafferano
+        r"Cottura\s*:?\s*(\d+)\s*(min|h|ore?)",  # SOSCuisine
+        r"Cook\s*:?\s*(\d+)\s*(min|h|ore?)",
+    ]
+    for pattern in cook_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            value = int(match.group(1))
+            unit = match.group(2).lower()
+            if unit in ("h", "ore", "ora"):
+                value *= 60
+            cook_min = value
+            break
+
+    return prep_min, cook_min
+
+
+def legacy_parse_servings(text: str) -> int:
+    """Extract servings count."""
+    patterns = [
+        r"Dosi\s+per\s*:?\s*(\d+)\s*person",  # GialloZafferano: "Dosi per: 4 persone"
+        r"(\d+)\s*(?:porzioni?|servings?|person[ae])",
+        r"Quantità\s*:?\s*(\d+)",  # SOSCuisine
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            return int(match.group(1))
+    return 4  # Default
+
+
+def legacy_parse_difficulty(text: str) -> str:
+    """Extract difficulty level."""
+    text_lower = text.lower()
+    if "molto facile" in text_lower or "very easy" in text_lower:
+        return "easy"
+    if "facile" in text_lower or "easy" in text_lower:
+        return "easy"
+    if "medio" in text_lower or "medium" in text_lower:
+        return "medium"
+    if "difficile" in text_lower or "hard" in text_lower:
+        return "hard"
+    return "easy"
+
+
+def legacy_scan(text: str) -> tuple:
+    prep_min, cook_min = legacy_parse_time_text(text)
+    return (
+        legacy_parse_nutrition_text(text),
+        prep_min,
+        cook_min,
+        legacy_parse_servings(text),
+        legacy_parse_difficulty(text),
+    )
+
+
+# ============ Corpus ============
+
+def load_saved_pages(directory: Path) -> list[str]:
+    pages = []
+    for path in sorted(directory.iterdir()):
+        if path.suffix in (".html", ".htm"):
+            html = path.read_text(encoding="utf-8", errors="replace")
+            pages.append(BeautifulSoup(html, "html.parser").get_text())
+        elif path.suffix == ".txt":
+            pages.append(path.read_text(encoding="utf-8", errors="replace"))
+    return pages
+
+
+def build_corpus(db_path: Path, page_kb: int) -> list[str]:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    rows = conn.execute(
+        "SELECT Titolo, Presentazione, Calorie_per_porzione, Difficolta, Dosi_per, "
+        "Preparazione, Cottura, Costo, Ingredienti, Istruzioni FROM ricette"
+    ).fetchall()
+    conn.close()
+
+    bodies = []
+    for title, intro, kcal, difficulty, servings, prep, cook, cost, ingredients, steps in rows:
+        bodies.append(
+            f"{title}\n{intro or ''}\n"
+            f"Difficoltà: {difficulty}\nPreparazione: {prep}\nCottura: {cook}\n"
+            f"Dosi per: {servings} persone\nCosto: {cost}\n"
+            f"Energia: {kcal} Kcal\n"
+            f"Ingredienti\n{ingredients or ''}\nPreparazione\n{steps or ''}\n"
+        )
+
+    # Pad each page with unrelated recipe text until it reaches page_kb
+    pages = []
+    for i, body in enumerate(bodies):
+        parts = [body]
+        size = len(body)
+        j = i + 1
+        while size < page_kb * 1024:
+            filler = (bodies[j % len(bodies)] or "").split("\n", 1)[-1]
+            filler = re.sub(r"\d", "", filler)  # no stray numbers for the patterns to pick up
+            parts.append(filler)
+            size += len(filler)
+            j += 1
+        pages.append("\n".join(parts))
+    return pages
+
+
+def bench(func, pages: list[str], repeat: int) -> float:
+    """Best-of-repeat seconds for one pass over all pages."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            func(page)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=Path, help="Directory of saved .html/.txt pages")
+    parser.add_argument("--page-kb", type=int, default=200, help="Synthetic page size in KB")
+    parser.add_argument("--limit", type=int, default=100, help="Max pages to benchmark")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_saved_pages(args.pages) if args.pages else build_corpus(LEGACY_DB, args.page_kb)
+    pages = pages[:args.limit]
+    total_kb = sum(len(p) for p in pages) / 1024
+    print(f"{len(pages)} pages, {total_kb:,.0f} KB of text")
+
+    mismatches = 0
+    for page in pages:
+        if tuple(scan_recipe_text(page)) != legacy_scan(page):
+            mismatches += 1
+    print(f"Result mismatches: {mismatches}")
+
+    legacy = bench(legacy_scan, pages, args.repeat)
+    scanners = bench(scan_recipe_text, pages, args.repeat)
+    print(f"legacy (per-field re.search): {legacy * 1000 / len(pages):8.2f} ms/page")
+    print(f"precompiled scanners:         {scanners * 1000 / len(pages):8.2f} ms/page")
+    print(f"speedup: {legacy / scanners:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
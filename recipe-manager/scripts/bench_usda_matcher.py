@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark: automatic ingredient -> USDA matching (services/usda_matcher.py).
+
+Names are the distinct Italian ingredient names of ../docs/DB-esempio/ricette.db
+(or one per line from --names FILE), notes and "q.b." stripped, first --limit.
+
+Reports index build and load time, matching time for the whole corpus, how
+many names clear the auto-match threshold, and a sample of the matches.
+
+Precision is measured against the legacy matches scoring at least
+LEGACY_MIN_SCORE, on an index built without the legacy database (so it has not
+learned those very names). A match counts as right when it names the same food:
+the same first description segment ("Onions, raw" for "Onions, red, raw"), in
+either word order ("Cheese, cream" for "Cream cheese").
+
+Usage:
+    uv run python scripts/bench_usda_matcher.py
+    uv run python scripts/bench_usda_matcher.py --names ingredients.txt --rebuild --sample 40
+    uv run python scripts/bench_usda_matcher.py --no-precision
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+from recipe_manager.config.settings import Config
+from recipe_manager.services.ingredient_index import normalize_name
+from recipe_manager.services.usda_matcher import USDAMatcher, clean_name, load_learned_names
+
+LEGACY_DB = Path(__file__).parents[2] / "docs" / "DB-esempio" / "ricette.db"
+THRESHOLDS = (0.35, 0.4, 0.45, 0.5, 0.55, 0.6, 0.65, 0.7)
+# Names once auto-matched to the wrong food -> start of the expected description
+KNOWN_CASES = {
+    "arance biologica": "Oranges",
+    "pomodori pelati a pezzettini": "Tomatoes, whole, canned",
+}
+
+
+def legacy_names(db_path: Path) -> list[str]:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    names = {}
+    for (ingredients,) in conn.execute("SELECT Ingredienti_JSON FROM ricette ORDER BY rowid"):
+        for name in json.loads(ingredients or "{}"):
+            names.setdefault(clean_name(name), name)
+    conn.close()
+    return [name for key, name in names.items() if key]
+
+
+def legacy_labels(source: Path, legacy_db: Path) -> tuple[list[tuple[str, int]], dict[int, str]]:
+    """(name, fdc_id) pairs the legacy database matched reliably, and every USDA description by FDC ID."""
+    conn = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    descriptions = {
+        int(fdc_id): text or "" for fdc_id, text in conn.execute("SELECT fdcId, description FROM alimenti")
+    }
+    conn.close()
+    by_description = {}
+    for fdc_id, text in descriptions.items():
+        by_description.setdefault(normalize_name(text), fdc_id)
+    labels, _, _ = load_learned_names(legacy_db, by_description)
+    return labels, descriptions
+
+
+def same_food(description: str, expected: str) -> bool:
+    """Same first segment, also when USDA words it the other way round ("Cheese, cream" / "Cream cheese")."""
+    def words(segments: list[str]) -> frozenset:
+        return frozenset(normalize_name(" ".join(segments)).split())
+    a, b = description.split(","), expected.split(",")
+    return words(a[:1]) in (words(b[:1]), words(b[:2])) or words(b[:1]) == words(a[:2])
+
+
+def report_precision(threshold: float) -> None:
+    labels, descriptions = legacy_labels(Path(Config.USDA_LOCAL_SOURCE), Path(Config.USDA_MATCHER_LEGACY_DB))
+    if not labels:
+        print("\nPrecision: no legacy matches to check against")
+        return
+    start = time.perf_counter()
+    directory = Path(Config.USDA_MATCHER_DIR).with_name("usda_matcher_heldout")
+    held_out = USDAMatcher.load(legacy_db=directory / "no-legacy.db", directory=directory)
+    print(f"\nPrecision on {len(labels)} legacy matches (index without them: {time.perf_counter() - start:.1f} s)")
+
+    rows = []
+    for (name, fdc_id), candidates in zip(labels, held_out.match_many([name for name, _ in labels])):
+        best = candidates[0] if candidates else None
+        expected = descriptions[fdc_id]
+        exact = best is not None and (int(best.fdc_id) == fdc_id or best.description == expected)
+        same = best is not None and same_food(best.description, expected)
+        rows.append((best.score if best else 0.0, same, exact, name, best.description if best else "-", expected))
+
+    print(f"{'threshold':>9}  {'auto':>9}  {'same food':>9}  {'exact ID':>8}")
+    for t in sorted({*THRESHOLDS, threshold}):
+        auto = [row for row in rows if row[0] >= t]
+        same = sum(row[1] for row in auto) / len(auto) if auto else 0
+        exact = sum(row[2] for row in auto) / len(auto) if auto else 0
+        mark = "  <- USDA_AUTO_MATCH_MIN_SCORE" if t == threshold else ""
+        print(f"{t:9.2f}  {len(auto):4}/{len(rows):<4}  {same:9.1%}  {exact:8.1%}{mark}")
+
+    for score, _, _, name, got, expected in sorted(row for row in rows if row[0] >= threshold and not row[1]):
+        print(f"  ✗ {name[:28]:28} {score:5.2f}  {got[:36]:36} expected {expected[:36]}")
+
+    print()
+    for name, expected in KNOWN_CASES.items():
+        best = held_out.best(name, min_score=0)
+        mark = "✓" if best and best.description.startswith(expected) else "✗"
+        print(f"{mark} {name[:34]:34} {best.score if best else 0:5.2f}  {best.description[:60] if best else '-'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--names", type=Path, help="File with one ingredient name per line")
+    parser.add_argument("--limit", type=int, default=600, help="Max names (0: all)")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the index first and time it")
+    parser.add_argument("--sample", type=int, default=20, help="Matches to print")
+    parser.add_argument("--no-precision", action="store_true", help="Skip the check against legacy matches")
+    args = parser.parse_args()
+
+    names = args.names.read_text(encoding="utf-8").splitlines() if args.names else legacy_names(LEGACY_DB)
+    names = [name for name in names if name.strip()]
+    if args.limit:
+        names = names[:args.limit]
+
+    if args.rebuild:
+        start = time.perf_counter()
+        USDAMatcher.load(rebuild=True)
+        print(f"Index build: {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    matcher = USDAMatcher.load()
+    load_ms = (time.perf_counter() - start) * 1000
+    print(
+        f"Index load: {load_ms:.1f} ms ({matcher.meta['documents']:,} documents: "
+        f"{matcher.meta['foods']:,} USDA descriptions + {matcher.meta['synonyms']} learned names, "
+        f"{matcher.meta['features']:,} features)"
+    )
+
+    start = time.perf_counter()
+    results = matcher.match_many(names, k=3)
+    match_ms = (time.perf_counter() - start) * 1000
+    threshold = Config.USDA_AUTO_MATCH_MIN_SCORE
+    confident = sum(1 for candidates in results if candidates and candidates[0].score >= threshold)
+    print(f"Matched {len(names)} names in {match_ms:.0f} ms ({match_ms * 1000 / len(names):.0f} µs/name)")
+    print(f"Auto-matched (score >= {threshold:g}): {confident}/{len(names)}\n")
+
+    step = max(1, len(names) // max(args.sample, 1))
+    for name, candidates in list(zip(names, results))[::step][:args.sample]:
+        best = candidates[0] if candidates else None
+        mark = "✓" if best and best.score >= threshold else " "
+        print(f"{mark} {name[:34]:34} {best.score if best else 0:5.2f}  {best.description[:60] if best else '-'}")
+
+    if not args.no_precision:
+        report_precision(threshold)
+
+
+if __name__ == "__main__":
+    main()
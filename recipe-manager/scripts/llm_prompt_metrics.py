@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Metrics: LLM input size with and without the local pre-parse (services/preparse.py).
+
+Recipes are raw text as a user would paste it into import-llm:
+- --dir DIR: .txt files, one recipe per file (the import-llm --batch layout)
+- default: GialloZafferano page text rebuilt from ../docs/DB-esempio/ricette.db,
+  with the menus, cookie banner, share buttons and comments copied along with it
+
+Reports characters and tokens per request (system prompt included), the reduction,
+how many recipes were fully structured locally, and the pre-parse cost.
+Tokens are estimated offline (~4 chars/token); --count-tokens asks the Gemini
+count_tokens endpoint instead (needs GEMINI_API_KEY, no generation is billed).
+
+Usage:
+    uv run python scripts/llm_prompt_metrics.py
+    uv run python scripts/llm_prompt_metrics.py --dir raw_recipes/ --count-tokens --limit 20
+"""
+
+import argparse
+import sqlite3
+import statistics
+import time
+from pathlib import Path
+
+from recipe_manager.services.llm_parser import GEMINI_MODEL, SYSTEM_PROMPT, USER_PROMPT, create_client
+from recipe_manager.services.preparse import estimate_tokens, preparse_recipe_text
+
+LEGACY_DB = Path(__file__).parents[2] / "docs" / "DB-esempio" / "ricette.db"
+
+MENU = [
+    "Home", "Ricette", "Antipasti", "Primi piatti", "Secondi piatti", "Contorni", "Dolci",
+    "Lievitati", "Piatti unici", "Video ricette", "Blog", "Accedi", "Iscriviti",
+]
+COOKIE_BANNER = (
+    "Questo sito utilizza cookie tecnici e, previo tuo consenso, cookie di profilazione di terze parti "
+    "per mostrarti pubblicità in linea con le tue preferenze. Leggi la privacy policy. Accetta Rifiuta"
+)
+SHARE = ["Condividi su Facebook", "Condividi su Pinterest", "Condividi su WhatsApp", "Stampa", "Salva la ricetta"]
+FOOTER = [
+    "Iscriviti alla newsletter", "Ricevi le nostre ricette ogni settimana", "Chi siamo", "Contatti", "Lavora con noi",
+    "© 2024 Mondadori Media S.p.A. - Tutti i diritti riservati", "Privacy policy", "Cookie policy",
+]
+
+
+def build_corpus(db_path: Path) -> list[str]:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    rows = conn.execute(
+        "SELECT URL, Titolo, Presentazione, Calorie_per_porzione, Difficolta, Dosi_per, "
+        "Preparazione, Cottura, Costo, Ingredienti, Istruzioni, Tipologia_piatti FROM ricette"
+    ).fetchall()
+    conn.close()
+
+    texts = []
+    for url, title, intro, kcal, difficulty, servings, prep, cook, cost, ingredients, steps, dish_type in rows:
+        related = [f"Ricetta {title.split()[0]} {word}" for word in ("al forno", "veloce", "light", "della nonna")]
+        comments = [
+            "Commenti (12)",
+            f"Maria: ho provato la {title.lower()}, buonissima! L'ho fatta per tutta la famiglia e l'hanno adorata.",
+            "Luca: con meno sale viene ancora meglio, consigliatissima.",
+        ]
+        texts.append("\n".join([
+            *MENU, COOKIE_BANNER, f"Ricette > {dish_type or 'Ricette'} > {title}", url, title,
+            *SHARE, intro or "",
+            f"Difficoltà: {difficulty}", f"Preparazione: {prep}", f"Cottura: {cook}",
+            f"Dosi per: {servings} persone", f"Costo: {cost}",
+            "Pubblicità",
+            "Ingredienti", *(ingredients or "").splitlines(),
+            f"Valori nutrizionali", f"Energia {kcal} Kcal",
+            "Preparazione", *[f"{sentence.strip()}." for sentence in (steps or "").split(". ") if sentence.strip()],
+            "Conservazione", "Si conserva in frigorifero per 1 giorno in un contenitore ermetico.",
+            "Ti potrebbe interessare", *related, *comments, *FOOTER,
+        ]))
+    return texts
+
+
+def load_texts(directory: Path) -> list[str]:
+    return [path.read_text(encoding="utf-8") for path in sorted(directory.glob("*.txt"))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dir", type=Path, help="Directory of raw recipe .txt files")
+    parser.add_argument("--limit", type=int, default=0, help="Max recipes (0: all)")
+    parser.add_argument("--count-tokens", action="store_true", help="Use Gemini count_tokens instead of the estimate")
+    args = parser.parse_args()
+
+    texts = load_texts(args.dir) if args.dir else build_corpus(LEGACY_DB)
+    if args.limit:
+        texts = texts[:args.limit]
+
+    start = time.perf_counter()
+    drafts = [preparse_recipe_text(text) for text in texts]
+    preparse_ms = (time.perf_counter() - start) * 1000 / len(texts)
+
+    if args.count_tokens:
+        client = create_client()
+
+        def count(text: str) -> int:
+            return client.models.count_tokens(model=GEMINI_MODEL, contents=USER_PROMPT.format(text=text)).total_tokens
+        system_tokens = client.models.count_tokens(model=GEMINI_MODEL, contents=SYSTEM_PROMPT).total_tokens
+    else:
+        def count(text: str) -> int:
+            return estimate_tokens(USER_PROMPT.format(text=text))
+        system_tokens = estimate_tokens(SYSTEM_PROMPT)
+
+    chars_before = [len(text) for text in texts]
+    chars_after = [len(draft.text) for draft in drafts]
+    tokens_before = [count(text) for text in texts]
+    tokens_after = [count(draft.text) for draft in drafts]
+    structured = sum(1 for draft in drafts if draft.structured)
+
+    method = "Gemini count_tokens" if args.count_tokens else "estimated, ~4 chars/token"
+    print(f"{len(texts)} recipes, tokens {method}; system prompt {system_tokens:,} tokens/request")
+    print(f"Structured locally: {structured}/{len(texts)} (others sent as cleaned text)")
+    print(f"Pre-parse cost: {preparse_ms:.2f} ms/recipe\n")
+    print(f"{'':24}{'raw':>10}{'pre-parsed':>12}{'reduction':>11}")
+    for label, before, after in (
+        ("chars/recipe (mean)", statistics.mean(chars_before), statistics.mean(chars_after)),
+        ("chars/recipe (median)", statistics.median(chars_before), statistics.median(chars_after)),
+        ("prompt tokens (mean)", statistics.mean(tokens_before), statistics.mean(tokens_after)),
+        ("request tokens (mean)", statistics.mean(tokens_before) + system_tokens,
+         statistics.mean(tokens_after) + system_tokens),
+        ("request tokens (total)", sum(tokens_before) + system_tokens * len(texts),
+         sum(tokens_after) + system_tokens * len(texts)),
+    ):
+        print(f"{label:24}{before:>10,.0f}{after:>12,.0f}{1 - after / before:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
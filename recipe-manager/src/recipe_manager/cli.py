@@ -3,13 +3,18 @@ Recipe Manager CLI - Typer-based command interface.
 Usage: uv run python -m recipe_manager [COMMAND]
 """
 import asyncio
+import functools
 import re
+import sqlite3
+import time
 from decimal import Decimal
 from typing import Optional
-from uuid import uuid4
+from uuid import UUID, uuid4
 
+import httpx
 import typer
 from rich.console import Console
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeElapsedColumn
 from rich.prompt import Confirm, IntPrompt, Prompt
 from rich.table import Table
 from pathlib import Path
@@ -23,8 +28,15 @@ from recipe_manager.models import (
     RecipeIngredient,
     RecipeStep,
 )
+from recipe_manager.services.context import AppContext
+from recipe_manager.services.ingredient_index import IngredientIndex, plan_ingredient_merges
+from recipe_manager.services.nutrition import DEFAULT_SERVING_WEIGHT_G, recipe_nutrition
+from recipe_manager.services.page_cache import PageCache
+from recipe_manager.services.sync_manifest import SyncManifest, content_hash
+from recipe_manager.services.translation_cache import TranslationCache, translation_key
 from recipe_manager.services.turso import TursoClient
-from recipe_manager.services.usda import USDAClient
+from recipe_manager.services.usda_matcher import USDAMatcher
+from recipe_manager.services.usda_cache import USDACache
 
 # ============ App Setup ============
 
@@ -35,9 +47,25 @@ app = typer.Typer(
 )
 ingredient_app = typer.Typer(help="Ingredient management commands")
 app.add_typer(ingredient_app, name="ingredient")
+cache_app = typer.Typer(help="USDA, scraped page and Gemini response cache commands")
+app.add_typer(cache_app, name="cache")
 
 console = Console()
 
+# Global options, set by the app callback before any command runs
+state = {"use_cache": True, "use_local": True}
+
+
+@app.callback()
+def app_options(
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Bypass the on-disk caches (USDA responses, scraped pages, Gemini responses)"
+    ),
+    online: bool = typer.Option(False, "--online", help="Query the USDA API directly, skipping the bundled food database"),
+):
+    state["use_cache"] = not no_cache
+    state["use_local"] = not online
+
 # ============ Helpers ============
 
 
@@ -49,24 +77,54 @@ def slugify(text: str) -> str:
     return text
 
 
-def run_async(coro):
-    """Run async function synchronously."""
-    return asyncio.get_event_loop().run_until_complete(coro)
+def _usda_error(error: httpx.HTTPError) -> str:
+    """Short description of a USDA API failure; the request URL is left out, it carries the API key."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"{error.response.status_code} {error.response.reason_phrase}"
+    return f"{type(error).__name__}: {error}" if str(error) else type(error).__name__
+
+
+async def _usda_lookup(request):
+    """
+    Await a USDA lookup inside an interactive wizard. An API error is reported
+    and counts as no result, so the answers typed so far are not lost.
+    """
+    try:
+        return await request
+    except httpx.HTTPError as e:
+        console.print(f"[red]❌ USDA API error: {_usda_error(e)}[/red]")
+        return None
+
+
+def async_command(func):
+    """
+    Run an async command body as one coroutine on a single event loop.
+    Apply below @app.command so Typer still sees the original signature.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return asyncio.run(func(*args, **kwargs))
+    return wrapper
 
 
 # ============ Ingredient Commands ============
 
 
 @ingredient_app.command("search")
-def ingredient_search(
+@async_command
+async def ingredient_search(
     query: str = typer.Argument(..., help="Search term (e.g., 'pasta', 'chicken')"),
     limit: int = typer.Option(10, "--limit", "-l", help="Number of results"),
 ):
     """Search USDA FoodData Central for ingredients."""
     console.print(f"\n[cyan]🔍 Searching USDA for '{query}'...[/cyan]\n")
 
-    usda = USDAClient()
-    foods = run_async(usda.search_food(query, page_size=limit))
+    async with AppContext(use_cache=state["use_cache"], use_local=state["use_local"]) as ctx:
+        try:
+            foods = await ctx.usda.search_food(query, page_size=limit)
+        except httpx.HTTPError as e:
+            console.print(f"[red]❌ USDA API error: {_usda_error(e)}[/red]")
+            raise typer.Exit(1)
 
     if not foods:
         console.print("[yellow]No results found.[/yellow]")
@@ -95,9 +153,69 @@ def ingredient_search(
     console.print(table)
 
 
+@ingredient_app.command("match")
+def ingredient_match(
+    names: Optional[list[str]] = typer.Argument(None, help="Italian ingredient names"),
+    names_file: Optional[Path] = typer.Option(None, "--file", "-f", help="File with one name per line"),
+    top: int = typer.Option(1, "--top", "-k", min=1, help="Candidates per name"),
+    rebuild: bool = typer.Option(False, "--rebuild", help="Rebuild the matcher index first"),
+):
+    """Match ingredient names to USDA foods offline (n-gram index over the bundled food table)."""
+    names = list(names or [])
+    if names_file:
+        names += [line.strip() for line in names_file.read_text(encoding="utf-8").splitlines() if line.strip()]
+    if not names and not rebuild:
+        console.print("[yellow]No names given.[/yellow]")
+        raise typer.Exit(0)
+    if not USDAMatcher.available():
+        console.print("[red]❌ Food table not found (USDA_LOCAL_SOURCE).[/red]")
+        raise typer.Exit(1)
+
+    start = time.perf_counter()
+    matcher = USDAMatcher.load(rebuild=rebuild)
+    loaded = time.perf_counter()
+    results = matcher.match_many(names, k=top)
+    done = time.perf_counter()
+
+    if names:
+        from recipe_manager.config.settings import Config
+
+        threshold = Config.USDA_AUTO_MATCH_MIN_SCORE
+        table = Table(title=f"USDA matches (auto-accepted at score ≥ {threshold:g})")
+        table.add_column("Ingredient", style="white", max_width=30)
+        table.add_column("FDC ID", style="cyan")
+        table.add_column("Description", max_width=50)
+        table.add_column("Score", justify="right")
+        table.add_column("Source", style="dim")
+        for name, candidates in zip(names, results):
+            for rank, candidate in enumerate(candidates):
+                style = "green" if rank == 0 and candidate.score >= threshold else None
+                table.add_row(
+                    name if rank == 0 else "",
+                    candidate.fdc_id,
+                    candidate.description,
+                    f"[{style}]{candidate.score:.2f}[/{style}]" if style else f"{candidate.score:.2f}",
+                    candidate.source,
+                )
+            if not candidates:
+                table.add_row(name, "-", "[yellow]no match[/yellow]", "", "")
+        console.print(table)
+    console.print(
+        f"[dim]Index load {(loaded - start) * 1000:.0f} ms ({matcher.meta['documents']:,} documents), "
+        f"{len(names)} names matched in {(done - loaded) * 1000:.0f} ms[/dim]"
+    )
+
+
 @ingredient_app.command("add")
-def ingredient_add():
+@async_command
+async def ingredient_add():
     """Add an ingredient to the database (interactive wizard)."""
+    async with AppContext(use_cache=state["use_cache"], use_local=state["use_local"]) as ctx:
+        await _ingredient_add(ctx)
+
+
+async def _ingredient_add(ctx: AppContext):
+    """Interactive ingredient wizard using the command's shared clients."""
     console.print("\n[bold cyan]🥕 Add New Ingredient[/bold cyan]\n")
 
     # Option to search USDA first
@@ -106,8 +224,7 @@ def ingredient_add():
     usda_food = None
     if use_usda:
         query = Prompt.ask("Search term")
-        usda = USDAClient()
-        foods = run_async(usda.search_food(query, page_size=5))
+        foods = await _usda_lookup(ctx.usda.search_food(query, page_size=5)) or []
 
         if foods:
             console.print()
@@ -135,7 +252,8 @@ def ingredient_add():
         usda_fdc_id = usda_food.fdc_id
     else:
         name_it = Prompt.ask("Name (IT)")
-        name_en = Prompt.ask("Name (EN)")
+        known = ctx.translations.get(name_it)
+        name_en = Prompt.ask("Name (EN)", default=known.name_en) if known else Prompt.ask("Name (EN)")
         kcal = IntPrompt.ask("kcal/100g", default=0)
         protein = Decimal(Prompt.ask("Protein/100g", default="0"))
         carbs = Decimal(Prompt.ask("Carbs/100g", default="0"))
@@ -164,38 +282,165 @@ def ingredient_add():
         default_unit=default_unit,
     )
 
-    turso = TursoClient()
     try:
-        run_async(
-            turso.insert_ingredient(
-                id=ingredient.id,
-                usda_fdc_id=ingredient.usda_fdc_id,
-                name_it=ingredient.name_it,
-                name_en=ingredient.name_en,
-                category=ingredient.category,
-                kcal_per_100g=ingredient.kcal_per_100g,
-                protein_per_100g=float(ingredient.protein_per_100g),
-                carbs_per_100g=float(ingredient.carbs_per_100g),
-                fat_per_100g=float(ingredient.fat_per_100g),
-                fiber_per_100g=float(ingredient.fiber_per_100g) if ingredient.fiber_per_100g else None,
-                cooked_weight_factor=float(ingredient.cooked_weight_factor),
-                default_unit=ingredient.default_unit,
-            )
+        await ctx.turso.insert_ingredient(
+            id=ingredient.id,
+            usda_fdc_id=ingredient.usda_fdc_id,
+            name_it=ingredient.name_it,
+            name_en=ingredient.name_en,
+            category=ingredient.category,
+            kcal_per_100g=ingredient.kcal_per_100g,
+            protein_per_100g=float(ingredient.protein_per_100g),
+            carbs_per_100g=float(ingredient.carbs_per_100g),
+            fat_per_100g=float(ingredient.fat_per_100g),
+            fiber_per_100g=float(ingredient.fiber_per_100g) if ingredient.fiber_per_100g else None,
+            cooked_weight_factor=float(ingredient.cooked_weight_factor),
+            default_unit=ingredient.default_unit,
         )
         console.print(f"\n[green]✅ Ingredient saved![/green] ID: [cyan]{ingredient.id}[/cyan]")
     except Exception as e:
         console.print(f"\n[red]❌ Error saving ingredient: {e}[/red]")
         raise typer.Exit(1)
+    ctx.translations.learn(name_it, name_en, source="manual")
+
+
+@ingredient_app.command("update")
+@async_command
+async def ingredient_update(
+    ingredient: str = typer.Argument(..., help="Ingredient ID or Italian name"),
+    kcal: Optional[float] = typer.Option(None, "--kcal", help="kcal/100g"),
+    protein: Optional[float] = typer.Option(None, "--protein", help="Protein g/100g"),
+    carbs: Optional[float] = typer.Option(None, "--carbs", help="Carbs g/100g"),
+    fat: Optional[float] = typer.Option(None, "--fat", help="Fat g/100g"),
+    fiber: Optional[float] = typer.Option(None, "--fiber", help="Fiber g/100g"),
+    cooked_factor: Optional[float] = typer.Option(None, "--cooked-factor", help="Cooked / raw weight"),
+    usda_fdc_id: Optional[str] = typer.Option(None, "--usda-fdc-id", help="USDA FoodData Central ID"),
+    name_en: Optional[str] = typer.Option(
+        None, "--name-en", help="English name; also corrects the translation dictionary"
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Compute and report without writing"),
+):
+    """Correct an ingredient's nutrients or English name and recompute only the recipes that use it."""
+    from recipe_manager.services.ingredient_index import IngredientUsage
+    from recipe_manager.services.nutrition import IngredientTable, RecipeLines, aggregate
+
+    changes = {
+        column: value
+        for column, value in (
+            ("kcal_per_100g", kcal),
+            ("protein_per_100g", protein),
+            ("carbs_per_100g", carbs),
+            ("fat_per_100g", fat),
+            ("fiber_per_100g", fiber),
+            ("cooked_weight_factor", cooked_factor),
+            ("usda_fdc_id", usda_fdc_id),
+            ("name_en", name_en),
+        )
+        if value is not None
+    }
+    if not changes:
+        console.print(
+            "[yellow]Nothing to update: pass --kcal, --protein, --carbs, --fat, --fiber, --cooked-factor, "
+            "--usda-fdc-id or --name-en.[/yellow]"
+        )
+        raise typer.Exit(1)
+
+    start = time.perf_counter()
+    ctx = AppContext()
+    try:
+        try:
+            ingredient_id = str(UUID(ingredient))
+        except ValueError:
+            index = await IngredientIndex.load(ctx.turso)
+            resolved = index.resolve(ingredient)
+            ingredient_id = str(resolved) if resolved else None
+        row = await ctx.turso.get_ingredient_by_id(ingredient_id) if ingredient_id else None
+        if not row:
+            console.print(f"[red]❌ Ingredient not found: {ingredient}[/red]")
+            raise typer.Exit(1)
+
+        # Only the affected recipes are read, through the ingredient_id and recipe_id indexes
+        links = await ctx.turso.get_links_of_recipes_using([ingredient_id])
+        usage = IngredientUsage.from_links(links)
+        recipes = await ctx.turso.get_recipes_by_ids(sorted(usage.recipes_using([ingredient_id])))
+        ingredient_rows = await ctx.turso.get_ingredients_by_ids(sorted({str(l["ingredient_id"]) for l in links}))
+        loaded = time.perf_counter()
+
+        ingredients = IngredientTable.from_rows(
+            [{**r, **changes} if str(r["id"]) == ingredient_id else r for r in ingredient_rows]
+        )
+        lines = RecipeLines.from_links(links, {r["id"]: i for i, r in enumerate(recipes)}, ingredients)
+        if lines.missing:
+            console.print(
+                f"[yellow]⚠️  {lines.missing} ingredient lines link to missing ingredients; "
+                f"their recipes are skipped.[/yellow]"
+            )
+        result = aggregate(lines, [r["servings"] for r in recipes])
+        changed = result.changed(recipes)
+        updates = [
+            dict(id=recipe["id"], **result.recipe_fields(i))
+            for i, recipe in enumerate(recipes)
+            if result.complete[i] and changed[i]
+        ]
+        computed = time.perf_counter()
+
+        console.print(f"\n[bold]{row['name_it']}[/bold] is used by {len(recipes)} recipes")
+        for column, value in changes.items():
+            console.print(f"  {column}: {row.get(column)} → {value}")
+        if updates:
+            table = Table(title=f"{len(updates)} recipes changed")
+            table.add_column("Recipe", style="white", max_width=40)
+            table.add_column("kcal/100g", justify="right")
+            table.add_column("kcal/serving", justify="right")
+            by_id = {r["id"]: r for r in recipes}
+            for update in updates[:20]:
+                old = by_id[update["id"]]
+                table.add_row(
+                    old["name_it"],
+                    f"{old['kcal_per_100g']} → {update['kcal_per_100g']}",
+                    f"{old['kcal_per_serving']} → {update['kcal_per_serving']}",
+                )
+            console.print(table)
+            if len(updates) > 20:
+                console.print(f"[dim]... and {len(updates) - 20} more[/dim]")
+        skipped = len(recipes) - int(result.complete.sum())
+        if skipped:
+            console.print(f"[yellow]Skipped {skipped} recipes with unweighed or unmatched ingredients.[/yellow]")
+
+        if not dry_run:
+            # Ingredient and recipes in one transaction: recipes never show stale totals
+            await ctx.turso.update_ingredient_and_recipes({"id": ingredient_id, **changes}, updates)
+            if name_en:
+                ctx.translations.learn(row["name_it"], name_en, source="manual")
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print(f"[red]❌ Error: {e}[/red]")
+        raise typer.Exit(1)
     finally:
-        run_async(turso.close())
+        await ctx.close()
+
+    done = time.perf_counter()
+    console.print(
+        f"\n[green]✅ {'Would update' if dry_run else 'Updated'} ingredient and {len(updates)} recipes[/green] "
+        f"[dim]({len(links)} ingredient links; load {(loaded - start) * 1000:.0f} ms, "
+        f"compute {(computed - loaded) * 1000:.0f} ms, write {(done - computed) * 1000:.0f} ms)[/dim]"
+    )
 
 
 # ============ Recipe Commands ============
 
 
 @app.command("add")
-def recipe_add():
+@async_command
+async def recipe_add():
     """Add a new recipe (interactive wizard)."""
+    async with AppContext(use_cache=state["use_cache"], use_local=state["use_local"]) as ctx:
+        await _recipe_add(ctx)
+
+
+async def _recipe_add(ctx: AppContext):
+    """Interactive recipe wizard using the command's shared clients."""
     console.print("\n[bold cyan]📝 Add New Recipe[/bold cyan]\n")
 
     # Basic info
@@ -221,76 +466,78 @@ def recipe_add():
     # Ingredients
     console.print("\n[bold]🥕 Add Ingredients[/bold] (empty name to finish)\n")
     recipe_ingredients: list[tuple[Ingredient, Decimal, str]] = []
-    turso = TursoClient()
-    usda = USDAClient()
     order = 0
+    matcher = USDAMatcher.load() if USDAMatcher.available() else None
 
     while True:
         search_term = Prompt.ask("  Ingredient (search or skip)", default="")
         if not search_term:
             break
 
-        # Search USDA
-        foods = run_async(usda.search_food(search_term, page_size=5))
-        if foods:
-            for i, food in enumerate(foods, 1):
-                console.print(
-                    f"    [cyan]{i}.[/cyan] {food.description} "
-                    f"[dim]({food.nutrients.kcal} kcal)[/dim]"
-                )
-            choice = IntPrompt.ask("  Select (0 to skip)", default=1)
-
-            if 1 <= choice <= len(foods):
-                usda_food = foods[choice - 1]
-                quantity = Decimal(Prompt.ask("  Quantity (g)", default="100"))
-                unit = Prompt.ask("  Unit", default="g")
-
-                # Create ingredient
-                ing = Ingredient(
-                    id=uuid4(),
-                    usda_fdc_id=usda_food.fdc_id,
-                    name_it=Prompt.ask("  Name IT", default=usda_food.description),
-                    name_en=usda_food.description,
-                    kcal_per_100g=usda_food.nutrients.kcal,
-                    protein_per_100g=usda_food.nutrients.protein,
-                    carbs_per_100g=usda_food.nutrients.carbs,
-                    fat_per_100g=usda_food.nutrients.fat,
-                    fiber_per_100g=usda_food.nutrients.fiber,
-                )
-                recipe_ingredients.append((ing, quantity, unit))
-                order += 1
-                console.print(f"    [green]✓ Added {ing.name_en}[/green]\n")
-
-    # Calculate total nutrients
-    total_weight = sum(float(qty) for _, qty, _ in recipe_ingredients)
-    total_kcal = sum(
-        ing.kcal_per_100g * float(qty) / 100 for ing, qty, _ in recipe_ingredients
-    )
-    total_protein = sum(
-        float(ing.protein_per_100g) * float(qty) / 100 for ing, qty, _ in recipe_ingredients
-    )
-    total_carbs = sum(
-        float(ing.carbs_per_100g) * float(qty) / 100 for ing, qty, _ in recipe_ingredients
-    )
-    total_fat = sum(
-        float(ing.fat_per_100g) * float(qty) / 100 for ing, qty, _ in recipe_ingredients
-    )
-
-    # Per 100g
-    if total_weight > 0:
-        kcal_per_100g = int(total_kcal * 100 / total_weight)
-        protein_per_100g = Decimal(str(round(total_protein * 100 / total_weight, 2)))
-        carbs_per_100g = Decimal(str(round(total_carbs * 100 / total_weight, 2)))
-        fat_per_100g = Decimal(str(round(total_fat * 100 / total_weight, 2)))
-        serving_weight = int(total_weight / servings)
-        kcal_per_serving = int(total_kcal / servings)
-    else:
-        kcal_per_100g = 0
-        protein_per_100g = Decimal("0")
-        carbs_per_100g = Decimal("0")
-        fat_per_100g = Decimal("0")
-        serving_weight = 0
-        kcal_per_serving = 0
+        # Automatic match first; the USDA result list only when it is not confident or rejected
+        usda_food = None
+        best = matcher.best(search_term) if matcher else None
+        if best:
+            console.print(f"    [green]→ {best.description}[/green] [dim](score {best.score:.2f})[/dim]")
+            if Confirm.ask("  Use this match?", default=True):
+                usda_food = await _usda_lookup(ctx.usda.get_food_details(best.fdc_id))
+
+        if usda_food is None:
+            foods = await _usda_lookup(ctx.usda.search_food(search_term, page_size=5)) or []
+            if foods:
+                for i, food in enumerate(foods, 1):
+                    console.print(
+                        f"    [cyan]{i}.[/cyan] {food.description} "
+                        f"[dim]({food.nutrients.kcal} kcal)[/dim]"
+                    )
+                choice = IntPrompt.ask("  Select (0 to skip)", default=1)
+                if 1 <= choice <= len(foods):
+                    usda_food = foods[choice - 1]
+
+        if usda_food:
+            quantity = Decimal(Prompt.ask("  Quantity (g)", default="100"))
+            unit = Prompt.ask("  Unit", default="g")
+
+            # Create ingredient
+            ing = Ingredient(
+                id=uuid4(),
+                usda_fdc_id=usda_food.fdc_id,
+                name_it=Prompt.ask("  Name IT", default=search_term),
+                name_en=usda_food.description,
+                kcal_per_100g=usda_food.nutrients.kcal,
+                protein_per_100g=usda_food.nutrients.protein,
+                carbs_per_100g=usda_food.nutrients.carbs,
+                fat_per_100g=usda_food.nutrients.fat,
+                fiber_per_100g=usda_food.nutrients.fiber,
+            )
+            recipe_ingredients.append((ing, quantity, unit))
+            order += 1
+            console.print(f"    [green]✓ Added {ing.name_en}[/green]\n")
+
+    # Calculate nutrients (quantities are in grams)
+    nutrition = recipe_nutrition(
+        [
+            dict(
+                quantity=float(qty),
+                unit="g",
+                cooked_weight_factor=float(ing.cooked_weight_factor),
+                kcal_per_100g=ing.kcal_per_100g,
+                protein_per_100g=ing.protein_per_100g,
+                carbs_per_100g=ing.carbs_per_100g,
+                fat_per_100g=ing.fat_per_100g,
+                fiber_per_100g=ing.fiber_per_100g,
+            )
+            for ing, qty, _ in recipe_ingredients
+        ],
+        servings,
+    ).recipe_fields(0)
+    kcal_per_100g = nutrition["kcal_per_100g"]
+    protein_per_100g = nutrition["protein_per_100g"]
+    carbs_per_100g = nutrition["carbs_per_100g"]
+    fat_per_100g = nutrition["fat_per_100g"]
+    fiber_per_100g = nutrition["fiber_per_100g"]
+    serving_weight = nutrition["serving_weight_g"]
+    kcal_per_serving = nutrition["kcal_per_serving"]
 
     console.print("\n[bold]📊 Calculated Nutrients (per 100g):[/bold]")
     console.print(f"  kcal: {kcal_per_100g}")
@@ -320,28 +567,21 @@ def recipe_add():
     recipe_id = uuid4()
 
     try:
-        # Save ingredients first
-        for ing, _, _ in recipe_ingredients:
-            run_async(
-                turso.insert_ingredient(
-                    id=ing.id,
-                    usda_fdc_id=ing.usda_fdc_id,
-                    name_it=ing.name_it,
-                    name_en=ing.name_en,
-                    category=ing.category,
-                    kcal_per_100g=ing.kcal_per_100g,
-                    protein_per_100g=float(ing.protein_per_100g),
-                    carbs_per_100g=float(ing.carbs_per_100g),
-                    fat_per_100g=float(ing.fat_per_100g),
-                    fiber_per_100g=float(ing.fiber_per_100g) if ing.fiber_per_100g else None,
-                    cooked_weight_factor=float(ing.cooked_weight_factor),
-                    default_unit=ing.default_unit,
-                )
+        # Link to existing ingredients where possible (same FDC ID or name)
+        ingredient_index = await IngredientIndex.load(ctx.turso)
+        new_ingredients = []
+        linked = []
+        for ing, qty, unit in recipe_ingredients:
+            ing_id, created = ingredient_index.resolve_or_create(
+                dict(id=ing.id, name_it=ing.name_it, usda_fdc_id=ing.usda_fdc_id)
             )
+            if created:
+                new_ingredients.append(ing)
+            linked.append((ing_id, qty, unit))
 
-        # Save recipe
-        run_async(
-            turso.insert_recipe(
+        # Recipe, ingredients, links and steps go out as a single transaction
+        await ctx.turso.save_recipe_graph(
+            recipe=dict(
                 id=recipe_id,
                 name_it=name_it,
                 name_en=name_en,
@@ -357,35 +597,48 @@ def recipe_add():
                 difficulty=difficulty.value,
                 kcal_per_100g=kcal_per_100g,
                 kcal_per_serving=kcal_per_serving,
-                protein_per_100g=float(protein_per_100g),
-                carbs_per_100g=float(carbs_per_100g),
-                fat_per_100g=float(fat_per_100g),
-                fiber_per_100g=None,
+                protein_per_100g=protein_per_100g,
+                carbs_per_100g=carbs_per_100g,
+                fat_per_100g=fat_per_100g,
+                fiber_per_100g=fiber_per_100g,
                 serving_weight_g=serving_weight,
+                protein_source="mixed",
                 is_published=False,
-            )
-        )
-
-        # Link ingredients
-        for i, (ing, qty, unit) in enumerate(recipe_ingredients):
-            run_async(
-                turso.insert_recipe_ingredient(
+            ),
+            ingredients=[
+                dict(
+                    id=ing.id,
+                    usda_fdc_id=ing.usda_fdc_id,
+                    name_it=ing.name_it,
+                    name_en=ing.name_en,
+                    category=ing.category,
+                    kcal_per_100g=ing.kcal_per_100g,
+                    protein_per_100g=float(ing.protein_per_100g),
+                    carbs_per_100g=float(ing.carbs_per_100g),
+                    fat_per_100g=float(ing.fat_per_100g),
+                    fiber_per_100g=float(ing.fiber_per_100g) if ing.fiber_per_100g else None,
+                    cooked_weight_factor=float(ing.cooked_weight_factor),
+                    default_unit=ing.default_unit,
+                )
+                for ing in new_ingredients
+            ],
+            recipe_ingredients=[
+                dict(
                     id=uuid4(),
                     recipe_id=recipe_id,
-                    ingredient_id=ing.id,
+                    ingredient_id=ing_id,
                     quantity=float(qty),
                     unit=unit,
                     is_optional=False,
                     notes_it=None,
                     notes_en=None,
                     order=i,
+                    cooking_factor=None,
                 )
-            )
-
-        # Save steps
-        for i, (step_it, step_en) in enumerate(steps, 1):
-            run_async(
-                turso.insert_recipe_step(
+                for i, (ing_id, qty, unit) in enumerate(linked)
+            ],
+            steps=[
+                dict(
                     id=uuid4(),
                     recipe_id=recipe_id,
                     step_number=i,
@@ -393,23 +646,270 @@ def recipe_add():
                     instruction_en=step_en,
                     image_url=None,
                 )
-            )
+                for i, (step_it, step_en) in enumerate(steps, 1)
+            ],
+        )
 
         console.print(f"\n[green]✅ Recipe saved![/green] ID: [cyan]{recipe_id}[/cyan]")
 
     except Exception as e:
         console.print(f"\n[red]❌ Error saving recipe: {e}[/red]")
         raise typer.Exit(1)
-    finally:
-        run_async(turso.close())
+
+
+def _to_float(val, default=0.0):
+    """Safe float conversion for optional JSON values."""
+    return float(val) if val is not None else default
+
+
+def _load_recipe_json(file_path: Path) -> dict:
+    """Read and validate a recipe JSON file. Raises ValueError if unusable."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if not isinstance(data, dict):
+        raise ValueError("expected a single recipe object")
+    if not data.get("slug"):
+        raise ValueError("no slug found")
+    if not data.get("name_it"):
+        raise ValueError("no name_it found")
+    if not isinstance(data.get("ingredients", []), list) or not isinstance(data.get("steps", []), list):
+        raise ValueError("ingredients and steps must be lists")
+    return data
+
+
+def _recipe_graph_from_json(data: dict, recipe_id, ingredient_index: IngredientIndex) -> dict:
+    """
+    Map a recipes_data/ JSON document onto TursoClient.save_recipe_graph rows.
+    Ingredients already known to ingredient_index are linked, not re-inserted.
+    """
+    recipe = dict(
+        id=recipe_id,
+        name_it=data["name_it"],
+        name_en=data.get("name_en"),
+        slug=data["slug"],
+        description_it=data.get("description_it"),
+        description_en=data.get("description_en"),
+        category=data.get("category", "main_course"),
+        image_url=data.get("image_url"),
+        prep_time_min=data.get("prep_time_min", 0),
+        cook_time_min=data.get("cook_time_min", 0),
+        total_time_min=data.get("prep_time_min", 0) + data.get("cook_time_min", 0),
+        servings=data.get("servings", 2),
+        difficulty=data.get("difficulty", "medium"),
+        kcal_per_100g=data.get("kcal_per_100g", 0),
+        kcal_per_serving=data.get("kcal_per_serving", 0),
+        protein_per_100g=_to_float(data.get("protein_per_100g")),
+        carbs_per_100g=_to_float(data.get("carbs_per_100g")),
+        fat_per_100g=_to_float(data.get("fat_per_100g")),
+        fiber_per_100g=_to_float(data.get("fiber_per_100g", 0)),
+        serving_weight_g=data.get("serving_weight_g", 0),
+        protein_source=data.get("protein_source", "mixed"),  # Mediterranean Diet rotation
+        is_published=True,  # Published by default from sync
+    )
+
+    # Ingredients: reuse canonical rows, nutrients are not in the JSON
+    ingredients = []
+    links = []
+    for i, ing in enumerate(data.get("ingredients", [])):
+        ingredient_row = dict(
+            id=uuid4(),
+            usda_fdc_id=None,  # Lost in JSON unless stored
+            name_it=ing.get("name_it", ing.get("name")),
+            name_en=ing.get("name_en"),
+            category=None,
+            kcal_per_100g=0,
+            protein_per_100g=0,
+            carbs_per_100g=0,
+            fat_per_100g=0,
+            fiber_per_100g=None,
+            cooked_weight_factor=_to_float(ing.get("cooking_factor", 1.0)),
+            default_unit=ing.get("unit", "g"),
+        )
+        ing_id, created = ingredient_index.resolve_or_create(ingredient_row)
+        if created:
+            ingredients.append(ingredient_row)
+        links.append(dict(
+            id=uuid4(),
+            recipe_id=recipe_id,
+            ingredient_id=ing_id,
+            quantity=_to_float(ing.get("quantity")),
+            unit=ing.get("unit", "g"),
+            is_optional=ing.get("is_optional", False),
+            notes_it=ing.get("notes_it"),
+            notes_en=ing.get("notes_en"),
+            order=i,
+            cooking_factor=ingredient_row["cooked_weight_factor"],
+        ))
+
+    # Steps: handle both string steps and object steps
+    steps = []
+    for i, step in enumerate(data.get("steps", []), 1):
+        if isinstance(step, dict):
+            instr_it = step.get("instruction_it")
+            instr_en = step.get("instruction_en")
+        else:
+            instr_it = str(step)
+            instr_en = None
+        steps.append(dict(
+            id=uuid4(),
+            recipe_id=recipe_id,
+            step_number=i,
+            instruction_it=instr_it,
+            instruction_en=instr_en,
+            image_url=None,
+        ))
+
+    return dict(recipe=recipe, ingredients=ingredients, recipe_ingredients=links, steps=steps)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values (0 if empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+async def _sync_recipes(
+    turso: TursoClient, directory: Path, json_files: list[Path], concurrency: int, force: bool
+) -> tuple[dict[str, int], list[float]]:
+    """
+    Incremental sync pipeline.
+
+    Files are read, validated and hashed concurrently in worker threads and
+    diffed against the directory's sync manifest plus a single slug->id
+    query. Only added, changed or removed recipes are written, through a
+    shared TursoClient with at most `concurrency` batches in flight.
+    Changed recipes are updated in place so their IDs never change; files
+    repeating an earlier file's slug are skipped. New ingredients left
+    unlinked by failed writes are deleted again.
+    Returns (counts per outcome, write latencies).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    counts = {"added": 0, "changed": 0, "unchanged": 0, "removed": 0, "failed": 0}
+
+    async def load(file_path: Path) -> Optional[tuple[Path, dict, str]]:
+        try:
+            data = await asyncio.to_thread(_load_recipe_json, file_path)
+        except (OSError, ValueError) as e:
+            console.print(f"[yellow]⚠️  Skipping {file_path.name}: {e}[/yellow]")
+            counts["failed"] += 1
+            return None
+        return file_path, data, content_hash(data)
+
+    loaded = [item for item in await asyncio.gather(*(load(p) for p in json_files)) if item]
+
+    # The only metadata query: which slugs already exist, and under which ID
+    existing = await turso.get_recipe_ids_by_slug()
+    manifest = SyncManifest.load(directory, turso.url)
+
+    # Diff directory contents against the manifest
+    writes = []  # (file_path, data, hash, existing_id or None)
+    seen: dict[str, str] = {}  # slug -> file name
+    for file_path, data, digest in sorted(loaded, key=lambda item: item[0].name):
+        slug = data["slug"]
+        if slug in seen:
+            console.print(
+                f"[yellow]⚠️  Skipping {file_path.name}: slug '{slug}' already used by {seen[slug]}[/yellow]"
+            )
+            counts["failed"] += 1
+            continue
+        seen[slug] = file_path.name
+        db_id = existing.get(slug)
+        entry = manifest.get(slug)
+        if db_id is None:
+            writes.append((file_path, data, digest, None))
+        elif force or not entry or entry["hash"] != digest or entry["id"] != str(db_id):
+            writes.append((file_path, data, digest, db_id))
+        else:
+            counts["unchanged"] += 1
+
+    # Resolve ingredients against canonical rows; new ones are inserted up
+    # front in one batch so concurrent recipe writes can share them safely
+    graphs = []
+    new_ingredients = []
+    if writes:
+        ingredient_index = await IngredientIndex.load(turso)
+        for file_path, data, digest, db_id in writes:
+            graph = _recipe_graph_from_json(data, db_id or uuid4(), ingredient_index)
+            new_ingredients += graph.pop("ingredients")
+            graphs.append((file_path, data, digest, db_id, graph))
+        await turso.insert_ingredients_many(new_ingredients)
+
+    present = set(seen)
+    removed = [
+        slug for slug, entry in manifest.entries.items()
+        if slug not in present and str(existing.get(slug)) == entry["id"]
+    ]
+    stale = [slug for slug in manifest.entries if slug not in present and slug not in removed]
+    for slug in stale:
+        manifest.forget(slug)
+
+    if removed:
+        try:
+            await turso.delete_recipes([existing[slug] for slug in removed])
+            for slug in removed:
+                console.print(f"  [red]Removed: {slug}[/red]")
+                manifest.forget(slug)
+            counts["removed"] = len(removed)
+        except Exception as e:
+            console.print(f"[red]❌ Failed to remove {len(removed)} recipes: {e}[/red]")
+            counts["failed"] += len(removed)
+
+    with Progress(
+        TextColumn("[cyan]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TimeElapsedColumn(),
+        console=console,
+    ) as progress:
+        task = progress.add_task("Syncing", total=len(graphs))
+
+        async def write(file_path: Path, data: dict, digest: str, db_id, graph: dict) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    if db_id:
+                        await turso.update_recipe_graph(**graph, ingredients=[])
+                    else:
+                        await turso.save_recipe_graph(**graph, ingredients=[])
+                except Exception as e:
+                    progress.console.print(f"[red]❌ Failed to sync {file_path.name}: {e}[/red]")
+                    counts["failed"] += 1
+                    progress.advance(task)
+                    return
+                latencies.append(time.perf_counter() - started)
+
+            manifest.record(data["slug"], file_path.name, digest, str(graph["recipe"]["id"]))
+            if db_id:
+                counts["changed"] += 1
+                progress.console.print(f"  [dim]Updated: {data.get('name_it')}[/dim]")
+            else:
+                counts["added"] += 1
+                progress.console.print(f"  [green]New: {data.get('name_it')}[/green]")
+            progress.advance(task)
+
+        await asyncio.gather(*(write(*item) for item in graphs))
+    manifest.save()
+
+    if counts["failed"] and new_ingredients:
+        orphans = await turso.delete_unused_ingredients([row["id"] for row in new_ingredients])
+        if orphans:
+            console.print(f"[dim]Deleted {orphans} new ingredients left unused by failed writes[/dim]")
+    return counts, latencies
 
 
 @app.command("sync")
-def sync_data(
+@async_command
+async def sync_data(
     directory: str = typer.Option("recipes_data", "--dir", "-d", help="Directory containing JSON recipes"),
-    force: bool = typer.Option(False, "--force", "-f", help="Force overwrite without confirmation"),
+    force: bool = typer.Option(False, "--force", "-f", help="Rewrite every recipe, even if unchanged"),
+    concurrency: int = typer.Option(8, "--concurrency", "-c", min=1, help="Max concurrent writes to Turso"),
 ):
-    """Sync all JSON recipes from a directory to Turso DB."""
+    """Sync JSON recipes from a directory to Turso DB (only added/changed/removed ones)."""
 
     dir_path = Path(directory)
     if not dir_path.exists():
@@ -421,160 +921,46 @@ def sync_data(
         console.print(f"[yellow]No JSON files found in {directory}[/yellow]")
         raise typer.Exit(0)
 
-    console.print(f"\n[cyan]🔄 Syncing {len(json_files)} recipes from '{directory}'...[/cyan]\n")
-
-    turso = TursoClient()
-    success_count = 0
+    console.print(
+        f"\n[cyan]🔄 Syncing {len(json_files)} recipes from '{directory}' "
+        f"(concurrency {concurrency})...[/cyan]\n"
+    )
 
+    started = time.perf_counter()
     try:
-        for file_path in json_files:
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-
-                slug = data.get("slug")
-                if not slug:
-                    console.print(f"[yellow]⚠️  Skipping {file_path.name}: No slug found[/yellow]")
-                    continue
-
-                # Check if exists
-                existing = run_async(turso.get_recipe_by_slug(slug))
-                if existing:
-                    if not force:
-                        # Optional: could add logic to only update if changed, but full overwrite is safer for now
-                        pass
-
-                    # Delete existing
-                    from uuid import UUID
-                    old_id = UUID(existing["id"])
-                    run_async(turso.delete_recipe(old_id))
-                    console.print(f"  [dim]Updated: {data.get('name_it')} (replaced)[/dim]")
-                else:
-                    console.print(f"  [green]New: {data.get('name_it')}[/green]")
-
-                # Insert
-                recipe_id = uuid4()
-
-                # Helper to safely float conversion
-                def to_float(val, default=0.0):
-                    return float(val) if val is not None else default
-
-                # Check for dietary flags
-                # Note: Turso schema might not have dietary flags columns yet or handled via tags?
-                # Based on previous context, user was adding fields to Pydantic models.
-                # Assuming simple mapping for now.
-
-                run_async(
-                    turso.insert_recipe(
-                        id=recipe_id,
-                        name_it=data["name_it"],
-                        name_en=data.get("name_en"),
-                        slug=slug,
-                        description_it=data.get("description_it"),
-                        description_en=data.get("description_en"),
-                        category=data.get("category", "main_course"),
-                        image_url=data.get("image_url"),
-                        prep_time_min=data.get("prep_time_min", 0),
-                        cook_time_min=data.get("cook_time_min", 0),
-                        total_time_min=data.get("prep_time_min", 0) + data.get("cook_time_min", 0),
-                        servings=data.get("servings", 2),
-                        difficulty=data.get("difficulty", "medium"),
-                        kcal_per_100g=data.get("kcal_per_100g", 0),
-                        kcal_per_serving=data.get("kcal_per_serving", 0),
-                        protein_per_100g=to_float(data.get("protein_per_100g")),
-                        carbs_per_100g=to_float(data.get("carbs_per_100g")),
-                        fat_per_100g=to_float(data.get("fat_per_100g")),
-                        fiber_per_100g=to_float(data.get("fiber_per_100g", 0)),
-                        serving_weight_g=data.get("serving_weight_g", 0),
-                        protein_source=data.get("protein_source", "mixed"),  # Mediterranean Diet rotation
-                        is_published=True, # Published by default from sync
-                    )
-                )
-
-                # Ingredients
-                for i, ing in enumerate(data.get("ingredients", [])):
-                    ing_id = uuid4()
-
-                    # Try to reuse existing ingredient if possible?
-                    # For now, creating fresh to ensure data consistency with recipe.
-                    # Or maybe creating 'recipe-specific' ingredients logic.
-
-                    run_async(
-                        turso.insert_ingredient(
-                            id=ing_id,
-                            usda_fdc_id=None, # Lost in JSON unless stored
-                            name_it=ing.get("name_it", ing.get("name")),
-                            name_en=ing.get("name_en"),
-                            category=None,
-                            kcal_per_100g=0,
-                            protein_per_100g=0,
-                            carbs_per_100g=0,
-                            fat_per_100g=0,
-                            fiber_per_100g=None,
-                            cooked_weight_factor=to_float(ing.get("cooking_factor", 1.0)),
-                            default_unit=ing.get("unit", "g"),
-                        )
-                    )
-
-                    run_async(
-                        turso.insert_recipe_ingredient(
-                            id=uuid4(),
-                            recipe_id=recipe_id,
-                            ingredient_id=ing_id,
-                            quantity=to_float(ing.get("quantity")),
-                            unit=ing.get("unit", "g"),
-                            is_optional=ing.get("is_optional", False),
-                            notes_it=ing.get("notes_it"),
-                            notes_en=ing.get("notes_en"),
-                            order=i,
-                        )
-                    )
-
-                # Steps
-                for i, step in enumerate(data.get("steps", []), 1):
-                    # Handle both string steps and object steps
-                    if isinstance(step, dict):
-                        instr_it = step.get("instruction_it")
-                        instr_en = step.get("instruction_en")
-                    else:
-                        instr_it = str(step)
-                        instr_en = None
-
-                    run_async(
-                        turso.insert_recipe_step(
-                            id=uuid4(),
-                            recipe_id=recipe_id,
-                            step_number=i,
-                            instruction_it=instr_it,
-                            instruction_en=instr_en,
-                            image_url=None,
-                        )
-                    )
-
-                success_count += 1
-
-            except Exception as e:
-                console.print(f"[red]❌ Failed to sync {file_path.name}: {e}[/red]")
-
+        async with AppContext() as ctx:
+            counts, latencies = await _sync_recipes(ctx.turso, dir_path, json_files, concurrency, force)
     except Exception as general_e:
         console.print(f"[red]❌ General error: {general_e}[/red]")
         raise typer.Exit(1)
-    finally:
-        run_async(turso.close())
+    elapsed = time.perf_counter() - started
 
-    console.print(f"\n[bold green]✅ Synced {success_count}/{len(json_files)} recipes.[/bold green]")
+    written = counts["added"] + counts["changed"]
+    console.print(
+        f"\n[bold green]✅ Sync done: {counts['added']} new, {counts['changed']} updated, "
+        f"{counts['removed']} removed, {counts['unchanged']} unchanged.[/bold green]"
+    )
+    if counts["failed"]:
+        console.print(f"[red]❌ Failures: {counts['failed']}[/red]")
+    console.print(
+        f"[dim]{elapsed:.1f}s total | {written / elapsed if elapsed else 0:.1f} recipes/s | "
+        f"write p50 {_percentile(latencies, 50) * 1000:.0f} ms, "
+        f"p95 {_percentile(latencies, 95) * 1000:.0f} ms[/dim]"
+    )
 
 
 @app.command("list")
-def recipe_list(
+@async_command
+async def recipe_list(
     category: Optional[str] = typer.Option(None, "--category", "-c", help="Filter by category"),
 ):
     """List all recipes in the database."""
     console.print("\n[cyan]📖 Recipes[/cyan]\n")
 
-    turso = TursoClient()
+    ctx = AppContext()
+    turso = ctx.turso
     try:
-        recipes = run_async(turso.get_recipes(category))
+        recipes = await turso.get_recipes(category)
 
         if not recipes:
             console.print("[yellow]No recipes found.[/yellow]")
@@ -610,11 +996,12 @@ def recipe_list(
             console.print(f"[red]❌ Error: {e}[/red]")
         raise typer.Exit(1)
     finally:
-        run_async(turso.close())
+        await ctx.close()
 
 
 @app.command("delete")
-def recipe_delete(
+@async_command
+async def recipe_delete(
     recipe_id: str = typer.Argument(..., help="Recipe ID (UUID) to delete"),
 ):
     """Delete a recipe and all its related data."""
@@ -622,7 +1009,8 @@ def recipe_delete(
 
     console.print(f"\n[cyan]🗑️  Deleting recipe...[/cyan]\n")
 
-    turso = TursoClient()
+    ctx = AppContext()
+    turso = ctx.turso
     try:
         # Validate UUID
         try:
@@ -632,7 +1020,7 @@ def recipe_delete(
             raise typer.Exit(1)
 
         # Find recipe first
-        recipe = run_async(turso.get_recipe_by_id(uuid_obj))
+        recipe = await turso.get_recipe_by_id(uuid_obj)
         if not recipe:
             console.print(f"[yellow]Recipe not found: {recipe_id}[/yellow]")
             raise typer.Exit(1)
@@ -645,7 +1033,7 @@ def recipe_delete(
             raise typer.Exit(0)
 
         # Delete recipe and related data
-        run_async(turso.delete_recipe(uuid_obj))
+        await turso.delete_recipe(uuid_obj)
         console.print(f"\n[green]✅ Recipe deleted![/green]")
 
     except typer.Exit:
@@ -654,41 +1042,192 @@ def recipe_delete(
         console.print(f"[red]❌ Error: {e}[/red]")
         raise typer.Exit(1)
     finally:
-        run_async(turso.close())
+        await ctx.close()
 
 
 # ============ Import Commands ============
 
 
 @app.command("import-url")
-def import_url(
+@async_command
+async def import_url(
     url: str = typer.Argument(..., help="Recipe URL (SOSCuisine, GialloZafferano, etc.)"),
+    translate: bool = typer.Option(
+        False, "--translate", help="Ask Gemini for ingredient names missing from the translation dictionary"
+    ),
 ):
     """Import recipe from a supported website URL."""
-    from recipe_manager.services.scraper import scrape_url
+    from recipe_manager.services.scraper import UNKNOWN_RECIPE_NAME, scrape_url
     from recipe_manager.services.parser import ParsedRecipe
 
     console.print(f"\n[cyan]🌐 Fetching recipe from URL...[/cyan]\n")
 
-    try:
-        recipe = run_async(scrape_url(url))
-    except Exception as e:
-        console.print(f"[red]❌ Failed to scrape URL: {e}[/red]")
-        raise typer.Exit(1)
+    async with AppContext(use_cache=state["use_cache"]) as ctx:
+        try:
+            recipe = await scrape_url(url, client=ctx.http, cache=ctx.page_cache)
+        except Exception as e:
+            console.print(f"[red]❌ Failed to scrape URL: {e}[/red]")
+            raise typer.Exit(1)
+
+        if not recipe or not recipe.name_it or recipe.name_it == UNKNOWN_RECIPE_NAME:
+            console.print("[red]❌ Could not parse recipe from URL[/red]")
+            raise typer.Exit(1)
 
-    if not recipe or not recipe.name_it:
-        console.print("[red]❌ Could not parse recipe from URL[/red]")
+        _show_parsed_recipe_preview(recipe)
+        await _save_parsed_recipe(ctx, recipe, translate=translate)
+
+
+@app.command("import-urls")
+@async_command
+async def import_urls(
+    source: str = typer.Argument(..., help="File with one URL per line, or '-' for stdin"),
+    out_dir: Optional[Path] = typer.Option(
+        None, "--out", "-o", help="Write recipes_data JSON files here instead of saving to Turso"
+    ),
+    per_host: int = typer.Option(2, "--per-host", min=1, help="Max concurrent requests per host"),
+    delay: float = typer.Option(1.0, "--delay", min=0, help="Seconds between requests to the same host"),
+    batch_size: int = typer.Option(20, "--batch-size", "-b", min=1, help="Recipes written per transaction"),
+    translate: bool = typer.Option(
+        False, "--translate", help="Ask Gemini for ingredient names missing from the translation dictionary"
+    ),
+    force: bool = typer.Option(False, "--force", "-f", help="With --out, overwrite existing JSON files"),
+):
+    """Scrape many recipe URLs concurrently and save them to Turso or as JSON files."""
+    import sys
+    from recipe_manager.services.crawler import crawl, read_url_list
+
+    if source == "-":
+        urls = read_url_list(sys.stdin)
+    elif Path(source).is_file():
+        urls = read_url_list(Path(source).read_text(encoding="utf-8").splitlines())
+    else:
+        console.print(f"[red]❌ File not found: {source}[/red]")
         raise typer.Exit(1)
 
-    _show_parsed_recipe_preview(recipe)
-    _save_parsed_recipe(recipe)
+    if not urls:
+        console.print("[yellow]No URLs found.[/yellow]")
+        raise typer.Exit(0)
+
+    console.print(
+        f"\n[cyan]🌐 Fetching {len(urls)} URLs ({per_host} per host, {delay:g}s delay)...[/cyan]\n"
+    )
+    if out_dir:
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+    counts = {"imported": 0, "updated": 0, "skipped": 0, "failed": 0}
+    start = time.perf_counter()
+
+    async with AppContext(use_cache=state["use_cache"]) as ctx:
+        if not out_dir:
+            # Loaded once: existing slugs are rewritten in place, ingredients deduplicated
+            ingredient_index = await IngredientIndex.load(ctx.turso)
+            existing_ids = await ctx.turso.get_recipe_ids_by_slug()
+        pending = []
+        run_slugs = set()
+
+        async def flush() -> None:
+            # Known ingredient names are translated from the dictionary; at most one Gemini request per batch
+            await _apply_translations(ctx.translations, pending, translate)
+            if out_dir:
+                for recipe in pending:
+                    data = _parsed_recipe_to_json(recipe)
+                    (out_dir / f"{data['slug'].replace('-', '_')}.json").write_text(
+                        json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8"
+                    )
+                counts["imported"] += len(pending)
+                pending.clear()
+                return
+
+            graphs = _build_recipe_graphs(pending, existing_ids, ingredient_index)
+            pending.clear()
+            try:
+                await _save_recipe_graphs(ctx.turso, graphs, existing_ids, ingredient_index)
+            except Exception as e:
+                console.print(f"[red]❌ Save error (batch of {len(graphs)}): {e}[/red]")
+                counts["failed"] += len(graphs)
+            else:
+                batch_updated = sum(1 for g in graphs if g["update"])
+                counts["updated"] += batch_updated
+                counts["imported"] += len(graphs) - batch_updated
+
+        with Progress(
+            TextColumn("[cyan]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeElapsedColumn(),
+            console=console,
+        ) as progress:
+            task = progress.add_task("Crawling", total=len(urls))
+            async for result in crawl(urls, ctx.http, per_host=per_host, delay=delay, cache=ctx.page_cache):
+                progress.advance(task)
+                if result.error:
+                    progress.console.print(f"[red]❌ {result.url}: {result.error}[/red]")
+                    counts["failed"] += 1
+                    continue
+
+                # Two pages with the same title in one run would overwrite each other
+                slug = slugify(result.recipe.name_it)
+                if slug in run_slugs:
+                    progress.console.print(
+                        f"[yellow]⚠️  {result.url}: same title as an earlier page ({slug}), skipped[/yellow]"
+                    )
+                    counts["failed"] += 1
+                    continue
+                run_slugs.add(slug)
+                if out_dir and not force and (out_dir / f"{slug.replace('-', '_')}.json").exists():
+                    progress.console.print(
+                        f"[yellow]⚠️  {result.url}: {slug.replace('-', '_')}.json already exists, skipped[/yellow]"
+                    )
+                    counts["skipped"] += 1
+                    continue
+                pending.append(result.recipe)
+                if len(pending) >= batch_size:
+                    await flush()
+                progress.console.print(f"  [green]✓ {result.recipe.name_it}[/green]")
+
+        if pending:
+            await flush()
+
+    elapsed = time.perf_counter() - start
+    done = counts["imported"] + counts["updated"]
+    console.print(f"\n[bold]Summary:[/bold]")
+    if out_dir:
+        console.print(
+            f"[green]✅ Written: {counts['imported']} JSON files to {out_dir} | "
+            f"Skipped (already exist): {counts['skipped']}[/green]"
+        )
+    else:
+        console.print(f"[green]✅ Imported: {counts['imported']} | Updated: {counts['updated']}[/green]")
+    if counts["failed"]:
+        console.print(f"[red]❌ Failures: {counts['failed']}[/red]")
+    console.print(f"[dim]{elapsed:.1f}s total | {done / elapsed if elapsed else 0:.1f} recipes/s[/dim]")
 
 
 @app.command("import-text")
-def import_text():
-    """Import recipe from pasted text (multiline input)."""
+@async_command
+async def import_text(
+    batch: Optional[Path] = typer.Option(
+        None, "--batch", "-b", help="Text dump with many recipes separated by '---', '===' or 'END' lines"
+    ),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", "-w", min=1, help="Parser processes for --batch (default: all cores)"
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", help="With --batch, parse and report without saving"),
+    translate: bool = typer.Option(
+        False, "--translate", help="Ask Gemini for ingredient names missing from the translation dictionary"
+    ),
+    replace: bool = typer.Option(
+        False, "--replace",
+        help="With --batch, rewrite recipes whose slug already exists (keeping their ID) instead of skipping them",
+    ),
+):
+    """Import recipe from pasted text (multiline input), or many recipes with --batch."""
     from recipe_manager.services.parser import parse_full_recipe_text
 
+    if batch is not None:
+        await _import_text_batch(batch, workers, dry_run, translate, replace)
+        return
+
     console.print("\n[bold cyan]📋 Paste Recipe Text[/bold cyan]")
     console.print("[dim]Paste the recipe text, then type 'END' on a new line and press Enter.[/dim]\n")
 
@@ -732,30 +1271,102 @@ def import_text():
             raise typer.Exit(0)
 
     _show_parsed_recipe_preview(recipe)
-    _save_parsed_recipe(recipe)
+    async with AppContext() as ctx:
+        await _save_parsed_recipe(ctx, recipe, translate=translate)
+
+
+async def _import_text_batch(
+    path: Path, workers: Optional[int], dry_run: bool, translate: bool = False, replace: bool = False
+):
+    """Parse a multi-recipe dump on a process pool and save results as they arrive."""
+    from recipe_manager.services.parser import parse_many, split_recipe_dump
+
+    if not path.is_file():
+        console.print(f"[red]❌ File not found: {path}[/red]")
+        raise typer.Exit(1)
+
+    texts = split_recipe_dump(path.read_text(encoding="utf-8"))
+    if not texts:
+        console.print("[yellow]No recipes found in file.[/yellow]")
+        raise typer.Exit(0)
+
+    console.print(f"\n[cyan]🔍 Parsing {len(texts)} recipes from {path.name}...[/cyan]\n")
+
+    parsed_count = 0
+    success_count = 0
+    skipped_count = 0
+    error_count = 0
+    start = time.perf_counter()
+
+    ctx = None if dry_run else AppContext()
+    try:
+        ingredient_index = await IngredientIndex.load(ctx.turso) if ctx else None
+        results = parse_many(texts, workers=workers)
+        for number in range(1, len(texts) + 1):
+            # Advance the pool iterator off the event loop; workers keep parsing meanwhile
+            recipe = await asyncio.to_thread(next, results)
+
+            if not recipe.name_it:
+                console.print(f"[yellow]Skipping recipe #{number}: no name found[/yellow]")
+                error_count += 1
+                continue
+            parsed_count += 1
+
+            if dry_run:
+                console.print(
+                    f"[dim]#{number}[/dim] {recipe.name_it} "
+                    f"[dim]({len(recipe.ingredients)} ingredients, {len(recipe.steps)} steps, "
+                    f"{recipe.nutrition.kcal} kcal)[/dim]"
+                )
+                continue
+
+            try:
+                if await _save_parsed_recipe(
+                    ctx, recipe, confirm=False, ingredient_index=ingredient_index, translate=translate, replace=replace
+                ):
+                    success_count += 1
+                    console.print(f"[green]✓ Imported: {recipe.name_it}[/green]")
+                else:
+                    skipped_count += 1
+            except Exception as e:
+                console.print(f"[red]❌ Save error ({recipe.name_it}): {e}[/red]")
+                error_count += 1
+    finally:
+        if ctx:
+            await ctx.close()
+
+    elapsed = time.perf_counter() - start
+    console.print(f"\n[bold]Summary:[/bold]")
+    console.print(f"[cyan]🔍 Parsed: {parsed_count} in {elapsed:.1f}s[/cyan]")
+    if not dry_run:
+        console.print(f"[green]✅ Imported: {success_count} | Skipped (already exist): {skipped_count}[/green]")
+    if error_count > 0:
+        console.print(f"[red]❌ Failures: {error_count}[/red]")
 
 
 @app.command("reset")
-def reset_db():
+@async_command
+async def reset_db():
     """Delete ALL data from the database (Recipes, Ingredients, Steps)."""
     console.print("\n[bold red]⚠️  DANGER ZONE: DELETE ALL DATA[/bold red]\n")
     if not Confirm.ask("Are you sure you want to delete ALL recipes and ingredients?", default=False):
         console.print("[yellow]Cancelled.[/yellow]")
         raise typer.Exit(0)
 
-    turso = TursoClient()
+    ctx = AppContext()
+    turso = ctx.turso
     try:
         console.print("[dim]Deleting recipe_ingredients...[/dim]")
-        run_async(turso.execute("DELETE FROM recipe_ingredients"))
+        await turso.execute("DELETE FROM recipe_ingredients")
 
         console.print("[dim]Deleting recipe_steps...[/dim]")
-        run_async(turso.execute("DELETE FROM recipe_steps"))
+        await turso.execute("DELETE FROM recipe_steps")
 
         console.print("[dim]Deleting recipes...[/dim]")
-        run_async(turso.execute("DELETE FROM recipes"))
+        await turso.execute("DELETE FROM recipes")
 
         console.print("[dim]Deleting ingredients...[/dim]")
-        run_async(turso.execute("DELETE FROM ingredients"))
+        await turso.execute("DELETE FROM ingredients")
 
         console.print("\n[green]✅ Database cleared![/green]")
 
@@ -763,13 +1374,177 @@ def reset_db():
         console.print(f"[red]❌ Error: {e}[/red]")
         raise typer.Exit(1)
     finally:
-        run_async(turso.close())
+        await ctx.close()
+
+
+@app.command("dedupe-ingredients")
+@async_command
+async def ingredient_dedupe(
+    yes: bool = typer.Option(False, "--yes", "-y", help="Merge without confirmation"),
+):
+    """Merge duplicate ingredients (same normalized name) and repoint recipe links."""
+    console.print("\n[cyan]🧹 Looking for duplicate ingredients...[/cyan]\n")
+
+    ctx = AppContext()
+    turso = ctx.turso
+    try:
+        rows = await turso.get_ingredients()
+        merges = plan_ingredient_merges(rows)
+        duplicate_count = sum(len(ids) for ids in merges.values())
+
+        if not merges:
+            console.print("[green]✓ No duplicates found.[/green]")
+            raise typer.Exit(0)
+
+        names = {row["id"]: row["name_it"] for row in rows}
+        table = Table(title=f"{duplicate_count} duplicates in {len(merges)} groups")
+        table.add_column("Canonical", style="white", max_width=40)
+        table.add_column("Duplicates", justify="right", style="yellow")
+        for canonical_id, duplicate_ids in list(merges.items())[:20]:
+            table.add_row(names[canonical_id], str(len(duplicate_ids)))
+        console.print(table)
+        if len(merges) > 20:
+            console.print(f"[dim]... and {len(merges) - 20} more groups[/dim]")
+
+        if not yes and not Confirm.ask(f"\nMerge {duplicate_count} duplicate ingredients?", default=False):
+            console.print("[yellow]Cancelled.[/yellow]")
+            raise typer.Exit(0)
+
+        await turso.merge_ingredients(merges)
+        console.print(f"\n[green]✅ Merged {duplicate_count} duplicates into {len(merges)} ingredients.[/green]")
+
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print(f"[red]❌ Error: {e}[/red]")
+        raise typer.Exit(1)
+    finally:
+        await ctx.close()
+
+
+@app.command("recompute-nutrition")
+@async_command
+async def recompute_nutrition(
+    slugs: list[str] = typer.Argument(..., help="Slugs of the recipes to recompute"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Compute and report without writing"),
+):
+    """Rebuild some recipes' nutrients (per 100g and per serving) from their ingredients."""
+    await _recompute_nutrition(slugs, dry_run, batch_size=len(slugs))
+
+
+@app.command("recompute-all")
+@async_command
+async def recompute_all(
+    dry_run: bool = typer.Option(False, "--dry-run", help="Compute and report without writing"),
+    batch_size: int = typer.Option(500, "--batch-size", "-b", min=1, help="Recipes updated per transaction"),
+):
+    """Recompute every recipe's nutrients from its ingredients and write back only those that changed."""
+    await _recompute_nutrition(None, dry_run, batch_size)
+
+
+async def _recompute_nutrition(slugs: Optional[list[str]], dry_run: bool, batch_size: int):
+    """
+    Bulk-load recipes, recipe_ingredients and ingredients, aggregate them as a
+    sparse recipe x ingredient matrix and UPDATE recipes whose values differ.
+    """
+    from recipe_manager.services.nutrition import IngredientTable, RecipeLines, aggregate
+
+    start = time.perf_counter()
+    ctx = AppContext()
+    try:
+        recipes = await ctx.turso.get_recipes()
+        if slugs:
+            wanted = set(slugs)
+            recipes = [r for r in recipes if r["slug"] in wanted]
+            for slug in wanted - {r["slug"] for r in recipes}:
+                console.print(f"[yellow]⚠️  Recipe not found: {slug}[/yellow]")
+        if not recipes:
+            console.print("[yellow]No recipes to recompute.[/yellow]")
+            raise typer.Exit(0)
+
+        ingredients = IngredientTable.from_rows(await ctx.turso.get_ingredients())
+        links = await ctx.turso.get_recipe_ingredient_links()
+        loaded = time.perf_counter()
+
+        lines = RecipeLines.from_links(links, {r["id"]: i for i, r in enumerate(recipes)}, ingredients)
+        if lines.missing:
+            console.print(
+                f"[yellow]⚠️  {lines.missing} ingredient lines link to missing ingredients; "
+                f"their recipes are skipped.[/yellow]"
+            )
+        result = aggregate(lines, [r["servings"] for r in recipes])
+        changed = result.changed(recipes)
+        updates = [
+            dict(id=recipe["id"], **result.recipe_fields(i))
+            for i, recipe in enumerate(recipes)
+            if result.complete[i] and changed[i]
+        ]
+        computed = time.perf_counter()
+
+        complete = int(result.complete.sum())
+        table = Table(title=f"{len(updates)} of {complete} recomputable recipes changed")
+        table.add_column("Recipe", style="white", max_width=40)
+        table.add_column("kcal/100g", justify="right")
+        table.add_column("kcal/serving", justify="right")
+        table.add_column("Serving (g)", justify="right")
+        by_id = {r["id"]: r for r in recipes}
+        for row in updates[:20]:
+            old = by_id[row["id"]]
+            table.add_row(
+                old["name_it"],
+                f"{old['kcal_per_100g']} → {row['kcal_per_100g']}",
+                f"{old['kcal_per_serving']} → {row['kcal_per_serving']}",
+                f"{old['serving_weight_g']} → {row['serving_weight_g']}",
+            )
+        if updates:
+            console.print(table)
+        if len(updates) > 20:
+            console.print(f"[dim]... and {len(updates) - 20} more[/dim]")
+        skipped = len(recipes) - complete
+        if skipped:
+            console.print(
+                f"[yellow]Skipped {skipped} recipes with unweighed or unmatched ingredients "
+                f"(pieces, or no USDA data).[/yellow]"
+            )
+
+        if not dry_run:
+            for offset in range(0, len(updates), batch_size):
+                await ctx.turso.update_recipe_nutrition(updates[offset:offset + batch_size])
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print(f"[red]❌ Error: {e}[/red]")
+        raise typer.Exit(1)
+    finally:
+        await ctx.close()
+
+    done = time.perf_counter()
+    console.print(
+        f"\n[green]✅ {'Would update' if dry_run else 'Updated'} {len(updates)} of {len(recipes)} recipes[/green] "
+        f"[dim]({len(links)} ingredient links; load {loaded - start:.2f}s, "
+        f"compute {(computed - loaded) * 1000:.0f} ms, write {done - computed:.2f}s)[/dim]"
+    )
 
 
 @app.command("import-llm")
-def import_llm():
-    """Import recipe using Gemini LLM for perfect parsing and translation."""
-    from recipe_manager.services.llm_parser import parse_recipe_with_llm
+@async_command
+async def import_llm(
+    batch: Optional[Path] = typer.Option(
+        None, "--batch", "-b", help="Directory of raw recipe text files, one recipe per file"
+    ),
+    out_dir: Path = typer.Option(Path("recipes_data"), "--out", "-o", help="With --batch, where JSON files are written"),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", min=1, help="With --batch, max Gemini requests in flight"),
+    pattern: str = typer.Option("*.txt", "--glob", help="With --batch, which files to read"),
+    raw: bool = typer.Option(False, "--raw", help="Send the full text instead of the locally pre-parsed draft"),
+):
+    """Import recipe using Gemini LLM for perfect parsing and translation, or many with --batch."""
+    from recipe_manager.services.llm_cache import LLMCache
+    from recipe_manager.services.llm_parser import SYSTEM_PROMPT, parse_recipe_with_llm
+    from recipe_manager.services.preparse import preparse_recipe_text
+
+    if batch is not None:
+        await _import_llm_batch(batch, out_dir, concurrency, pattern, preparse=not raw)
+        return
 
     console.print("\n[bold cyan]🤖 LLM Recipe Import (Gemini)[/bold cyan]")
     console.print("[dim]Paste the recipe text, then type 'END' on a new line.[/dim]\n")
@@ -795,13 +1570,27 @@ def import_llm():
         console.print(f"[yellow]⚠️  Text too short ({len(text)} chars).[/yellow]")
         raise typer.Exit(1)
 
-    console.print(f"\n[cyan]🤖 Sending to Gemini... ({len(text)} chars)[/cyan]\n")
+    if raw:
+        console.print(f"\n[cyan]🤖 Sending to Gemini... ({len(text)} chars)[/cyan]\n")
+    else:
+        draft = preparse_recipe_text(text)
+        console.print(
+            f"\n[cyan]🤖 Sending to Gemini... ({len(draft.text)} of {len(text)} chars, "
+            f"{draft.ingredients} ingredients and {draft.steps} steps found locally)[/cyan]\n"
+        )
+        text = draft.text
 
+    llm_cache = LLMCache(SYSTEM_PROMPT) if state["use_cache"] else None
+    # Ingredients the dictionary knows are sent as such and come back untranslated
+    translations = TranslationCache()
     try:
-        data = parse_recipe_with_llm(text)
+        data = parse_recipe_with_llm(text, cache=llm_cache, preparse=False, translations=translations)
+        if llm_cache and llm_cache.hits:
+            console.print("[dim]Answered from the local LLM cache.[/dim]")
         # Convert dict to ParsedRecipe model
         from recipe_manager.services.llm_parser import llm_result_to_parsed_recipe
         recipe = llm_result_to_parsed_recipe(data)
+        translations.apply(recipe)
     except ValueError as e:
         console.print(f"[red]❌ LLM Error: {e}[/red]")
         raise typer.Exit(1)
@@ -809,9 +1598,150 @@ def import_llm():
         console.print(f"[red]❌ API Error: {e}[/red]")
         console.print("[dim]Make sure GEMINI_API_KEY is set in .env[/dim]")
         raise typer.Exit(1)
+    finally:
+        translations.close()
+        if llm_cache:
+            llm_cache.close()
 
     _show_parsed_recipe_preview(recipe)
-    _save_parsed_recipe(recipe)
+    async with AppContext() as ctx:
+        # Only new names are learned; on save, known names replace Gemini's so each ingredient keeps one
+        ctx.translations.learn_recipe(recipe, source="llm")
+        await _save_parsed_recipe(ctx, recipe)
+
+
+async def _import_llm_batch(directory: Path, out_dir: Path, concurrency: int, pattern: str, preparse: bool = True):
+    """Parse every text file in a directory through one async Gemini client, resumably."""
+    from recipe_manager.config.settings import Config
+    from recipe_manager.services.import_journal import ImportJournal, file_hash
+    from recipe_manager.services.llm_cache import LLMCache
+    from recipe_manager.services.llm_parser import (
+        SYSTEM_PROMPT,
+        create_client,
+        llm_result_to_parsed_recipe,
+        parse_recipe_with_llm_async,
+    )
+    from recipe_manager.services.rate_limit import TokenBucket
+
+    if not directory.is_dir():
+        console.print(f"[red]❌ Directory not found: {directory}[/red]")
+        raise typer.Exit(1)
+
+    files = sorted(path for path in directory.glob(pattern) if path.is_file())
+    if not files:
+        console.print(f"[yellow]No files matching {pattern} in {directory}[/yellow]")
+        raise typer.Exit(0)
+
+    journal = ImportJournal.load(directory)
+    todo = []
+    for path in files:
+        hash = file_hash(path)
+        if not journal.is_done(path.name, hash):
+            todo.append((path, hash))
+    skipped = len(files) - len(todo)
+
+    console.print(
+        f"\n[cyan]🤖 {len(todo)} files to parse ({skipped} already done), "
+        f"{concurrency} concurrent, {Config.GEMINI_RATE_PER_MINUTE:g} requests/min...[/cyan]\n"
+    )
+    if not todo:
+        return
+
+    try:
+        client = create_client()
+    except ValueError as e:
+        console.print(f"[red]❌ {e}[/red]")
+        raise typer.Exit(1)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    # Burst of at most `concurrency` requests, then the steady per-minute rate
+    limiter = TokenBucket(rate=Config.GEMINI_RATE_PER_MINUTE / 60, capacity=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    llm_cache = LLMCache(SYSTEM_PROMPT) if state["use_cache"] else None
+    # Also tells Gemini which ingredient names not to translate
+    translations = TranslationCache()
+    counts = {"done": 0, "failed": 0}
+    # JSON file name -> input file that produced it, this run and earlier ones
+    outputs = {entry["output"]: name for name, entry in journal.entries.items() if entry.get("output")}
+    start = time.perf_counter()
+
+    def taken(name: str, source: str) -> bool:
+        """A JSON name belongs to another input, or is a file the journal knows nothing about."""
+        owner = outputs.get(name)
+        return owner != source if owner else (out_dir / name).exists()
+
+    async def convert(path: Path, hash: str, progress: Progress, task) -> None:
+        previous = journal.entries.get(path.name, {}).get("output")
+        try:
+            text = path.read_text(encoding="utf-8").strip()
+            if len(text) < 50:
+                raise ValueError(f"text too short ({len(text)} chars)")
+            async with semaphore:
+                data = await parse_recipe_with_llm_async(
+                    text, client, cache=llm_cache, rate_limiter=limiter, preparse=preparse, translations=translations
+                )
+            recipe = llm_result_to_parsed_recipe(data)  # Validates types and required fields
+            if not recipe.name_it or not recipe.ingredients:
+                raise ValueError("response has no recipe name or ingredients")
+            translations.apply(recipe)
+            translations.learn_recipe(recipe, source="llm")
+            for item, ing in zip(data["ingredients"], recipe.ingredients):
+                item["name_en"] = ing.name_en
+            # The model's slug becomes a file name: sanitized, never another file's output
+            base = slugify(data.get("slug") or "") or slugify(recipe.name_it)
+            if not base:
+                raise ValueError(f"no usable slug for {recipe.name_it!r}")
+            slug, n = base, 1
+            # Same slug as last time (suffix included): keep its file name
+            stem = base.replace("-", "_")
+            if previous and re.fullmatch(rf"{re.escape(stem)}(_\d+)?\.json", previous):
+                slug = previous.removesuffix(".json").replace("_", "-")
+            while taken(f"{slug.replace('-', '_')}.json", path.name):
+                n += 1
+                slug = f"{base}-{n}"
+            data["slug"] = slug
+            out_path = out_dir / f"{slug.replace('-', '_')}.json"
+            outputs[out_path.name] = path.name
+            out_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+            # An edited input that now gets another slug must not leave its old recipe behind
+            if previous and previous != out_path.name and outputs.get(previous) == path.name:
+                (out_dir / previous).unlink(missing_ok=True)
+                del outputs[previous]
+                progress.console.print(f"  [yellow]⚠️  {path.name}: removed its previous output {previous}[/yellow]")
+        except Exception as e:
+            journal.record(path.name, hash, "failed", error=str(e)[:500])
+            counts["failed"] += 1
+            progress.console.print(f"[red]❌ {path.name}: {e}[/red]")
+        else:
+            journal.record(path.name, hash, "done", output=out_path.name)
+            counts["done"] += 1
+            progress.console.print(f"  [green]✓ {path.name} → {out_path.name}[/green]")
+        finally:
+            progress.advance(task)
+
+    try:
+        with Progress(
+            TextColumn("[cyan]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeElapsedColumn(),
+            console=console,
+        ) as progress:
+            task = progress.add_task("Parsing", total=len(todo))
+            await asyncio.gather(*(convert(path, hash, progress, task) for path, hash in todo))
+    finally:
+        journal.close()
+        translations.close()
+        if llm_cache:
+            llm_cache.close()
+        await client.aio.aclose()
+
+    elapsed = time.perf_counter() - start
+    console.print(f"\n[bold]Summary:[/bold]")
+    console.print(f"[green]✅ Written: {counts['done']} JSON files to {out_dir} | Skipped: {skipped}[/green]")
+    if counts["failed"]:
+        console.print(f"[red]❌ Failures: {counts['failed']} (retried on the next run)[/red]")
+    console.print(f"[dim]{elapsed:.1f}s total | {counts['done'] / elapsed if elapsed else 0:.1f} recipes/s[/dim]")
 
 
 def _show_parsed_recipe_preview(recipe):
@@ -863,10 +1793,236 @@ def _show_parsed_recipe_preview(recipe):
     console.print()
 
 
-def _save_parsed_recipe(recipe, confirm: bool = True):
+def _parsed_recipe_nutrition(recipe) -> dict:
+    """
+    Recipe nutrient columns for a ParsedRecipe.
+
+    Per-serving values from the source are kept; the serving weight comes from
+    the source, else from the weighed ingredients (cooked weight / servings),
+    else DEFAULT_SERVING_WEIGHT_G. Without source values, nutrients are summed
+    from pre-matched ingredient data when there is any.
+    """
+    nut = recipe.nutrition
+    computed = recipe_nutrition(
+        [
+            dict(
+                quantity=ing.grams or 0,
+                unit="g",
+                cooked_weight_factor=ing.cooking_factor,
+                kcal_per_100g=ing.kcal_per_100g,
+                protein_per_100g=ing.protein_per_100g,
+                carbs_per_100g=ing.carbs_per_100g,
+                fat_per_100g=ing.fat_per_100g,
+                fiber_per_100g=ing.fiber_per_100g,
+            )
+            for ing in recipe.ingredients
+        ],
+        recipe.servings,
+    )
+    if not nut.kcal and computed.totals[0, 0] > 0:
+        return computed.recipe_fields(0)
+
+    serving_weight = nut.serving_weight_g if nut.serving_weight_g and nut.serving_weight_g > 0 else (
+        int(round(computed.serving_weight_g[0])) or DEFAULT_SERVING_WEIGHT_G
+    )
+    factor = 100 / serving_weight
+    return dict(
+        kcal_per_100g=int(nut.kcal * factor),
+        protein_per_100g=round(nut.protein * factor, 2),
+        carbs_per_100g=round(nut.carbs * factor, 2),
+        fat_per_100g=round(nut.fat * factor, 2),
+        fiber_per_100g=round(nut.fiber * factor, 2) if nut.fiber is not None else None,
+        kcal_per_serving=nut.kcal,
+        serving_weight_g=serving_weight,
+    )
+
+
+def _parsed_recipe_graph(recipe, recipe_id, category: str, ingredient_index: IngredientIndex) -> dict:
+    """
+    Map a ParsedRecipe onto TursoClient.save_recipe_graph rows.
+    Ingredients already known to ingredient_index are linked, not re-inserted;
+    pre-matched USDA data on the parsed ingredients is kept.
+    """
+    ingredient_rows = []
+    link_rows = []
+    for i, ing in enumerate(recipe.ingredients):
+        ingredient_row = dict(
+            id=uuid4(),
+            usda_fdc_id=ing.usda_fdc_id,
+            name_it=ing.name_it or ing.name,
+            name_en=ing.name_en or ing.name,
+            category=None,
+            kcal_per_100g=round(ing.kcal_per_100g or 0),  # 0 unless pre-matched
+            protein_per_100g=ing.protein_per_100g or 0,
+            carbs_per_100g=ing.carbs_per_100g or 0,
+            fat_per_100g=ing.fat_per_100g or 0,
+            fiber_per_100g=ing.fiber_per_100g,
+            cooked_weight_factor=ing.cooking_factor,
+            default_unit=ing.unit,
+        )
+        ing_id, created = ingredient_index.resolve_or_create(ingredient_row)
+        if created:
+            ingredient_rows.append(ingredient_row)
+        link_rows.append(dict(
+            id=uuid4(),
+            recipe_id=recipe_id,
+            ingredient_id=ing_id,
+            quantity=ing.grams or ing.quantity,
+            unit=ing.unit if not ing.grams else "g",
+            is_optional=ing.is_optional,
+            notes_it=ing.notes_it or (ing.original_text if ing.original_text != ing.name else None),
+            notes_en=ing.notes_en,
+            order=i,
+            cooking_factor=ing.cooking_factor,
+        ))
+
+    recipe_row = dict(
+        id=recipe_id,
+        name_it=recipe.name_it,
+        name_en=recipe.name_en or recipe.name_it,
+        slug=slugify(recipe.name_it),
+        description_it=recipe.description_it or (f"Imported from {recipe.source_url}" if recipe.source_url else None),
+        description_en=recipe.description_en,
+        category=category,
+        image_url=None,
+        prep_time_min=recipe.prep_time_min,
+        cook_time_min=recipe.cook_time_min,
+        total_time_min=recipe.prep_time_min + recipe.cook_time_min,
+        servings=recipe.servings,
+        difficulty=recipe.difficulty,
+        **_parsed_recipe_nutrition(recipe),
+        protein_source="mixed",
+        is_published=False,
+    )
+    steps = [
+        dict(
+            id=uuid4(),
+            recipe_id=recipe_id,
+            step_number=i,
+            instruction_it=step_text,
+            instruction_en=step_text,  # Same for now
+            image_url=None,
+        )
+        for i, step_text in enumerate(recipe.steps, 1)
+    ]
+    return dict(recipe=recipe_row, ingredients=ingredient_rows, recipe_ingredients=link_rows, steps=steps)
+
+
+def _build_recipe_graphs(recipes: list, existing_ids: dict, ingredient_index: IngredientIndex) -> list[dict]:
+    """
+    Graphs for TursoClient.save_recipe_graphs; recipes whose slug is in
+    existing_ids rewrite that recipe in place. Slugs must be distinct.
+    """
+    graphs = []
+    for recipe in recipes:
+        recipe_id = existing_ids.get(slugify(recipe.name_it))
+        graph = _parsed_recipe_graph(recipe, recipe_id or uuid4(), recipe.category, ingredient_index)
+        graph["update"] = recipe_id is not None
+        graphs.append(graph)
+    return graphs
+
+
+async def _save_recipe_graphs(
+    turso: TursoClient, graphs: list[dict], existing_ids: dict, ingredient_index: IngredientIndex
+) -> None:
+    """
+    Write a batch of graphs in one transaction, then register their slugs in
+    existing_ids. If the write fails, the ingredients the batch created are
+    unregistered from ingredient_index so later batches do not link to them.
+    """
+    try:
+        await turso.save_recipe_graphs(graphs)
+    except Exception:
+        ingredient_index.discard(row["id"] for graph in graphs for row in graph["ingredients"])
+        raise
+    for graph in graphs:
+        existing_ids[graph["recipe"]["slug"]] = graph["recipe"]["id"]
+
+
+def _parsed_recipe_to_json(recipe) -> dict:
+    """Map a ParsedRecipe onto the recipes_data/ JSON format read by `sync`."""
+    return dict(
+        name_it=recipe.name_it,
+        name_en=recipe.name_en or recipe.name_it,
+        slug=slugify(recipe.name_it),
+        description_it=recipe.description_it or (f"Imported from {recipe.source_url}" if recipe.source_url else None),
+        description_en=recipe.description_en,
+        source_url=recipe.source_url,
+        category=recipe.category,
+        preferred_meal=recipe.preferred_meal,
+        servings=recipe.servings,
+        prep_time_min=recipe.prep_time_min,
+        cook_time_min=recipe.cook_time_min,
+        difficulty=recipe.difficulty,
+        **_parsed_recipe_nutrition(recipe),
+        allergens=recipe.allergens,
+        dietary_flags=recipe.dietary_flags.model_dump(),
+        tags=recipe.tags,
+        ingredients=[
+            dict(
+                name_it=ing.name_it or ing.name,
+                name_en=ing.name_en or ing.name,
+                quantity=ing.grams or ing.quantity,
+                unit="g" if ing.grams else ing.unit,
+                cooking_factor=ing.cooking_factor,
+                is_optional=ing.is_optional,
+                notes_it=ing.notes_it,
+                notes_en=ing.notes_en,
+            )
+            for ing in recipe.ingredients
+        ],
+        steps=[
+            dict(step_number=i, instruction_it=step_text, instruction_en=step_text)  # Same for now
+            for i, step_text in enumerate(recipe.steps, 1)
+        ],
+    )
+
+
+async def _apply_translations(translations: TranslationCache, recipes: list, translate: bool = False) -> None:
+    """
+    Set ingredient English names from the translation dictionary. With
+    translate, the names it does not know yet (across all recipes) go to
+    Gemini in one request and the answers are remembered.
+    """
+    unseen = {}
+    for recipe in recipes:
+        for name in translations.apply(recipe):
+            unseen.setdefault(translation_key(name), name)
+    if not translate or not unseen:
+        return
+
+    from recipe_manager.services.llm_parser import translate_ingredient_names
+
+    try:
+        answers = await asyncio.to_thread(translate_ingredient_names, list(unseen.values()))
+    except Exception as e:
+        console.print(f"[yellow]⚠️  Ingredient translation failed, Italian names kept: {e}[/yellow]")
+        return
+    translations.learn_many(answers.items(), source="llm")
+    by_key = {translation_key(name): name_en for name, name_en in answers.items()}
+    for recipe in recipes:
+        for ing in recipe.ingredients:
+            if not ing.name_en:
+                ing.name_en = by_key.get(translation_key(ing.name_it or ing.name), "")
+
+
+async def _save_parsed_recipe(
+    ctx: AppContext,
+    recipe,
+    confirm: bool = True,
+    ingredient_index: Optional[IngredientIndex] = None,
+    translate: bool = False,
+    replace: bool = False,
+) -> bool:
     """
     Save parsed recipe to database.
-    If confirm=False, skips confirmation prompt and uses default values.
+    If confirm=False, skips confirmation prompts and uses default values; a
+    recipe whose slug already exists is then replaced if `replace`, else
+    skipped. Replacing rewrites the existing recipe in place, keeping its ID.
+    Uses the command's shared clients; pass a shared ingredient_index when
+    saving many recipes in one run. Ingredient English names come from the
+    translation dictionary (and Gemini for unseen names, with translate).
+    Returns False if the recipe was skipped.
     """
     if confirm:
         if not Confirm.ask("Save this recipe?", default=True):
@@ -883,133 +2039,55 @@ def _save_parsed_recipe(recipe, confirm: bool = True):
         # Auto-mode
         category_str = recipe.category or "main_course"
 
-    turso = TursoClient()
+    turso = ctx.turso
 
-    # Check for duplicates by slug
-    slug = recipe.slug
-    existing = run_async(turso.get_recipe_by_slug(slug))
+    # Check for duplicates by the slug the recipe row is written with
+    slug = slugify(recipe.name_it)
+    existing = await turso.get_recipe_by_slug(slug)
 
     if existing:
         console.print(f"\n[yellow]⚠️  Recipe '{recipe.name_it}' (slug: {slug}) already exists![/yellow]")
-        if not Confirm.ask("Overwrite existing recipe?", default=False):
+        if not (Confirm.ask("Overwrite existing recipe?", default=False) if confirm else replace):
             console.print("[yellow]Skipped.[/yellow]")
-            return
+            return False
 
-        # If overwrite confirmed, delete old recipe first
-        from uuid import UUID
-        old_id = UUID(existing["id"])
-        console.print(f"[dim]Deleting old version ({old_id})...[/dim]")
-        run_async(turso.delete_recipe(old_id))
-
-    recipe_id = uuid4()
+        # Rewritten in place, so rows referencing the recipe (planned meals) stay valid
+        recipe_id = UUID(existing["id"])
+        console.print(f"[dim]Replacing old version ({recipe_id})...[/dim]")
+    else:
+        recipe_id = uuid4()
 
     try:
-        # Calculate nutrients per 100g from per-serving
-        nut = recipe.nutrition
-        if nut.serving_weight_g and nut.serving_weight_g > 0:
-            factor = 100 / nut.serving_weight_g
-            kcal_per_100g = int(nut.kcal * factor)
-            protein_per_100g = round(nut.protein * factor, 2)
-            carbs_per_100g = round(nut.carbs * factor, 2)
-            fat_per_100g = round(nut.fat * factor, 2)
-        else:
-            # Estimate: assume 200g per serving
-            factor = 100 / 200
-            kcal_per_100g = int(nut.kcal * factor)
-            protein_per_100g = round(nut.protein * factor, 2)
-            carbs_per_100g = round(nut.carbs * factor, 2)
-            fat_per_100g = round(nut.fat * factor, 2)
-
-        # Save recipe
-        run_async(
-            turso.insert_recipe(
-                id=recipe_id,
-                name_it=recipe.name_it,
-                name_en=recipe.name_en or recipe.name_it,
-                slug=slugify(recipe.name_it),
-                description_it=f"Imported from {recipe.source_url}" if recipe.source_url else None,
-                description_en=None,
-                category=category_str,
-                image_url=None,
-                prep_time_min=recipe.prep_time_min,
-                cook_time_min=recipe.cook_time_min,
-                total_time_min=recipe.prep_time_min + recipe.cook_time_min,
-                servings=recipe.servings,
-                difficulty=recipe.difficulty,
-                kcal_per_100g=kcal_per_100g,
-                kcal_per_serving=nut.kcal,
-                protein_per_100g=protein_per_100g,
-                carbs_per_100g=carbs_per_100g,
-                fat_per_100g=fat_per_100g,
-                fiber_per_100g=nut.fiber,
-                serving_weight_g=nut.serving_weight_g or 200,
-                is_published=False,
-            )
+        if ingredient_index is None:
+            ingredient_index = await IngredientIndex.load(turso)
+        await _apply_translations(ctx.translations, [recipe], translate)
+        graph = _parsed_recipe_graph(recipe, recipe_id, category_str, ingredient_index)
+
+        # Recipe, ingredients, links and steps in one round trip
+        write = turso.update_recipe_graph if existing else turso.save_recipe_graph
+        await write(
+            recipe=graph["recipe"],
+            ingredients=graph["ingredients"],
+            recipe_ingredients=graph["recipe_ingredients"],
+            steps=graph["steps"],
         )
 
-        # Save ingredients (simplified - just names, no USDA lookup)
-        for i, ing in enumerate(recipe.ingredients):
-            ing_id = uuid4()
-
-            # Insert ingredient
-            run_async(
-                turso.insert_ingredient(
-                    id=ing_id,
-                    usda_fdc_id=None,
-                    name_it=ing.name,
-                    name_en=ing.name,
-                    category=None,
-                    kcal_per_100g=0,  # Unknown without USDA lookup
-                    protein_per_100g=0,
-                    carbs_per_100g=0,
-                    fat_per_100g=0,
-                    fiber_per_100g=None,
-                    cooked_weight_factor=1.0,
-                    default_unit=ing.unit,
-                )
-            )
-
-            # Link to recipe
-            run_async(
-                turso.insert_recipe_ingredient(
-                    id=uuid4(),
-                    recipe_id=recipe_id,
-                    ingredient_id=ing_id,
-                    quantity=ing.grams or ing.quantity,
-                    unit=ing.unit if not ing.grams else "g",
-                    is_optional=False,
-                    notes_it=ing.original_text if ing.original_text != ing.name else None,
-                    notes_en=None,
-                    order=i,
-                )
-            )
-
-        # Save steps
-        for i, step_text in enumerate(recipe.steps, 1):
-            run_async(
-                turso.insert_recipe_step(
-                    id=uuid4(),
-                    recipe_id=recipe_id,
-                    step_number=i,
-                    instruction_it=step_text,
-                    instruction_en=step_text,  # Same for now
-                    image_url=None,
-                )
-            )
-
         console.print(f"\n[green]✅ Recipe saved![/green] ID: [cyan]{recipe_id}[/cyan]")
         console.print(f"[dim]Ingredients: {len(recipe.ingredients)} | Steps: {len(recipe.steps)}[/dim]")
 
     except Exception as e:
         console.print(f"\n[red]❌ Error saving: {e}[/red]")
         raise typer.Exit(1)
-    finally:
-        run_async(turso.close())
+    return True
 
 
 @app.command("import-json")
-def import_json(
+@async_command
+async def import_json(
     path: str = typer.Argument(..., help="Path to JSON file or directory containing JSON files"),
+    replace: bool = typer.Option(
+        False, "--replace", help="Rewrite recipes whose slug already exists (keeping their ID) instead of skipping them"
+    ),
 ):
     """Import recipes from JSON file(s)."""
     import json
@@ -1035,52 +2113,285 @@ def import_json(
     console.print(f"\n[cyan]📂 Found {len(files)} JSON files. processing...[/cyan]\n")
 
     success_count = 0
+    skipped_count = 0
     error_count = 0
 
-    for json_file in files:
-        try:
-            console.print(f"[dim]Processing {json_file.name}...[/dim]")
+    # One context for the whole import; the index is loaded once so every
+    # imported recipe reuses the same canonical ingredients
+    ctx = AppContext()
+    try:
+        ingredient_index = await IngredientIndex.load(ctx.turso)
 
-            with open(json_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+        for json_file in files:
+            try:
+                console.print(f"[dim]Processing {json_file.name}...[/dim]")
 
-            # Handle list of recipes or single recipe
-            data_list = data if isinstance(data, list) else [data]
+                with open(json_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
 
-            for item in data_list:
-                # Convert to ParsedRecipe
-                try:
-                    recipe = llm_result_to_parsed_recipe(item)
-                except Exception as e:
-                    console.print(f"[red]❌ Parsing error in {json_file.name}: {e}[/red]")
-                    error_count += 1
-                    continue
+                # Handle list of recipes or single recipe
+                data_list = data if isinstance(data, list) else [data]
+
+                for item in data_list:
+                    # Convert to ParsedRecipe
+                    try:
+                        recipe = llm_result_to_parsed_recipe(item)
+                    except Exception as e:
+                        console.print(f"[red]❌ Parsing error in {json_file.name}: {e}[/red]")
+                        error_count += 1
+                        continue
+
+                    # Check validation
+                    if not recipe.name_it:
+                        console.print(f"[yellow]Skipping {json_file.name}: invalid data[/yellow]")
+                        error_count += 1
+                        continue
+
+                    # Save silently (no prompt)
+                    try:
+                        if not await _save_parsed_recipe(
+                            ctx, recipe, confirm=False, ingredient_index=ingredient_index, replace=replace
+                        ):
+                            skipped_count += 1
+                            continue
+                        ctx.translations.learn_recipe(recipe, source="llm")
+                        success_count += 1
+                        console.print(f"[green]✓ Imported: {recipe.name_it}[/green]")
+                    except Exception as e:
+                        console.print(f"[red]❌ Save error: {e}[/red]")
+                        error_count += 1
+
+            except Exception as e:
+                console.print(f"[red]❌ Error reading {json_file.name}: {e}[/red]")
+                error_count += 1
+    finally:
+        await ctx.close()
 
-                # Check validation
-                if not recipe.name_it:
-                    console.print(f"[yellow]Skipping {json_file.name}: invalid data[/yellow]")
-                    error_count += 1
+    console.print(f"\n[bold]Summary:[/bold]")
+    console.print(f"[green]✅ Imported: {success_count} | Skipped (already exist): {skipped_count}[/green]")
+    if error_count > 0:
+        console.print(f"[red]❌ Failures: {error_count}[/red]")
+
+
+@app.command("import-legacy-db")
+@async_command
+async def import_legacy_db(
+    path: Path = typer.Argument(..., help="Path to the legacy ricette.db (e.g. docs/DB-esempio/ricette.db)"),
+    batch_size: int = typer.Option(50, "--batch-size", "-b", min=1, help="Recipes written per transaction"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Map recipes without writing to Turso"),
+):
+    """Import recipes from the legacy SQLite database, reusing its USDA matches."""
+    from recipe_manager.services.legacy_db import LegacyRecipeDB
+
+    if not path.is_file():
+        console.print(f"[red]❌ File not found: {path}[/red]")
+        raise typer.Exit(1)
+
+    imported = 0
+    updated = 0
+    matched = 0
+    error_count = 0
+    run_slugs = set()
+    start = time.perf_counter()
+
+    ctx = None if dry_run else AppContext()
+    try:
+        if ctx:
+            # Loaded once: existing slugs are rewritten in place, ingredients deduplicated
+            ingredient_index = await IngredientIndex.load(ctx.turso)
+            existing_ids = await ctx.turso.get_recipe_ids_by_slug()
+
+        with LegacyRecipeDB(path) as legacy:
+            total = legacy.count_recipes()
+            console.print(f"\n[cyan]📂 Importing {total} recipes from {path.name}...[/cyan]\n")
+
+            # Rows are streamed one batch at a time; each batch is one transaction
+            for batch in legacy.iter_recipe_batches(batch_size):
+                matched += sum(1 for r in batch for i in r.ingredients if i.kcal_per_100g is not None)
+                if dry_run:
+                    for recipe in batch:
+                        console.print(
+                            f"[dim]{recipe.name_it} ({len(recipe.ingredients)} ingredients, "
+                            f"{len(recipe.steps)} steps, {recipe.nutrition.kcal} kcal)[/dim]"
+                        )
+                    imported += len(batch)
                     continue
 
-                # Save silently (no prompt)
+                recipes = []
+                for recipe in batch:
+                    slug = slugify(recipe.name_it)
+                    if slug in run_slugs:
+                        console.print(f"[yellow]⚠️  {recipe.name_it}: same title as an earlier recipe, skipped[/yellow]")
+                        error_count += 1
+                        continue
+                    run_slugs.add(slug)
+                    # The site's English names fill the dictionary; known translations replace them
+                    ctx.translations.apply(recipe)
+                    ctx.translations.learn_recipe(recipe, source="legacy")
+                    recipes.append(recipe)
+
+                graphs = _build_recipe_graphs(recipes, existing_ids, ingredient_index)
                 try:
-                    _save_parsed_recipe(recipe, confirm=False)
-                    success_count += 1
-                    console.print(f"[green]✓ Imported: {recipe.name_it}[/green]")
+                    await _save_recipe_graphs(ctx.turso, graphs, existing_ids, ingredient_index)
                 except Exception as e:
-                    console.print(f"[red]❌ Save error: {e}[/red]")
-                    error_count += 1
-
-        except Exception as e:
-            console.print(f"[red]❌ Error reading {json_file.name}: {e}[/red]")
-            error_count += 1
+                    # One bad row should not cost the whole batch: retry recipe by recipe
+                    console.print(f"[red]❌ Save error (batch of {len(graphs)}): {e}, retrying one by one[/red]")
+                    graphs = []
+                    for recipe in recipes:
+                        graph = _build_recipe_graphs([recipe], existing_ids, ingredient_index)
+                        try:
+                            await _save_recipe_graphs(ctx.turso, graph, existing_ids, ingredient_index)
+                        except Exception as e:
+                            console.print(f"[red]❌ {recipe.name_it}: {e}[/red]")
+                            error_count += 1
+                            continue
+                        graphs.extend(graph)
+                batch_updated = sum(1 for g in graphs if g["update"])
+                updated += batch_updated
+                imported += len(graphs) - batch_updated
+                console.print(f"[green]✓ {imported + updated}/{total}[/green]")
+    except sqlite3.DatabaseError as e:
+        console.print(f"[red]❌ Not a legacy recipe database: {e}[/red]")
+        raise typer.Exit(1)
+    finally:
+        if ctx:
+            await ctx.close()
 
+    elapsed = time.perf_counter() - start
     console.print(f"\n[bold]Summary:[/bold]")
-    console.print(f"[green]✅ Imported: {success_count}[/green]")
+    if dry_run:
+        console.print(f"[cyan]🔍 Mapped: {imported} in {elapsed:.1f}s[/cyan]")
+    else:
+        console.print(f"[green]✅ Imported: {imported} | Updated: {updated} in {elapsed:.1f}s[/green]")
+    console.print(f"[dim]Ingredients with USDA match: {matched}[/dim]")
     if error_count > 0:
         console.print(f"[red]❌ Failures: {error_count}[/red]")
 
 
+# ============ Cache Commands ============
+
+
+@cache_app.command("stats")
+def cache_stats():
+    """Show USDA, page, LLM and translation cache sizes and lifetime hit/miss counters."""
+    from recipe_manager.services.llm_cache import LLMCache
+    from recipe_manager.services.llm_parser import SYSTEM_PROMPT
+
+    cache = USDACache()
+    try:
+        stats = cache.stats()
+    finally:
+        cache.close()
+
+    lookups = stats["hits"] + stats["misses"]
+    hit_rate = f"{stats['hits'] / lookups:.1%}" if lookups else "-"
+
+    table = Table(title="USDA Cache")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    table.add_row("Path", stats["path"])
+    table.add_row("Entries", f"{stats['entries']} / {stats['max_entries']}")
+    table.add_row("Expired", str(stats["expired"]))
+    table.add_row("Size", f"{stats['size_bytes'] / 1024:.1f} KB")
+    table.add_row("Hits", str(stats["hits"]))
+    table.add_row("Misses", str(stats["misses"]))
+    table.add_row("Hit rate", hit_rate)
+    console.print(table)
+
+    page_cache = PageCache()
+    try:
+        pages = page_cache.stats()
+    finally:
+        page_cache.close()
+
+    fetches = pages["revalidated"] + pages["downloaded"]
+    table = Table(title="Page Cache")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    table.add_row("Path", pages["path"])
+    table.add_row("Pages", str(pages["pages"]))
+    table.add_row("Stored", f"{pages['stored_bytes'] / 1024:.1f} / {pages['max_bytes'] / 1024:.0f} KB")
+    table.add_row("File size", f"{pages['size_bytes'] / 1024:.1f} KB")
+    table.add_row("304 Not Modified", str(pages["revalidated"]))
+    table.add_row("Full downloads", str(pages["downloaded"]))
+    table.add_row("Revalidation rate", f"{pages['revalidated'] / fetches:.1%}" if fetches else "-")
+    console.print(table)
+
+    llm_cache = LLMCache(SYSTEM_PROMPT)
+    try:
+        llm = llm_cache.stats()
+    finally:
+        llm_cache.close()
+
+    lookups = llm["hits"] + llm["misses"]
+    table = Table(title="LLM Cache (Gemini)")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    table.add_row("Path", llm["path"])
+    table.add_row("Entries", f"{llm['entries']} / {llm['max_entries']}")
+    table.add_row("System prompt", llm["prompt_hash"])
+    if llm["invalidated"]:
+        table.add_row("Dropped (prompt changed)", str(llm["invalidated"]))
+    table.add_row("Size", f"{llm['size_bytes'] / 1024:.1f} KB")
+    table.add_row("Hits", str(llm["hits"]))
+    table.add_row("Misses", str(llm["misses"]))
+    table.add_row("Hit rate", f"{llm['hits'] / lookups:.1%}" if lookups else "-")
+    console.print(table)
+
+    translation_cache = TranslationCache()
+    try:
+        names = translation_cache.stats()
+    finally:
+        translation_cache.close()
+
+    lookups = names["hits"] + names["misses"]
+    table = Table(title="Ingredient Translations (not removed by clear)")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    table.add_row("Path", names["path"])
+    table.add_row("Entries", str(names["entries"]))
+    for source in ("manual", "llm", "legacy"):
+        table.add_row(f"  from {source}", str(names["sources"].get(source, 0)))
+    table.add_row("Size", f"{names['size_bytes'] / 1024:.1f} KB")
+    table.add_row("Hits", str(names["hits"]))
+    table.add_row("Misses", str(names["misses"]))
+    table.add_row("Hit rate", f"{names['hits'] / lookups:.1%}" if lookups else "-")
+    console.print(table)
+
+
+@cache_app.command("clear")
+def cache_clear(
+    yes: bool = typer.Option(False, "--yes", "-y", help="Clear without confirmation"),
+):
+    """Delete every cached USDA response, scraped page and Gemini response."""
+    from recipe_manager.services.llm_cache import LLMCache
+    from recipe_manager.services.llm_parser import SYSTEM_PROMPT
+
+    if not yes and not Confirm.ask("Clear the USDA, page and LLM caches?", default=False):
+        console.print("[yellow]Cancelled.[/yellow]")
+        raise typer.Exit(0)
+
+    cache = USDACache()
+    try:
+        removed = cache.clear()
+    finally:
+        cache.close()
+    page_cache = PageCache()
+    try:
+        removed_pages = page_cache.clear()
+    finally:
+        page_cache.close()
+    llm_cache = LLMCache(SYSTEM_PROMPT)
+    try:
+        removed_llm = llm_cache.clear()
+    finally:
+        llm_cache.close()
+    console.print(
+        f"[green]✅ Removed {removed} cached USDA responses, {removed_pages} cached pages "
+        f"and {removed_llm} cached LLM responses.[/green]"
+    )
+
+
 # ============ Main ============
 
 if __name__ == "__main__":
@@ -13,7 +13,51 @@ class Config:
 
     # USDA
     USDA_KEY = os.getenv("USDA_API_KEY")
-    USDA_BASE_URL = "https://api.nal.usda.gov/fdc/v1"
+    USDA_BASE_URL = os.getenv("USDA_BASE_URL") or "https://api.nal.usda.gov/fdc/v1"
+    # Client-side limits; api.data.gov keys allow 1000 requests/hour by default
+    USDA_RATE_PER_HOUR = int(os.getenv("USDA_RATE_PER_HOUR") or 1000)
+    USDA_RATE_BURST = int(os.getenv("USDA_RATE_BURST") or 20)
+    USDA_MAX_RETRIES = int(os.getenv("USDA_MAX_RETRIES") or 5)
+
+    # USDA response cache (SQLite)
+    USDA_CACHE_PATH = os.getenv("USDA_CACHE_PATH") or str(
+        Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "recipe-manager" / "usda_cache.db"
+    )
+    USDA_CACHE_TTL_DAYS = float(os.getenv("USDA_CACHE_TTL_DAYS") or 30)
+    USDA_CACHE_MAX_ENTRIES = int(os.getenv("USDA_CACHE_MAX_ENTRIES") or 20000)
+
+    # Offline USDA data (bundled alimenti table, decoded into a local columnar copy)
+    USDA_LOCAL_SOURCE = os.getenv("USDA_LOCAL_SOURCE") or str(
+        Path(__file__).parents[4] / "docs" / "DB-esempio" / "database_alimenti.db"
+    )
+    USDA_LOCAL_DB_PATH = os.getenv("USDA_LOCAL_DB_PATH") or str(Path(USDA_CACHE_PATH).with_name("usda_local.db"))
+
+    # Automatic ingredient -> USDA matcher (n-gram index built from the alimenti table and legacy matches)
+    USDA_MATCHER_DIR = os.getenv("USDA_MATCHER_DIR") or str(Path(USDA_CACHE_PATH).with_name("usda_matcher"))
+    USDA_MATCHER_LEGACY_DB = os.getenv("USDA_MATCHER_LEGACY_DB") or str(
+        Path(__file__).parents[4] / "docs" / "DB-esempio" / "ricette.db"
+    )
+    USDA_AUTO_MATCH_MIN_SCORE = float(os.getenv("USDA_AUTO_MATCH_MIN_SCORE") or 0.5)
+
+    # Gemini batch import limits (free tier for 1.5 Flash: 15 requests/minute)
+    GEMINI_RATE_PER_MINUTE = float(os.getenv("GEMINI_RATE_PER_MINUTE") or 15)
+    GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES") or 5)
+
+    # Gemini parsing response cache (content-addressed, invalidated when SYSTEM_PROMPT changes)
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH") or str(Path(USDA_CACHE_PATH).with_name("llm_cache.db"))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES") or 5000)
+
+    # Italian <-> English ingredient name dictionary (LLM results, legacy pairs, manual corrections)
+    TRANSLATION_CACHE_PATH = os.getenv("TRANSLATION_CACHE_PATH") or str(
+        Path(USDA_CACHE_PATH).with_name("translations.db")
+    )
+
+    # Scraped page cache (compressed bodies + ETag/Last-Modified validators)
+    PAGE_CACHE_PATH = os.getenv("PAGE_CACHE_PATH") or str(Path(USDA_CACHE_PATH).with_name("page_cache.db"))
+    PAGE_CACHE_MAX_MB = float(os.getenv("PAGE_CACHE_MAX_MB") or 200)
+
+    # Scraper HTML parser: selectolax, lxml or html.parser (default: fastest installed)
+    HTML_PARSER = os.getenv("HTML_PARSER")
 
     # Cloudinary
     CLOUDINARY_CLOUD = os.getenv("CLOUDINARY_CLOUD_NAME")
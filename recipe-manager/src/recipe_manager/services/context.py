@@ -0,0 +1,63 @@
+"""
+Application context shared by a single CLI command invocation.
+Holds one pooled HTTP client and one libSQL client for the whole command,
+plus the on-disk caches and the ingredient translation dictionary.
+"""
+import httpx
+
+from .page_cache import PageCache
+from .translation_cache import TranslationCache
+from .turso import TursoClient
+from .usda import USDAClient
+from .usda_cache import USDACache
+from .usda_local import LocalUSDAProvider
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Pooled keep-alive HTTP/2 client reused for every outbound request."""
+    return httpx.AsyncClient(
+        http2=True,
+        follow_redirects=True,
+        timeout=httpx.Timeout(30.0, connect=10.0),
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    )
+
+
+class AppContext:
+    """
+    Async context manager owning the clients of one command.
+
+    Usage:
+        async with AppContext() as ctx:
+            foods = await ctx.usda.search_food("pasta")
+            await ctx.turso.get_recipes()
+    """
+
+    def __init__(self, use_cache: bool = True, use_local: bool = True):
+        self.http = create_http_client()
+        self.turso = TursoClient()
+        self.usda_cache = USDACache() if use_cache else None
+        self.page_cache = PageCache() if use_cache else None
+        # Not bypassed by use_cache=False: it also holds manual corrections
+        self.translations = TranslationCache()
+        self.usda = USDAClient(http=self.http, cache=self.usda_cache)
+        if use_local and LocalUSDAProvider.available():
+            # Bundled data first, remote API only on a miss
+            self.usda = LocalUSDAProvider(remote=self.usda)
+
+    async def __aenter__(self) -> "AppContext":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the libSQL connection, the HTTP connection pool and the caches."""
+        await self.usda.close()
+        self.translations.close()
+        if self.usda_cache:
+            self.usda_cache.close()
+        if self.page_cache:
+            self.page_cache.close()
+        await self.turso.close()
+        await self.http.aclose()
@@ -0,0 +1,103 @@
+"""
+Concurrent recipe crawler.
+Scrapes many URLs through one pooled HTTP client, with a per-host
+concurrency limit and a politeness delay between requests to the same host.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterable, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from .page_cache import PageCache
+from .parser import ParsedRecipe
+from .rate_limit import RETRY_STATUSES, TokenBucket, backoff_delay, retry_after_seconds
+from .scraper import UNKNOWN_RECIPE_NAME, scrape_url
+
+
+class CrawlResult(NamedTuple):
+    url: str
+    recipe: Optional[ParsedRecipe]
+    error: Optional[str]
+
+
+def read_url_list(lines: Iterable[str]) -> list[str]:
+    """Clean a URL list: skip blanks and '#' comments, drop duplicates, keep order."""
+    urls = (line.strip() for line in lines)
+    return list(dict.fromkeys(url for url in urls if url and not url.startswith("#")))
+
+
+class HostLimiter:
+    """
+    Per-host throttling: at most `per_host` requests in flight to one host,
+    and request starts spaced `delay` seconds apart (a one-token bucket).
+    """
+
+    def __init__(self, per_host: int = 2, delay: float = 1.0):
+        self.per_host = per_host
+        self.delay = delay
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def bucket(self, host: str) -> Optional[TokenBucket]:
+        if self.delay <= 0:
+            return None
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(rate=1 / self.delay, capacity=1)
+        return self._buckets[host]
+
+    @asynccontextmanager
+    async def slot(self, host: str):
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.per_host))
+        async with semaphore:
+            bucket = self.bucket(host)
+            if bucket:
+                await bucket.acquire()
+            yield
+
+
+async def crawl(
+    urls: list[str],
+    client: httpx.AsyncClient,
+    per_host: int = 2,
+    delay: float = 1.0,
+    max_retries: int = 3,
+    cache: Optional[PageCache] = None,
+) -> AsyncIterator[CrawlResult]:
+    """
+    Scrape every URL and yield results as they complete (not in input order).
+
+    Hosts are crawled in parallel with each other; 429/5xx and transport
+    errors are retried with backoff, and a Retry-After slows the whole host.
+    """
+    limiter = HostLimiter(per_host, delay)
+
+    async def fetch(url: str) -> CrawlResult:
+        host = urlsplit(url).hostname or ""
+        for attempt in range(max_retries + 1):
+            try:
+                async with limiter.slot(host):
+                    recipe = await scrape_url(url, client=client, cache=cache)
+                if not recipe or not recipe.name_it or recipe.name_it == UNKNOWN_RECIPE_NAME:
+                    return CrawlResult(url, None, "no recipe found")
+                return CrawlResult(url, recipe, None)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in RETRY_STATUSES or attempt == max_retries:
+                    return CrawlResult(url, None, f"HTTP {e.response.status_code}")
+                wait = retry_after_seconds(e.response.headers.get("Retry-After"))
+            except httpx.TransportError as e:
+                if attempt == max_retries:
+                    return CrawlResult(url, None, f"{type(e).__name__}: {e}")
+                wait = None
+            except Exception as e:
+                return CrawlResult(url, None, str(e))
+
+            wait = wait if wait is not None else backoff_delay(attempt, base=max(delay, 0.5))
+            bucket = limiter.bucket(host)
+            if bucket:
+                bucket.pause(wait)
+            await asyncio.sleep(wait)
+
+    for next_result in asyncio.as_completed([fetch(url) for url in urls]):
+        yield await next_result
@@ -0,0 +1,113 @@
+"""
+Parse-once HTML documents for the scrapers.
+Uses the fastest installed backend (selectolax, then lxml through bs4, then
+bs4's built-in html.parser) and drops <script>/<style> blocks and comments
+before parsing, keeping JSON-LD scripts.
+"""
+import re
+from functools import cached_property
+from typing import Optional
+
+from bs4 import BeautifulSoup
+
+from ..config.settings import Config
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional: pip install selectolax
+    LexborHTMLParser = None
+
+try:
+    import lxml  # noqa: F401  (enables bs4's "lxml" tree builder)
+    HAS_LXML = True
+except ImportError:  # optional: pip install lxml
+    HAS_LXML = False
+
+# Fastest first
+BACKENDS = ("selectolax", "lxml", "html.parser")
+
+JSON_LD_SELECTOR = 'script[type="application/ld+json"]'
+
+# Scripts (except JSON-LD), styles, inline icons, embeds and comments: no recipe text,
+# often most of the page
+_NOISE_RE = re.compile(
+    r"<script\b(?![^>]*application/ld\+json)[^>]*>.*?</script\s*>"
+    r"|<(style|svg|noscript|iframe|template)\b[^>]*>.*?</\1\s*>"
+    r"|<!--.*?-->",
+    re.IGNORECASE | re.DOTALL,
+)
+# Selectors bs4 can answer with find_all() instead of the much slower soupsieve engine
+_CLASS_SELECTOR_RE = re.compile(r"\.([\w-]+)")
+_TAG_SELECTOR_RE = re.compile(r"[a-z][a-z0-9]*")
+
+
+def available_backends() -> list[str]:
+    """Installed parser backends, fastest first."""
+    installed = {"selectolax": LexborHTMLParser is not None, "lxml": HAS_LXML, "html.parser": True}
+    return [name for name in BACKENDS if installed[name]]
+
+
+def default_backend() -> str:
+    """HTML_PARSER from the environment if installed, else the fastest available."""
+    backends = available_backends()
+    return Config.HTML_PARSER if Config.HTML_PARSER in backends else backends[0]
+
+
+def strip_noise(html: str) -> str:
+    """Remove scripts (keeping JSON-LD), styles, svg/noscript/iframe/template blocks and comments."""
+    return _NOISE_RE.sub("", html)
+
+
+class HtmlDocument:
+    """
+    An HTML page parsed once, with the queries the scrapers need.
+
+    Usage:
+        doc = HtmlDocument(html)
+        title = doc.first_text("h1")
+        facts = scan_recipe_text(doc.page_text)
+    """
+
+    def __init__(self, html: str, backend: Optional[str] = None):
+        self.backend = backend or default_backend()
+        if self.backend not in available_backends():
+            raise ValueError(f"HTML parser backend not available: {self.backend}")
+        html = strip_noise(html)
+        if self.backend == "selectolax":
+            self._tree = LexborHTMLParser(html)
+        else:
+            self._soup = BeautifulSoup(html, self.backend)
+
+    @cached_property
+    def page_text(self) -> str:
+        """All text in the document, computed on first use."""
+        if self.backend == "selectolax":
+            return self._tree.root.text() if self._tree.root else ""
+        return self._soup.get_text()
+
+    def select_texts(self, selector: str) -> list[str]:
+        """Stripped text of every element matching a CSS selector, in document order."""
+        if self.backend == "selectolax":
+            return [node.text(strip=True) for node in self._tree.css(selector)]
+        return [element.get_text(strip=True) for element in self._soup_select(selector)]
+
+    def first_text(self, selector: str) -> Optional[str]:
+        """Stripped text of the first element matching a CSS selector, or None."""
+        if self.backend == "selectolax":
+            node = self._tree.css_first(selector)
+            return node.text(strip=True) if node else None
+        elements = self._soup_select(selector, limit=1)
+        return elements[0].get_text(strip=True) if elements else None
+
+    def json_ld(self) -> list[str]:
+        """Raw contents of the JSON-LD script blocks."""
+        if self.backend == "selectolax":
+            return [node.text() for node in self._tree.css(JSON_LD_SELECTOR)]
+        return [script.string or "" for script in self._soup.find_all("script", type="application/ld+json")]
+
+    def _soup_select(self, selector: str, limit: Optional[int] = None) -> list:
+        if match := _CLASS_SELECTOR_RE.fullmatch(selector):
+            return self._soup.find_all(class_=match.group(1), limit=limit)
+        if _TAG_SELECTOR_RE.fullmatch(selector):
+            return self._soup.find_all(selector, limit=limit)
+        return self._soup.select(selector, limit=limit or 0)
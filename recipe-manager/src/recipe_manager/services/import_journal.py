@@ -0,0 +1,70 @@
+"""
+Progress journal for batch LLM imports.
+One JSON line per processed input file, appended as each file finishes, so an
+interrupted `import-llm --batch` run resumes where it stopped.
+"""
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Optional
+
+JOURNAL_NAME = ".import_llm_journal.jsonl"  # dotfile, so *.txt globs skip it
+
+
+def file_hash(path: Path) -> str:
+    """Hash of a file's bytes; an edited input file is parsed again."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class ImportJournal:
+    """Append-only file -> {hash, status, output} log kept in the input directory."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        self._file = None
+
+    @classmethod
+    def load(cls, directory: Path) -> "ImportJournal":
+        """Replay the journal of a directory; later lines win, a torn last line is ignored."""
+        journal = cls(directory / JOURNAL_NAME)
+        if journal.path.exists():
+            for line in journal.path.read_text(encoding="utf-8").splitlines():
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                journal.entries[entry["file"]] = entry
+        return journal
+
+    def is_done(self, file_name: str, hash: str) -> bool:
+        """True if this exact file content was already imported successfully."""
+        entry = self.entries.get(file_name)
+        return entry is not None and entry["hash"] == hash and entry["status"] == "done"
+
+    def record(
+        self,
+        file_name: str,
+        hash: str,
+        status: str,
+        output: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        Append one result and flush it to disk immediately. Failed files are
+        retried next run and keep the output of their last success, if any.
+        """
+        if output is None and file_name in self.entries:
+            output = self.entries[file_name].get("output")
+        entry = {"file": file_name, "hash": hash, "status": status, "output": output, "error": error, "at": time.time()}
+        self.entries[file_name] = entry
+        if self._file is None:
+            self._file = self.path.open("a", encoding="utf-8")
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
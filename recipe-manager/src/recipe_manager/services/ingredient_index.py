@@ -0,0 +1,117 @@
+"""
+Canonical ingredient index.
+Maps normalized Italian names and USDA FDC IDs to existing ingredient rows,
+so recipes link to one shared row per ingredient instead of one per line.
+"""
+import re
+import unicodedata
+from typing import Iterable, Optional
+from uuid import UUID
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace."""
+    text = unicodedata.normalize("NFKD", (name or "").lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = re.sub(r"[^\w\s]", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class IngredientIndex:
+    """In-memory lookup of existing ingredients, loaded once per run."""
+
+    def __init__(self):
+        self._by_name: dict[str, UUID] = {}
+        self._by_fdc_id: dict[str, UUID] = {}
+
+    @classmethod
+    async def load(cls, turso) -> "IngredientIndex":
+        """Build the index from the ingredients table in a single query."""
+        index = cls()
+        for row in await turso.get_ingredient_keys():
+            index.add(UUID(row["id"]), row["name_it"], row["usda_fdc_id"])
+        return index
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def add(self, id: UUID, name_it: Optional[str], usda_fdc_id: Optional[str] = None) -> None:
+        """Register an ingredient; the first row seen for a key stays canonical."""
+        key = normalize_name(name_it)
+        if key:
+            self._by_name.setdefault(key, id)
+        if usda_fdc_id:
+            self._by_fdc_id.setdefault(str(usda_fdc_id), id)
+
+    def resolve(self, name_it: Optional[str], usda_fdc_id: Optional[str] = None) -> Optional[UUID]:
+        """Find an existing ingredient by FDC ID first, then by normalized name."""
+        if usda_fdc_id and str(usda_fdc_id) in self._by_fdc_id:
+            return self._by_fdc_id[str(usda_fdc_id)]
+        return self._by_name.get(normalize_name(name_it))
+
+    def discard(self, ids: Iterable[UUID]) -> None:
+        """Unregister ingredients created by resolve_or_create whose rows were never written."""
+        ids = set(ids)
+        self._by_name = {key: id for key, id in self._by_name.items() if id not in ids}
+        self._by_fdc_id = {key: id for key, id in self._by_fdc_id.items() if id not in ids}
+
+    def resolve_or_create(self, row: dict) -> tuple[UUID, bool]:
+        """
+        Return (ingredient_id, created) for an ingredient row.
+        Unknown ingredients are registered under row["id"] and must be inserted by the caller.
+        """
+        existing = self.resolve(row["name_it"], row.get("usda_fdc_id"))
+        if existing:
+            return existing, False
+        self.add(row["id"], row["name_it"], row.get("usda_fdc_id"))
+        return row["id"], True
+
+
+class IngredientUsage:
+    """Reverse index ingredient id -> ids of the recipes using it, built from recipe_ingredients rows."""
+
+    def __init__(self):
+        self._recipes: dict[str, set[str]] = {}
+
+    @classmethod
+    def from_links(cls, links: list[dict]) -> "IngredientUsage":
+        usage = cls()
+        for link in links:
+            usage.add(link["ingredient_id"], link["recipe_id"])
+        return usage
+
+    def __len__(self) -> int:
+        return len(self._recipes)
+
+    def add(self, ingredient_id, recipe_id) -> None:
+        self._recipes.setdefault(str(ingredient_id), set()).add(str(recipe_id))
+
+    def recipes_using(self, ingredient_ids) -> set[str]:
+        """IDs of the recipes that use any of the ingredients."""
+        return set().union(*(self._recipes.get(str(i), ()) for i in ingredient_ids))
+
+
+def plan_ingredient_merges(rows: list[dict]) -> dict[str, list[str]]:
+    """
+    Group duplicate ingredient rows by normalized name.
+
+    The canonical row of each group is the one with a USDA FDC ID, then with
+    nutrient data, then the oldest. Returns {canonical_id: [duplicate_ids]}.
+    """
+    groups: dict[str, list[dict]] = {}
+    for row in rows:
+        key = normalize_name(row["name_it"])
+        if key:
+            groups.setdefault(key, []).append(row)
+
+    merges = {}
+    for group in groups.values():
+        if len(group) < 2:
+            continue
+        group.sort(key=lambda r: (
+            not r.get("usda_fdc_id"),
+            not r.get("kcal_per_100g"),
+            r.get("created_at") or 0,
+        ))
+        merges[group[0]["id"]] = [r["id"] for r in group[1:]]
+    return merges
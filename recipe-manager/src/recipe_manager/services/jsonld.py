@@ -0,0 +1,57 @@
+"""
+Streaming schema.org JSON-LD extraction from raw HTML.
+Finds <script type="application/ld+json"> blocks with a regex scan, one at a
+time, and returns the first Recipe node without building a DOM.
+"""
+import json
+import re
+from typing import Any, Iterator, Optional
+
+_JSON_LD_RE = re.compile(
+    r"<script\b[^>]*\btype\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Keys whose values may hold further nodes (WordPress/Yoast pages nest the Recipe in @graph)
+_CONTAINER_KEYS = ("@graph", "mainEntity", "mainEntityOfPage")
+
+
+def iter_json_ld(html: str) -> Iterator[Any]:
+    """Decode JSON-LD blocks lazily, in document order; malformed blocks are skipped."""
+    for match in _JSON_LD_RE.finditer(html):
+        try:
+            yield json.loads(match.group(1), strict=False)  # Raw newlines in strings are common
+        except ValueError:
+            continue
+
+
+def is_type(node: Any, type_name: str) -> bool:
+    """True if a node's @type is (or includes) type_name, with or without a schema prefix."""
+    if not isinstance(node, dict):
+        return False
+    types = node.get("@type")
+    types = types if isinstance(types, list) else [types]
+    return any(isinstance(t, str) and t.rsplit("/", 1)[-1].rsplit(":", 1)[-1] == type_name for t in types)
+
+
+def find_recipe_node(data: Any) -> Optional[dict]:
+    """Depth-first search of one JSON-LD document (lists, @graph, mainEntity) for a Recipe."""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            if is_type(node, "Recipe"):
+                return node
+            stack.extend(node[key] for key in reversed(_CONTAINER_KEYS) if key in node)
+    return None
+
+
+def find_recipe_json_ld(html: str) -> Optional[dict]:
+    """First schema.org Recipe node in the page's JSON-LD, scanning blocks until one is found."""
+    for data in iter_json_ld(html):
+        node = find_recipe_node(data)
+        if node is not None:
+            return node
+    return None
@@ -0,0 +1,210 @@
+"""
+Reader for the legacy GialloZafferano database (docs/DB-esempio/ricette.db).
+Streams `ricette` rows and maps them onto ParsedRecipe, attaching the
+pre-matched USDA nutrients stored in the `ingredienti` table.
+"""
+import json
+import re
+import sqlite3
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .parser import ParsedIngredient, ParsedNutrition, ParsedRecipe
+
+RECIPE_COLUMNS = (
+    "URL", "Titolo", "Presentazione", "Calorie_per_porzione", "Difficolta", "Dosi_per",
+    "Preparazione", "Cottura", "Istruzioni", "Ingredienti_JSON", "Ingredients_JSON",
+    "Calorie_totali_porzione",
+)
+
+# ingredienti column -> ParsedIngredient field (values per 100g)
+NUTRIENT_COLUMNS = {
+    "Energy_KCAL": "kcal_per_100g",
+    "Protein_G": "protein_per_100g",
+    "Carbohydrate_by_difference_G": "carbs_per_100g",
+    "Total_lipid_fat_G": "fat_per_100g",
+    "Fiber_total_dietary_G": "fiber_per_100g",
+}
+
+DIFFICULTY = {
+    "molto facile": "easy",
+    "facile": "easy",
+    "media": "medium",
+    "difficile": "hard",
+    "molto difficile": "hard",
+}
+
+# SQLite's default host-parameter limit
+_MAX_PARAMS = 999
+
+_TIME_RE = re.compile(r"(\d+)\s*(h|min)")
+_NOTE_RE = re.compile(r"^(.*?)\s*\((.*)\)\s*$")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-ZÀ-Ý])")
+STEP_MAX_CHARS = 400
+
+
+def parse_minutes(text: Optional[str]) -> int:
+    """'10 min' -> 10, '1 h 2 min' -> 62, 'Non specificato' -> 0."""
+    return sum(int(value) * (60 if unit == "h" else 1) for value, unit in _TIME_RE.findall(text or ""))
+
+
+def split_steps(text: Optional[str]) -> list[str]:
+    """Split a one-paragraph method into steps of whole sentences, up to ~400 chars each."""
+    steps: list[str] = []
+    current = ""
+    for sentence in _SENTENCE_RE.split((text or "").strip()):
+        if current and len(current) + len(sentence) + 1 > STEP_MAX_CHARS:
+            steps.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}".strip()
+    if current:
+        steps.append(current)
+    return steps
+
+
+def pair_english_names(italian: dict, english: dict) -> dict[str, str]:
+    """
+    Pair Ingredienti_JSON keys with Ingredients_JSON keys.
+
+    The English dict only lists weighed ingredients, in the same order. When
+    the counts differ, names are paired in order only where the quantities agree.
+    """
+    weighed = [(name, qty) for name, qty in italian.items() if isinstance(qty, (int, float))]
+    english_items = list(english.items())
+    if len(weighed) == len(english_items):
+        return {it: en for (it, _), (en, _) in zip(weighed, english_items)}
+
+    pairs = {}
+    position = 0
+    for it_name, qty in weighed:
+        for offset, (en_name, en_qty) in enumerate(english_items[position:]):
+            if isinstance(en_qty, (int, float)) and abs(en_qty - qty) < 1e-6:
+                pairs[it_name] = en_name
+                position += offset + 1
+                break
+    return pairs
+
+
+class LegacyRecipeDB:
+    """
+    Read-only view over ricette.db.
+
+    Rows are read from a single cursor with fetchmany, so only one batch
+    of recipes (plus its ingredient nutrients) is in memory at a time.
+
+    Usage:
+        with LegacyRecipeDB(path) as legacy:
+            for batch in legacy.iter_recipe_batches(50):
+                ...
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def __enter__(self) -> "LegacyRecipeDB":
+        self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def count_recipes(self) -> int:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM ricette").fetchone()
+        return count
+
+    def iter_recipe_batches(self, batch_size: int = 50) -> Iterator[list[ParsedRecipe]]:
+        """Yield ParsedRecipe lists of up to batch_size, streaming from one cursor."""
+        cursor = self._conn.execute(f"SELECT {', '.join(RECIPE_COLUMNS)} FROM ricette ORDER BY rowid")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            records = [dict(zip(RECIPE_COLUMNS, row)) for row in rows]
+            english_names = {
+                name
+                for record in records
+                for name in json.loads(record["Ingredients_JSON"] or "{}")
+            }
+            nutrients = self._matched_nutrients(english_names)
+            yield [self._to_parsed_recipe(record, nutrients) for record in records]
+
+    def _matched_nutrients(self, names: set[str]) -> dict[str, dict]:
+        """Look up USDA-matched nutrient rows for a set of English ingredient names."""
+        found = {}
+        names = sorted(names)
+        columns = ", ".join(NUTRIENT_COLUMNS)
+        for start in range(0, len(names), _MAX_PARAMS):
+            chunk = names[start:start + _MAX_PARAMS]
+            rows = self._conn.execute(
+                f"SELECT Nome_ingrediente, fdc_id, {columns} FROM ingredienti "
+                f"WHERE USDA_match = 1 AND Energy_KCAL IS NOT NULL "
+                f"AND Nome_ingrediente IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            for name, fdc_id, *values in rows:
+                found[name] = dict(
+                    usda_fdc_id=str(int(fdc_id)) if fdc_id is not None else None,
+                    **dict(zip(NUTRIENT_COLUMNS.values(), values)),
+                )
+        return found
+
+    def _to_parsed_recipe(self, record: dict, nutrients: dict[str, dict]) -> ParsedRecipe:
+        italian = json.loads(record["Ingredienti_JSON"] or "{}")
+        english = json.loads(record["Ingredients_JSON"] or "{}")
+        english_names = pair_english_names(italian, english)
+
+        ingredients = []
+        for raw_name, qty in italian.items():
+            match = _NOTE_RE.match(raw_name)
+            name, note = (match.group(1), match.group(2)) if match else (raw_name, None)
+            name_en = english_names.get(raw_name)
+            weighed = isinstance(qty, (int, float))
+            ingredients.append(ParsedIngredient(
+                name=name,
+                name_it=name,
+                name_en=name_en or "",
+                quantity=float(qty) if weighed else 0,
+                unit="g" if weighed else "q.b.",
+                notes_it=note,
+                grams=float(qty) if weighed else None,
+                original_text=raw_name,
+                **nutrients.get(name_en, {}),
+            ))
+
+        # The site's per-serving value; the computed column is often 0 or off by orders of magnitude
+        kcal = record["Calorie_per_porzione"] or int(record["Calorie_totali_porzione"] or 0)
+        servings = record["Dosi_per"] if isinstance(record["Dosi_per"], int) and record["Dosi_per"] > 0 else 4
+        total_grams = sum(i.grams for i in ingredients if i.grams)
+        serving_weight = round(total_grams / servings) if total_grams else None
+
+        # Macros per serving from the pre-matched ingredients (unmatched ones count as 0)
+        def per_serving(field: str) -> float:
+            total = sum(i.grams * getattr(i, field) / 100 for i in ingredients if i.grams and getattr(i, field))
+            return round(total / servings, 1)
+
+        return ParsedRecipe(
+            name_it=record["Titolo"],
+            description_it=record["Presentazione"],
+            source_url=record["URL"],
+            category="main_course",  # primi / secondi
+            servings=servings,
+            prep_time_min=parse_minutes(record["Preparazione"]),
+            cook_time_min=parse_minutes(record["Cottura"]),
+            difficulty=DIFFICULTY.get((record["Difficolta"] or "").lower(), "easy"),
+            ingredients=ingredients,
+            steps=split_steps(record["Istruzioni"]),
+            nutrition=ParsedNutrition(
+                kcal=int(kcal),
+                protein=per_serving("protein_per_100g"),
+                carbs=per_serving("carbs_per_100g"),
+                fat=per_serving("fat_per_100g"),
+                fiber=per_serving("fiber_per_100g"),
+                kcal_per_100g=round(kcal * 100 / serving_weight) if serving_weight else 0,
+                serving_weight_g=serving_weight,
+                total_raw_weight_g=round(total_grams) if total_grams else None,
+            ),
+        )
@@ -0,0 +1,168 @@
+"""
+Content-addressed cache for Gemini recipe parsing responses.
+Keyed by a hash of (model, system prompt, generation settings, normalized
+input text); entries made under a different SYSTEM_PROMPT are dropped.
+"""
+import hashlib
+import json
+import sqlite3
+import time
+import unicodedata
+from pathlib import Path
+from typing import Optional
+
+from ..config.settings import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    prompt_hash TEXT NOT NULL,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def normalize_text(text: str) -> str:
+    """Unicode NFC, whitespace collapsed within lines, blank lines dropped."""
+    lines = (" ".join(line.split()) for line in unicodedata.normalize("NFC", text).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def prompt_hash(system_prompt: str) -> str:
+    """Short fingerprint of a system prompt."""
+    return _sha256(system_prompt)[:16]
+
+
+def llm_cache_key(model: str, system_prompt: str, settings: dict, text: str) -> str:
+    """Hash of everything that determines the response for an input text."""
+    material = json.dumps(
+        [model, prompt_hash(system_prompt), settings, normalize_text(text)],
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+    )
+    return _sha256(material)
+
+
+class LLMCache:
+    """
+    SQLite-backed response cache, opened lazily on first use.
+
+    Opening it with a system prompt deletes responses made under any other
+    prompt, so editing SYSTEM_PROMPT invalidates the whole cache once.
+    Hit/miss counters are persisted on flush()/close().
+    """
+
+    def __init__(
+        self,
+        system_prompt: str,
+        path: Optional[Path] = None,
+        max_entries: Optional[int] = None,
+    ):
+        self.prompt_hash = prompt_hash(system_prompt)
+        self.path = Path(path or Config.LLM_CACHE_PATH)
+        self.max_entries = Config.LLM_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            self.invalidated = self._conn.execute(
+                "DELETE FROM responses WHERE prompt_hash != ?", (self.prompt_hash,)
+            ).rowcount
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached raw response, or None (counted as a miss)."""
+        conn = self._connect()
+        row = conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return row[0]
+
+    def set(self, key: str, model: str, response: str) -> None:
+        """Store a raw response and evict least recently used entries over the limit."""
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, prompt_hash, model, response, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, self.prompt_hash, model, response, now, now),
+        )
+        (count,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            )
+        conn.commit()
+
+    def flush(self) -> None:
+        """Persist buffered access times and hit/miss counters."""
+        if self._conn is None:
+            return
+        if self.hits or self.misses:
+            self._conn.executemany(
+                "INSERT INTO counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                [("hits", self.hits), ("misses", self.misses)],
+            )
+            self.hits = self.misses = 0
+        self._conn.commit()
+
+    def close(self) -> None:
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def clear(self) -> int:
+        """Delete every cached response and reset counters. Returns entries removed."""
+        conn = self._connect()
+        (count,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        conn.execute("DELETE FROM responses")
+        conn.execute("DELETE FROM counters")
+        conn.commit()
+        conn.execute("VACUUM")
+        self.hits = self.misses = 0
+        return count
+
+    def stats(self) -> dict:
+        """Entry count, file size, current prompt fingerprint and lifetime hit/miss counters."""
+        self.flush()
+        conn = self._connect()
+        (entries,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "prompt_hash": self.prompt_hash,
+            "invalidated": self.invalidated,
+            "size_bytes": self.path.stat().st_size if self.path.exists() else 0,
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+        }
@@ -2,15 +2,29 @@
 LLM-based recipe parser using Gemini API.
 Parses recipe text into clean, structured JSON with translations.
 """
+import asyncio
 import json
 import os
 from typing import Optional
 
 from google import genai
-from google.genai import types
+from google.genai import errors, types
 
+from ..config.settings import Config
+from .llm_cache import LLMCache, llm_cache_key
+from .preparse import ingredient_names, preparse_recipe_text
+from .rate_limit import RETRY_STATUSES, TokenBucket, backoff_delay, retry_after_seconds
+from .translation_cache import TranslationCache
 from .parser import ParsedRecipe, ParsedIngredient, ParsedNutrition, DietaryFlags
 
+GEMINI_MODEL = "gemini-1.5-flash"
+GENERATION_SETTINGS = {"temperature": 0.1, "max_output_tokens": 4096}
+USER_PROMPT = "Parse this recipe and extract ALL required fields with accurate nutritional data and cooking factors:\n\n{text}"
+# Appended to the recipe text for ingredients the translation dictionary already knows
+KNOWN_NAMES_PROMPT = (
+    '\n\nAlready translated ingredients: set name_en to "" for these, it is filled in locally.\n{names}'
+)
+
 
 # System prompt for recipe parsing - aligned with prompts/recipe_parser.md
 SYSTEM_PROMPT = """You are a professional recipe parser for a meal planning app. Extract structured data with PRECISE nutritional and weight information to enable portion scaling for different family members.
@@ -91,31 +105,49 @@ RULES:
 """
 
 
-def parse_recipe_with_llm(text: str, api_key: Optional[str] = None) -> dict:
-    """
-    Parse recipe text using Gemini LLM.
-    Returns parsed JSON dict ready for database insertion.
-    """
+# Ingredient names only, for imports that did not go through SYSTEM_PROMPT (see translation_cache.py)
+TRANSLATE_PROMPT = """You translate Italian recipe ingredient names into English.
+Input: a JSON array of Italian ingredient names.
+Output: ONLY a JSON object mapping every input name, unchanged, to its usual English name in a recipe
+(e.g. "olio extravergine d'oliva": "extra virgin olive oil", "pomodori pelati": "peeled tomatoes").
+Keep the singular/plural of the input. No quantities, notes or explanations.
+"""
+TRANSLATE_BATCH_SIZE = 200
+
+
+def create_client(api_key: Optional[str] = None) -> genai.Client:
+    """Gemini client; one instance can serve many requests (sync, or async via .aio)."""
     key = api_key or os.getenv("GEMINI_API_KEY")
     if not key:
         raise ValueError(
             "GEMINI_API_KEY not found. Set it in .env or pass as argument."
         )
+    return genai.Client(api_key=key)
 
-    client = genai.Client(api_key=key)
 
-    response = client.models.generate_content(
-        model="gemini-1.5-flash",
-        contents=f"Parse this recipe and extract ALL required fields with accurate nutritional data and cooking factors:\n\n{text}",
+def with_known_names(text: str, translations: Optional[TranslationCache]) -> str:
+    """
+    Append the ingredient names of the text that a TranslationCache already
+    translates, so Gemini does not spend output tokens on them.
+    """
+    names = translations.known(ingredient_names(text)) if translations is not None else []
+    return text + KNOWN_NAMES_PROMPT.format(names="\n".join(f"- {name}" for name in names)) if names else text
+
+
+def _request_args(text: str) -> dict:
+    return dict(
+        model=GEMINI_MODEL,
+        contents=USER_PROMPT.format(text=text),
         config=types.GenerateContentConfig(
             system_instruction=SYSTEM_PROMPT,
-            temperature=0.1,
-            max_output_tokens=4096,
-        )
+            **GENERATION_SETTINGS,
+        ),
     )
 
-    # Extract JSON from response
-    response_text = response.text.strip()
+
+def _decode_response(response_text: str) -> tuple[dict, str]:
+    """Strip markdown fences and decode; returns (data, cleaned JSON text)."""
+    response_text = (response_text or "").strip()
 
     # Remove markdown code blocks if present
     if response_text.startswith("```"):
@@ -125,11 +157,124 @@ def parse_recipe_with_llm(text: str, api_key: Optional[str] = None) -> dict:
         response_text = "\n".join(lines)
 
     try:
-        return json.loads(response_text)
+        return json.loads(response_text), response_text
     except json.JSONDecodeError as e:
         raise ValueError(f"Failed to parse LLM response as JSON: {e}\nResponse: {response_text[:500]}")
 
 
+def parse_recipe_with_llm(
+    text: str,
+    api_key: Optional[str] = None,
+    cache: Optional[LLMCache] = None,
+    client: Optional[genai.Client] = None,
+    preparse: bool = True,
+    translations: Optional[TranslationCache] = None,
+) -> dict:
+    """
+    Parse recipe text using Gemini LLM.
+    Returns parsed JSON dict ready for database insertion.
+    With preparse, boilerplate is dropped and sections are extracted locally
+    so only a compact draft is sent (see preparse.py).
+    With a TranslationCache, ingredients it already knows come back with an
+    empty name_en, to be filled in by translations.apply().
+    With a cache, identical inputs (after whitespace normalization) are
+    answered from disk without calling the API.
+    """
+    if preparse:
+        text = preparse_recipe_text(text).text
+    text = with_known_names(text, translations)
+    cache_key = llm_cache_key(GEMINI_MODEL, SYSTEM_PROMPT, GENERATION_SETTINGS, text)
+    if cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return json.loads(cached)
+
+    client = client or create_client(api_key)
+    response = client.models.generate_content(**_request_args(text))
+    data, response_text = _decode_response(response.text)
+
+    # Only well-formed responses are cached
+    if cache:
+        cache.set(cache_key, GEMINI_MODEL, response_text)
+    return data
+
+
+async def parse_recipe_with_llm_async(
+    text: str,
+    client: genai.Client,
+    cache: Optional[LLMCache] = None,
+    rate_limiter: Optional[TokenBucket] = None,
+    max_retries: Optional[int] = None,
+    preparse: bool = True,
+    translations: Optional[TranslationCache] = None,
+) -> dict:
+    """
+    Async variant for batches: shares one client, waits on the rate limiter
+    before each request and retries 429/5xx with backoff (a 429 pauses the
+    limiter for every caller).
+    """
+    if preparse:
+        text = preparse_recipe_text(text).text
+    text = with_known_names(text, translations)
+    cache_key = llm_cache_key(GEMINI_MODEL, SYSTEM_PROMPT, GENERATION_SETTINGS, text)
+    if cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return json.loads(cached)
+
+    max_retries = Config.GEMINI_MAX_RETRIES if max_retries is None else max_retries
+    for attempt in range(max_retries + 1):
+        if rate_limiter:
+            await rate_limiter.acquire()
+        try:
+            response = await client.aio.models.generate_content(**_request_args(text))
+            break
+        except errors.APIError as e:
+            if e.code not in RETRY_STATUSES or attempt >= max_retries:
+                raise
+            http_response = getattr(e, "response", None)
+            headers = getattr(http_response, "headers", None) or {}
+            delay = retry_after_seconds(headers.get("Retry-After")) or backoff_delay(attempt, base=2.0, cap=60.0)
+            if rate_limiter and e.code == 429:
+                rate_limiter.pause(delay)
+            await asyncio.sleep(delay)
+
+    data, response_text = _decode_response(response.text)
+    if cache:
+        cache.set(cache_key, GEMINI_MODEL, response_text)
+    return data
+
+
+def translate_ingredient_names(
+    names: list[str],
+    api_key: Optional[str] = None,
+    client: Optional[genai.Client] = None,
+) -> dict[str, str]:
+    """
+    Italian -> English for ingredient names the dictionary does not know yet,
+    TRANSLATE_BATCH_SIZE names per request. Names missing from a response are left out.
+    """
+    names = list(dict.fromkeys(name for name in names if name))
+    if not names:
+        return {}
+    client = client or create_client(api_key)
+    translations = {}
+    for start in range(0, len(names), TRANSLATE_BATCH_SIZE):
+        chunk = names[start:start + TRANSLATE_BATCH_SIZE]
+        response = client.models.generate_content(
+            model=GEMINI_MODEL,
+            contents=json.dumps(chunk, ensure_ascii=False),
+            config=types.GenerateContentConfig(system_instruction=TRANSLATE_PROMPT, **GENERATION_SETTINGS),
+        )
+        data, _ = _decode_response(response.text)
+        if not isinstance(data, dict):
+            raise ValueError(f"Expected a JSON object of translations, got: {str(data)[:200]}")
+        translations.update(
+            (name, data[name].strip()) for name in chunk if isinstance(data.get(name), str) and data[name].strip()
+        )
+    return translations
+
+
 def llm_result_to_parsed_recipe(data: dict) -> ParsedRecipe:
     """Convert LLM JSON output to ParsedRecipe model."""
 
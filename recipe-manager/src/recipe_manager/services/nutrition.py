@@ -0,0 +1,230 @@
+"""
+Vectorized recipe nutrient aggregation.
+A batch of recipes is flattened into per-line arrays (owning recipe, grams,
+cooking factor) plus a lines x nutrients matrix of per-100g values; every
+recipe total then comes out of one weighted sum per column.
+"""
+from typing import Iterable, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .parser import UNIT_TO_GRAMS
+
+# Column order of every nutrient matrix
+NUTRIENTS = ("kcal", "protein", "carbs", "fat", "fiber")
+NUTRIENT_COLUMNS = tuple(f"{name}_per_100g" for name in NUTRIENTS)
+
+# recipes columns written from RecipeTotals, and the decimals each is rounded to
+RECIPE_FIELDS = (
+    ("kcal_per_100g", 0),
+    ("protein_per_100g", 2),
+    ("carbs_per_100g", 2),
+    ("fat_per_100g", 2),
+    ("fiber_per_100g", 2),
+    ("kcal_per_serving", 0),
+    ("serving_weight_g", 0),
+)
+
+# Fallback used by the importers when neither the source nor the ingredients give a weight
+DEFAULT_SERVING_WEIGHT_G = 200
+
+_GRAM_UNITS = {"g": 1.0, "gr": 1.0, "kg": 1000.0}
+
+
+def _line_cooking_factor(line: dict) -> float:
+    """The line's own cooking_factor when set (0 included), else its ingredient's cooked_weight_factor."""
+    if line.get("cooking_factor") is not None:
+        return float(line["cooking_factor"])
+    return float(line.get("cooked_weight_factor") or 1.0)
+
+
+def unit_to_grams(quantity: float, unit: Optional[str]) -> float:
+    """Grams for a quantity, or 0 when the unit has no known weight (pieces, q.b.)."""
+    unit = (unit or "g").strip().lower()
+    factor = _GRAM_UNITS.get(unit, UNIT_TO_GRAMS.get(unit))
+    return float(quantity or 0) * factor if factor else 0.0
+
+
+def _grams_per_unit(units: Sequence[Optional[str]]) -> np.ndarray:
+    """unit_to_grams(1, unit) for many units, looking each distinct unit up once."""
+    distinct, inverse = np.unique(np.asarray([u or "g" for u in units], dtype=object), return_inverse=True)
+    return np.asarray([unit_to_grams(1, u) for u in distinct], dtype=float)[inverse] if len(distinct) else np.zeros(0)
+
+
+def nutrient_matrix(rows: Sequence[dict]) -> np.ndarray:
+    """(len(rows), len(NUTRIENTS)) per-100g matrix from ingredient rows; missing values count as 0."""
+    matrix = np.zeros((len(rows), len(NUTRIENTS)))
+    for i, row in enumerate(rows):
+        matrix[i] = [float(row.get(column) or 0) for column in NUTRIENT_COLUMNS]
+    return matrix
+
+
+class IngredientTable(NamedTuple):
+    """Every ingredient as a matrix row: per-100g nutrients, cooking factor, matched flag."""
+    index: dict              # ingredient id -> row
+    nutrients: np.ndarray    # ingredients x NUTRIENTS
+    cooking_factors: np.ndarray
+    matched: np.ndarray      # bool: has a USDA ID or any nutrient value
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[dict]) -> "IngredientTable":
+        nutrients = nutrient_matrix(rows)
+        fdc_ids = np.asarray([row.get("usda_fdc_id") is not None for row in rows], dtype=bool)
+        return cls(
+            index={str(row["id"]): i for i, row in enumerate(rows)},
+            nutrients=nutrients,
+            cooking_factors=np.asarray([float(row.get("cooked_weight_factor") or 1.0) for row in rows]),
+            matched=fdc_ids | (nutrients != 0).any(axis=1) if len(rows) else fdc_ids,
+        )
+
+
+class RecipeLines(NamedTuple):
+    """Ingredient lines of a batch of recipes, flattened; line i belongs to recipe owner[i]."""
+    owner: np.ndarray            # int, index into the batch
+    grams: np.ndarray            # raw weight of each line
+    cooking_factors: np.ndarray  # cooked / raw weight of each line
+    nutrients: np.ndarray        # lines x NUTRIENTS, per 100g raw
+    known: np.ndarray            # bool: weight and nutrient data both known (or not needed)
+    missing: int = 0             # lines linked to an ingredient id with no ingredient row
+
+    @classmethod
+    def from_recipes(cls, recipes: Iterable[Iterable[dict]]) -> "RecipeLines":
+        """
+        Build from one list of lines per recipe. A line is a dict with
+        quantity, unit, cooked_weight_factor and the *_per_100g columns
+        (a recipe_ingredients row joined with its ingredient, optionally with
+        usda_fdc_id); a non-null cooking_factor on the line wins over the
+        ingredient's cooked_weight_factor.
+
+        A line is known unless it has a quantity in a unit without a weight
+        (pieces), or a weight but an ingredient never matched to nutrient data
+        (no USDA ID and all nutrients 0). "q.b." lines weigh nothing and are known.
+        """
+        owner, grams, factors, rows, known = [], [], [], [], []
+        for index, lines in enumerate(recipes):
+            for line in lines:
+                weight = unit_to_grams(line.get("quantity"), line.get("unit"))
+                matched = line.get("usda_fdc_id") is not None or any(line.get(c) for c in NUTRIENT_COLUMNS)
+                owner.append(index)
+                grams.append(weight)
+                factors.append(_line_cooking_factor(line))
+                rows.append(line)
+                known.append((weight > 0 and matched) or (weight == 0 and not line.get("quantity")))
+        return cls(
+            owner=np.asarray(owner, dtype=np.intp),
+            grams=np.asarray(grams, dtype=float),
+            cooking_factors=np.asarray(factors, dtype=float),
+            nutrients=nutrient_matrix(rows),
+            known=np.asarray(known, dtype=bool),
+        )
+
+
+    @classmethod
+    def from_links(cls, links: Sequence[dict], recipe_index: dict, ingredients: IngredientTable) -> "RecipeLines":
+        """
+        Build from recipe_ingredients rows (recipe_id, ingredient_id, quantity,
+        unit, optionally cooking_factor overriding the ingredient's).
+
+        The rows are a sparse recipes x ingredients quantity matrix in COO form;
+        gathering ingredient rows by column index makes aggregate() compute its
+        product with the ingredients x nutrients matrix. Links to recipes
+        outside recipe_index are ignored; links to ingredients missing from
+        the table are unknown lines (their recipes come out incomplete),
+        counted in `missing`.
+        """
+        links = [link for link in links if str(link["recipe_id"]) in recipe_index]
+        quantities = np.asarray([float(link["quantity"] or 0) for link in links])
+        grams = quantities * _grams_per_unit([link["unit"] for link in links])
+        # Missing ingredients point at an extra all-zero, unmatched row past the end of the table
+        absent = len(ingredients.index)
+        column = np.asarray(
+            [ingredients.index.get(str(link["ingredient_id"]), absent) for link in links], dtype=np.intp
+        )
+        found = column != absent
+        nutrients = np.vstack([ingredients.nutrients.reshape(-1, len(NUTRIENTS)), np.zeros((1, len(NUTRIENTS)))])
+        matched = np.append(ingredients.matched, False)[column]
+        own_factors = np.asarray(
+            [np.nan if link.get("cooking_factor") is None else float(link["cooking_factor"]) for link in links],
+            dtype=float,
+        )
+        factors = np.append(ingredients.cooking_factors, 1.0)[column]
+        return cls(
+            owner=np.asarray([recipe_index[str(link["recipe_id"])] for link in links], dtype=np.intp),
+            grams=grams,
+            cooking_factors=np.where(np.isnan(own_factors), factors, own_factors),
+            nutrients=nutrients[column],
+            known=found & (((grams > 0) & matched) | ((grams == 0) & (quantities == 0))),
+            missing=int((~found).sum()),
+        )
+
+
+class RecipeTotals(NamedTuple):
+    """Aggregated values, one entry (or row) per recipe of the batch."""
+    raw_weight_g: np.ndarray
+    cooked_weight_g: np.ndarray
+    cooking_factor: np.ndarray
+    serving_weight_g: np.ndarray
+    totals: np.ndarray       # recipes x NUTRIENTS, whole recipe
+    per_100g: np.ndarray     # recipes x NUTRIENTS, per 100g cooked
+    per_serving: np.ndarray  # recipes x NUTRIENTS
+    complete: np.ndarray     # bool: some weight, and every line known
+
+    def field_matrix(self) -> np.ndarray:
+        """recipes x RECIPE_FIELDS, rounded as stored."""
+        matrix = np.column_stack([self.per_100g, self.per_serving[:, 0], self.serving_weight_g])
+        return np.column_stack([matrix[:, k].round(decimals) for k, (_, decimals) in enumerate(RECIPE_FIELDS)])
+
+    def recipe_fields(self, index: int) -> dict:
+        """Values for the recipes table columns, rounded like the importers round them."""
+        values = [*self.per_100g[index], self.per_serving[index, 0], self.serving_weight_g[index]]
+        return {
+            column: int(round(value)) if decimals == 0 else round(float(value), decimals)
+            for (column, decimals), value in zip(RECIPE_FIELDS, values)
+        }
+
+    def changed(self, stored: Sequence[dict]) -> np.ndarray:
+        """Bool per recipe: any RECIPE_FIELDS value differs from the stored row (NULL counts as 0)."""
+        current = np.asarray(
+            [[float(row.get(column) or 0) for column, _ in RECIPE_FIELDS] for row in stored], dtype=float
+        ).reshape(len(stored), len(RECIPE_FIELDS))
+        return ~np.isclose(current, self.field_matrix(), rtol=0, atol=0.005).all(axis=1)
+
+
+def aggregate(lines: RecipeLines, servings: Sequence[int]) -> RecipeTotals:
+    """
+    Totals for every recipe in the batch at once.
+
+    Nutrients are summed on raw weights; per-100g values refer to the cooked
+    dish (raw weight x cooking factor), as in the LLM parser's rules, and a
+    serving is the cooked weight divided by servings. Recipes without weighed
+    ingredients get zeros and a cooking factor of 1.
+    """
+    n = len(servings)
+    servings = np.maximum(np.asarray(servings, dtype=float), 1)
+    # Sparse recipes x lines membership times the lines x nutrients matrix, one column at a time
+    weighted = lines.nutrients * (lines.grams / 100)[:, None]
+    totals = np.column_stack(
+        [np.bincount(lines.owner, weights=weighted[:, k], minlength=n) for k in range(len(NUTRIENTS))]
+    ) if n else np.zeros((0, len(NUTRIENTS)))
+    raw = np.bincount(lines.owner, weights=lines.grams, minlength=n)
+    cooked = np.bincount(lines.owner, weights=lines.grams * lines.cooking_factors, minlength=n)
+    unknown = np.bincount(lines.owner, weights=(~lines.known).astype(float), minlength=n)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cooking_factor = np.where(raw > 0, cooked / raw, 1.0)
+        per_100g = np.where(cooked[:, None] > 0, totals * 100 / cooked[:, None], 0.0)
+    return RecipeTotals(
+        raw_weight_g=raw,
+        cooked_weight_g=cooked,
+        cooking_factor=cooking_factor,
+        serving_weight_g=cooked / servings,
+        totals=totals,
+        per_100g=per_100g,
+        per_serving=totals / servings[:, None],
+        complete=(raw > 0) & (unknown == 0),
+    )
+
+
+def recipe_nutrition(lines: Iterable[dict], servings: int) -> RecipeTotals:
+    """aggregate() for a single recipe; read the values at index 0."""
+    return aggregate(RecipeLines.from_recipes([lines]), [servings])
@@ -0,0 +1,148 @@
+"""
+On-disk cache of scraped HTML pages for conditional re-fetches.
+Bodies are stored zlib-compressed together with the ETag/Last-Modified
+validators; the total compressed size is bounded with LRU eviction.
+"""
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from ..config.settings import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class CachedPage(NamedTuple):
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class PageCache:
+    """
+    SQLite-backed page cache, opened lazily on first use.
+
+    Only pages served with an ETag or Last-Modified header are stored, since
+    nothing else can be revalidated. `revalidated` counts 304 responses and
+    `downloaded` counts full transfers; both are persisted on flush()/close().
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_bytes: Optional[int] = None):
+        self.path = Path(path or Config.PAGE_CACHE_PATH)
+        self.max_bytes = Config.PAGE_CACHE_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+        self.revalidated = 0
+        self.downloaded = 0
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Return the cached page and its validators, or None."""
+        row = self._connect().execute(
+            "SELECT body, etag, last_modified FROM pages WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        return CachedPage(zlib.decompress(row[0]).decode("utf-8"), row[1], row[2])
+
+    def touch(self, url: str) -> None:
+        """Record a 304: the cached body is still current."""
+        now = time.time()
+        conn = self._connect()
+        conn.execute("UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+        conn.commit()
+        self.revalidated += 1
+
+    def set(self, url: str, body: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        """Store a freshly downloaded page (if it has validators) and evict over the size limit."""
+        self.downloaded += 1
+        if not (etag or last_modified):
+            return
+        compressed = zlib.compress(body.encode("utf-8"), 6)
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO pages (url, body, size, etag, last_modified, fetched_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (url, compressed, len(compressed), etag, last_modified, now, now),
+        )
+        self._evict(conn)
+        conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Keep the most recently used pages whose sizes add up to max_bytes."""
+        conn.execute(
+            "DELETE FROM pages WHERE url IN ("
+            "SELECT url FROM (SELECT url, SUM(size) OVER (ORDER BY accessed_at DESC, url) AS running FROM pages) "
+            "WHERE running > ?)",
+            (self.max_bytes,),
+        )
+
+    def flush(self) -> None:
+        """Persist the revalidated/downloaded counters."""
+        if self._conn is None or not (self.revalidated or self.downloaded):
+            return
+        self._conn.executemany(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            [("revalidated", self.revalidated), ("downloaded", self.downloaded)],
+        )
+        self._conn.commit()
+        self.revalidated = self.downloaded = 0
+
+    def close(self) -> None:
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def clear(self) -> int:
+        """Delete every cached page and reset counters. Returns pages removed."""
+        conn = self._connect()
+        (count,) = conn.execute("SELECT COUNT(*) FROM pages").fetchone()
+        conn.execute("DELETE FROM pages")
+        conn.execute("DELETE FROM counters")
+        conn.commit()
+        conn.execute("VACUUM")
+        self.revalidated = self.downloaded = 0
+        return count
+
+    def stats(self) -> dict:
+        """Page count, stored (compressed) bytes, file size and lifetime counters."""
+        self.flush()
+        conn = self._connect()
+        pages, stored = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+        counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        return {
+            "path": str(self.path),
+            "pages": pages,
+            "stored_bytes": stored,
+            "max_bytes": self.max_bytes,
+            "size_bytes": self.path.stat().st_size if self.path.exists() else 0,
+            "revalidated": counters.get("revalidated", 0),
+            "downloaded": counters.get("downloaded", 0),
+        }
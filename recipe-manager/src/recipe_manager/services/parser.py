@@ -2,9 +2,10 @@
 Recipe parser service.
 Extracts recipe data from text or HTML content.
 """
+import os
 import re
-from decimal import Decimal
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
 
 from pydantic import BaseModel, Field
 
@@ -24,6 +25,13 @@ class ParsedIngredient(BaseModel):
     notes_en: Optional[str] = None
     grams: Optional[float] = None  # Weight in grams if known
     original_text: str = ""  # Original line for debugging
+    # Pre-matched USDA data (e.g. from the legacy DB), per 100g
+    usda_fdc_id: Optional[str] = None
+    kcal_per_100g: Optional[float] = None
+    protein_per_100g: Optional[float] = None
+    carbs_per_100g: Optional[float] = None
+    fat_per_100g: Optional[float] = None
+    fiber_per_100g: Optional[float] = None
 
 
 class ParsedNutrition(BaseModel):
@@ -207,6 +215,174 @@ def _parse_quantity(qty_str: str) -> float:
         return 0
 
 
+# ============ Text Scanner ============
+
+# Patterns run on text lowercased once per page. Case-sensitive patterns that
+# start with a literal let `re` skip ahead with a fast prefix search, unlike
+# re.IGNORECASE or a combined alternation, which are tried at every position.
+# Per field, patterns are in priority order: the first one that matches wins.
+_NUMBER = r"(\d+(?:[.,]\d+)?)"
+_SEP = r"\s*[:,]?\s*"
+
+
+def _regex(pattern: str) -> Callable[[str], Optional[tuple]]:
+    """Scanner returning the groups of the leftmost match."""
+    compiled = re.compile(pattern)
+
+    def scan(text: str) -> Optional[tuple]:
+        match = compiled.search(text)
+        return match.groups() if match else None
+    return scan
+
+
+def _number_before(*keywords: str, optional_prefix: str = "") -> Callable[[str], Optional[tuple]]:
+    r"""
+    Scanner for r"(\d+)\s*(?:<optional_prefix>)?(?:<keyword>|...)".
+
+    Digit-led patterns have no literal prefix, so `re` would try them at every
+    position. Instead find each keyword and read the digits in front of it;
+    the first keyword preceded by a number is also the leftmost match, and
+    across keywords the number that starts first wins.
+    """
+    compiled = [re.compile(keyword) for keyword in keywords]
+
+    def digits_ending_at(text: str, end: int) -> Optional[tuple[int, str]]:
+        while end > 0 and text[end - 1].isspace():
+            end -= 1
+        start = end
+        while start > 0 and text[start - 1].isdecimal():
+            start -= 1
+        return (start, text[start:end]) if start < end else None
+
+    def first_number(text: str, keyword: re.Pattern) -> Optional[tuple[int, str]]:
+        for match in keyword.finditer(text):
+            found = digits_ending_at(text, match.start())
+            if not found and optional_prefix and text.endswith(optional_prefix, 0, match.start()):
+                found = digits_ending_at(text, match.start() - len(optional_prefix))
+            if found:
+                return found
+        return None
+
+    def scan(text: str) -> Optional[tuple]:
+        found = [number for number in (first_number(text, k) for k in compiled) if number]
+        return (min(found)[1],) if found else None
+    return scan
+
+
+_FIELD_SCANNERS = {
+    "kcal": [
+        _regex(rf"energia{_SEP}{_NUMBER}\s*kcal"),  # GialloZafferano: "Energia: 558,7 Kcal"
+        _regex(r"calorie\s+(\d+)"),  # SOSCuisine: "Calorie  610"
+        _number_before(r"calorie[/\s]porzione"),  # "610 calorie/porzione"
+        _number_before(r"cal\b", optional_prefix="k"),  # "610 kcal"
+    ],
+    "protein": [
+        _regex(rf"proteine?\s+{_NUMBER}\s*g"),  # "Proteine  37 g"
+        _regex(rf"protein[ea]?{_SEP}{_NUMBER}\s*g"),
+    ],
+    "carbs": [
+        _regex(rf"carboidrati\s+{_NUMBER}\s*g"),  # "Carboidrati  69 g"
+        _regex(rf"carb[oidrat]*{_SEP}{_NUMBER}\s*g"),
+    ],
+    "fat": [
+        _regex(rf"grassi\s+{_NUMBER}\s*g"),  # "Grassi  21 g"
+        _regex(rf"grass[io]?{_SEP}{_NUMBER}\s*g"),
+    ],
+    "fiber": [
+        _regex(rf"fibre?{_SEP}{_NUMBER}\s*g"),  # "Fibre 7 g" or "Fibre: 2,7 g"
+        _regex(rf"fiber{_SEP}{_NUMBER}\s*g"),
+    ],
+    "weight": [
+        _regex(r"per\s+porzione\s*\((\d+)\s*g\)"),  # "per porzione (460g)"
+        _regex(r"porzione\s*\((\d+)\s*g\)"),  # "porzione (460g)"
+        _regex(r"\((\d+)\s*g\)\s*$"),  # "(460g)" at end of text
+    ],
+    "prep": [
+        _regex(r"tempo\s+di\s+preparazione\s*:?\s*(\d+)\s*(min|minut|h|ore?)"),  # GialloZafferano
+        _regex(r"preparazione\s*:?\s*(\d+)\s*(min|h|ore?)"),  # SOSCuisine
+        _regex(r"prep\s*:?\s*(\d+)\s*(min|h|ore?)"),
+    ],
+    "cook": [
+        _regex(r"tempo\s+di\s+cottura\s*:?\s*(\d+)\s*(min|minut|h|ore?)"),  # GialloZafferano
+        _regex(r"cottura\s*:?\s*(\d+)\s*(min|h|ore?)"),  # SOSCuisine
+        _regex(r"cook\s*:?\s*(\d+)\s*(min|h|ore?)"),
+    ],
+    "servings": [
+        _regex(r"dosi\s+per\s*:?\s*(\d+)\s*person"),  # GialloZafferano: "Dosi per: 4 persone"
+        _number_before(r"porzion", r"serving", r"person[ae]"),  # "4 porzioni", "4 persone"
+        _regex(r"quantità\s*:?\s*(\d+)"),  # SOSCuisine
+    ],
+}
+
+# Checked in order on the lowercased text
+_DIFFICULTY_WORDS = [
+    ("easy", ("molto facile", "very easy", "facile", "easy")),
+    ("medium", ("medio", "medium")),
+    ("hard", ("difficile", "hard")),
+]
+
+
+class TextFacts(NamedTuple):
+    """Everything extracted from one scan of a recipe page or pasted text."""
+    nutrition: ParsedNutrition
+    prep_min: int
+    cook_min: int
+    servings: int
+    difficulty: str
+
+
+def _first_match(field: str, text: str) -> Optional[tuple]:
+    for scan in _FIELD_SCANNERS[field]:
+        groups = scan(text)
+        if groups:
+            return groups
+    return None
+
+
+def _minutes(groups: Optional[tuple]) -> int:
+    if not groups:
+        return 0
+    value = int(groups[0])
+    if groups[1] in ("h", "ore", "ora"):
+        value *= 60
+    return value
+
+
+def scan_recipe_text(text: str) -> TextFacts:
+    """
+    Extract nutrition, prep/cook time, servings and difficulty from page text.
+    Lowercases once and runs the precompiled scanners, instead of the four
+    parse_* functions each rescanning the text case-insensitively.
+    """
+    text = text.lower()
+    nutrition = ParsedNutrition()
+
+    kcal = _first_match("kcal", text)
+    if kcal:
+        nutrition.kcal = int(float(kcal[0].replace(",", ".")))  # "558,7" -> 558
+    for field in ("protein", "carbs", "fat", "fiber"):
+        groups = _first_match(field, text)
+        if groups:
+            setattr(nutrition, field, float(groups[0].replace(",", ".")))
+    weight = _first_match("weight", text)
+    if weight:
+        nutrition.serving_weight_g = int(weight[0])
+
+    servings = _first_match("servings", text)
+    difficulty = next(
+        (level for level, words in _DIFFICULTY_WORDS if any(word in text for word in words)),
+        "easy",
+    )
+
+    return TextFacts(
+        nutrition=nutrition,
+        prep_min=_minutes(_first_match("prep", text)),
+        cook_min=_minutes(_first_match("cook", text)),
+        servings=int(servings[0]) if servings else 4,  # Default
+        difficulty=difficulty,
+    )
+
+
 def parse_nutrition_text(text: str) -> ParsedNutrition:
     """
     Extract nutrition info from text.
@@ -216,80 +392,7 @@ def parse_nutrition_text(text: str) -> ParsedNutrition:
     - "Calorie 610 | Grassi 21g | Carboidrati 69g | Proteine 37g"
     - "Tabella nutrizionale per porzione (460g)"
     """
-    nutrition = ParsedNutrition()
-
-    # Calories - multiple patterns (SOSCuisine + GialloZafferano)
-    kcal_patterns = [
-        r"Energia\s*[:,]?\s*(\d+(?:[.,]\d+)?)\s*[Kk]cal",  # GialloZafferano: "Energia: 558,7 Kcal"
-        r"Calorie\s+(\d+)",  # SOSCuisine: "Calorie  610"
-        r"(\d+)\s*calorie[/\s]porzione",  # "610 calorie/porzione"
-        r"(\d+)\s*(?:kcal|cal)\b",  # "610 kcal"
-    ]
-    for pattern in kcal_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            # Handle decimal comma (e.g., "558,7" -> 558)
-            kcal_str = match.group(1).replace(",", ".")
-            nutrition.kcal = int(float(kcal_str))
-            break
-
-    # Protein - SOSCuisine format: "Proteine  37 g"
-    protein_patterns = [
-        r"Proteine?\s+(\d+(?:[.,]\d+)?)\s*g",  # "Proteine  37 g"
-        r"protein[ea]?\s*[:,]?\s*(\d+(?:[.,]\d+)?)\s*g",
-    ]
-    for pattern in protein_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            nutrition.protein = float(match.group(1).replace(",", "."))
-            break
-
-    # Carbs - SOSCuisine: "Carboidrati  69 g"
-    carbs_patterns = [
-        r"Carboidrati\s+(\d+(?:[.,]\d+)?)\s*g",  # "Carboidrati  69 g"
-        r"carb[oidrat]*\s*[:,]?\s*(\d+(?:[.,]\d+)?)\s*g",
-    ]
-    for pattern in carbs_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            nutrition.carbs = float(match.group(1).replace(",", "."))
-            break
-
-    # Fat - SOSCuisine: "Grassi  21 g"
-    fat_patterns = [
-        r"Grassi\s+(\d+(?:[.,]\d+)?)\s*g",  # "Grassi  21 g"
-        r"grass[io]?\s*[:,]?\s*(\d+(?:[.,]\d+)?)\s*g",
-    ]
-    for pattern in fat_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            nutrition.fat = float(match.group(1).replace(",", "."))
-            break
-
-    # Fiber - SOSCuisine + GialloZafferano: "Fibre 7 g" or "Fibre: 2,7 g"
-    fiber_patterns = [
-        r"Fibre?\s*[:,]?\s*(\d+(?:[.,]\d+)?)\s*g",
-        r"fiber\s*[:,]?\s*(\d+(?:[.,]\d+)?)\s*g",
-    ]
-    for pattern in fiber_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            nutrition.fiber = float(match.group(1).replace(",", "."))
-            break
-
-    # Serving weight - SOSCuisine: "per porzione (460g)" or "Tabella nutrizionale per porzione (460g)"
-    weight_patterns = [
-        r"per\s+porzione\s*\((\d+)\s*g\)",  # "per porzione (460g)"
-        r"porzione\s*\((\d+)\s*g\)",  # "porzione (460g)"
-        r"\((\d+)\s*g\)\s*$",  # "(460g)" at end of line
-    ]
-    for pattern in weight_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            nutrition.serving_weight_g = int(match.group(1))
-            break
-
-    return nutrition
+    return scan_recipe_text(text).nutrition
 
 
 def parse_time_text(text: str) -> tuple[int, int]:
@@ -301,159 +404,83 @@ def parse_time_text(text: str) -> tuple[int, int]:
     - "Preparazione : 30 min Cottura : 4 h"
     - "Prep: 10 min | Cook: 20 min"
     """
-    prep_min = 0
-    cook_min = 0
-
-    # Prep time (SOSCuisine + GialloZafferano)
-    prep_patterns = [
-        r"Tempo\s+di\s+preparazione\s*:?\s*(\d+)\s*(min|minut|h|ore?)",  # GialloZafferano
-        r"Preparazione\s*:?\s*(\d+)\s*(min|h|ore?)",  # SOSCuisine
-        r"Prep\s*:?\s*(\d+)\s*(min|h|ore?)",
-    ]
-    for pattern in prep_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            value = int(match.group(1))
-            unit = match.group(2).lower()
-            if unit in ("h", "ore", "ora"):
-                value *= 60
-            prep_min = value
-            break
-
-    # Cook time (SOSCuisine + GialloZafferano)
-    cook_patterns = [
-        r"Tempo\s+di\s+cottura\s*:?\s*(\d+)\s*(min|minut|h|ore?)",  # GialloZafferano
-        r"Cottura\s*:?\s*(\d+)\s*(min|h|ore?)",  # SOSCuisine
-        r"Cook\s*:?\s*(\d+)\s*(min|h|ore?)",
-    ]
-    for pattern in cook_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            value = int(match.group(1))
-            unit = match.group(2).lower()
-            if unit in ("h", "ore", "ora"):
-                value *= 60
-            cook_min = value
-            break
-
-    return prep_min, cook_min
+    facts = scan_recipe_text(text)
+    return facts.prep_min, facts.cook_min
 
 
 def parse_servings(text: str) -> int:
     """Extract servings count."""
-    patterns = [
-        r"Dosi\s+per\s*:?\s*(\d+)\s*person",  # GialloZafferano: "Dosi per: 4 persone"
-        r"(\d+)\s*(?:porzioni?|servings?|person[ae])",
-        r"Quantità\s*:?\s*(\d+)",  # SOSCuisine
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return int(match.group(1))
-    return 4  # Default
+    return scan_recipe_text(text).servings
 
 
 def parse_difficulty(text: str) -> str:
     """Extract difficulty level."""
-    text_lower = text.lower()
-    if "molto facile" in text_lower or "very easy" in text_lower:
-        return "easy"
-    if "facile" in text_lower or "easy" in text_lower:
-        return "easy"
-    if "medio" in text_lower or "medium" in text_lower:
-        return "medium"
-    if "difficile" in text_lower or "hard" in text_lower:
-        return "hard"
-    return "easy"
+    return scan_recipe_text(text).difficulty
+
+
+# SOSCuisine diet labels found anywhere in the text -> tags
+TAG_KEYWORDS = {
+    "Vegane": "vegan",
+    "Vegetariane": "vegetarian",
+    "Glutine": "gluten-free",
+    "Lattosio": "lactose-free",
+    "Halal": "halal",
+    "Kosher": "kosher",
+    "Diabetiche": "diabetic-friendly",
+}
+
+_ONLY_DIGITS_RE = re.compile(r"^[\d\s]+$")
 
 
 def parse_full_recipe_text(text: str) -> ParsedRecipe:
     """
     Parse a full recipe from pasted text.
     Expects SOSCuisine-style format.
+    Name, URL, ingredient and method sections are read in one pass over the lines.
     """
     lines = text.strip().split("\n")
 
-    # Find recipe name (usually first non-empty line after source)
     name_it = ""
-    for line in lines[:10]:
-        line = line.strip()
-        if line and not line.startswith("http") and "SOSCuisine" not in line:
-            if len(line) > 5 and not re.match(r"^[\d\s]+$", line):
-                name_it = line
-                break
-
-    # Find URL
     source_url = None
-    for line in lines:
-        if "http" in line:
-            source_url = line.strip()
-            break
-
-    # Parse times
-    prep_min, cook_min = parse_time_text(text)
-
-    # Parse servings
-    servings = parse_servings(text)
+    ingredients = []
+    steps = []
+    in_ingredients = False
+    in_method = False
 
-    # Parse difficulty
-    difficulty = parse_difficulty(text)
+    for index, raw_line in enumerate(lines):
+        line = raw_line.strip()
 
-    # Parse nutrition
-    nutrition = parse_nutrition_text(text)
+        # Recipe name: first meaningful line among the first 10, skipping the source
+        if not name_it and index < 10 and line and not line.startswith("http") and "SOSCuisine" not in line:
+            if len(line) > 5 and not _ONLY_DIGITS_RE.match(line):
+                name_it = line
 
-    # Parse ingredients
-    ingredients = []
-    in_ingredients = False
-    for line in lines:
-        line = line.strip()
+        # Source URL: first line mentioning http
+        if source_url is None and "http" in raw_line:
+            source_url = line
 
-        # Detect ingredient section
+        # Ingredients: from "Ingredienti" until "Metodo" / "Prima di"
         if "Ingredienti" in line or "Ingredients" in line:
             in_ingredients = True
-            continue
-
-        # End of ingredients
-        if in_ingredients and ("Metodo" in line or "Method" in line or "Prima di" in line):
+        elif in_ingredients and ("Metodo" in line or "Method" in line or "Prima di" in line):
             in_ingredients = False
-            continue
-
-        if in_ingredients and line:
+        elif in_ingredients and line:
             parsed = parse_ingredient_line(line)
             if parsed and parsed.name:
                 ingredients.append(parsed)
 
-    # Parse steps
-    steps = []
-    in_method = False
-    for line in lines:
-        line = line.strip()
-
+        # Steps: from "Metodo" until "Tabella nutrizionale" / "Osservazioni"
         if "Metodo" in line or "Method" in line:
             in_method = True
-            continue
-
-        if in_method and ("Tabella nutrizionale" in line or "Osservazioni" in line):
+        elif in_method and ("Tabella nutrizionale" in line or "Osservazioni" in line):
             in_method = False
-            continue
-
-        if in_method and line and len(line) > 20:
+        elif in_method and line and len(line) > 20:
             steps.append(line)
 
-    # Parse tags
-    tags = []
-    tag_keywords = {
-        "Vegane": "vegan",
-        "Vegetariane": "vegetarian",
-        "Glutine": "gluten-free",
-        "Lattosio": "lactose-free",
-        "Halal": "halal",
-        "Kosher": "kosher",
-        "Diabetiche": "diabetic-friendly",
-    }
-    for keyword, tag in tag_keywords.items():
-        if keyword in text:
-            tags.append(tag)
+    # Times, servings, difficulty and nutrition from the precompiled scanners, on text lowercased once
+    nutrition, prep_min, cook_min, servings, difficulty = scan_recipe_text(text)
+
+    tags = [tag for keyword, tag in TAG_KEYWORDS.items() if keyword in text]
 
     return ParsedRecipe(
         name_it=name_it,
@@ -467,3 +494,34 @@ def parse_full_recipe_text(text: str) -> ParsedRecipe:
         nutrition=nutrition,
         tags=tags,
     )
+
+
+# ============ Batch Parsing ============
+
+# Lines that separate recipes in a multi-recipe dump: "---", "===" or "END"
+RECIPE_SEPARATOR_RE = re.compile(r"^[ \t]*(?:-{3,}|={3,}|END)[ \t]*$", re.MULTILINE | re.IGNORECASE)
+
+
+def split_recipe_dump(dump: str) -> list[str]:
+    """Split a multi-recipe text dump on separator lines, dropping empty chunks."""
+    return [chunk.strip() for chunk in RECIPE_SEPARATOR_RE.split(dump) if chunk.strip()]
+
+
+def parse_many(texts: Iterable[str], workers: Optional[int] = None) -> Iterator[ParsedRecipe]:
+    """
+    Parse many recipe texts on a process pool, yielding results in input order.
+
+    Parsing is CPU-bound regex work, so it runs in `workers` processes
+    (default: all cores). Small batches or workers=1 parse in-process.
+    """
+    texts = list(texts)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(texts) < 2:
+        yield from map(parse_full_recipe_text, texts)
+        return
+
+    workers = min(workers, len(texts))
+    # A few chunks per worker keeps IPC overhead low while still balancing load
+    chunksize = max(1, len(texts) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(parse_full_recipe_text, texts, chunksize=chunksize)
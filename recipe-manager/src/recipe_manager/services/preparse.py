@@ -0,0 +1,215 @@
+"""
+Deterministic pre-parse of raw recipe text before it is sent to Gemini.
+Drops page boilerplate (menus, cookie banners, share buttons, comments),
+cuts the text into ingredient / method / nutrition sections and builds a
+compact draft for the LLM to complete and translate.
+"""
+import re
+from typing import NamedTuple
+
+from .parser import TAG_KEYWORDS, parse_full_recipe_text, parse_ingredient_line, scan_recipe_text
+
+# Section headings: short lines starting with one of these words (no digits, so
+# "Preparazione: 20 min" stays a fact line, not the start of the method)
+_INGREDIENTS_RE = re.compile(r"^(ingredienti|ingredients)\b[^\d]{0,40}:?$", re.IGNORECASE)
+_METHOD_RE = re.compile(
+    r"^(metodo|method|procedimento|preparazione|istruzioni|instructions|directions|come (si )?prepar\w*)\b[^\d]{0,40}:?$",
+    re.IGNORECASE,
+)
+_NUTRITION_RE = re.compile(
+    r"^(tabella nutrizionale|valori nutrizionali|informazioni nutrizionali|nutrition(al)?( facts| information)?)\b.{0,40}$",
+    re.IGNORECASE,
+)
+_END_RE = re.compile(
+    r"^(osservazioni|consigli|conservazione|commenti|comments|ti potrebbe(ro)? (anche )?interessare"
+    r"|potrebbe interessarti|ricette correlate|related recipes|leggi anche|scopri anche|altre ricette"
+    r"|privacy policy|cookie policy)\b",
+    re.IGNORECASE,
+)
+# Page chrome outside the recipe sections: short button / link lines, matched as a whole line...
+_BOILERPLATE_RE = re.compile(
+    r"^(condividi|share|stampa|print|salva|save|pin|tweet|invia|email|iscriviti|registrati|accedi|log ?in|sign ?(up|in)"
+    r"|vai a|leggi di più|mostra (di )?più|pubblicità|advertisement|sponsor\w*|privacy( policy)?|cookie policy"
+    r"|facebook|instagram|pinterest|whatsapp|twitter|youtube|tiktok)\b[^\d]{0,40}$",
+    re.IGNORECASE,
+)
+# ...and cookie / consent banners and copyright footers, which are long but unmistakable
+_BANNER_RE = re.compile(
+    r"\b(utilizza(mo)?|usa(no)?|uses?|we use) (i )?cookie|cookie (policy|settings|banner)|privacy policy"
+    r"|newsletter|©|copyright|tutti i diritti riservati|all rights reserved",
+    re.IGNORECASE,
+)
+_BREADCRUMB_RE = re.compile(r"^[^>»›]+(\s[>»›]\s[^>»›]+)+$")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+_STEP_LABEL_RE = re.compile(r"^(passo|passaggio|step|fase)?\s*\d+[.):]?$", re.IGNORECASE)
+_URL_RE = re.compile(r"^\S*https?://\S+$")
+_BULLET_RE = re.compile(r"^[-•*·]\s*")
+# Left on names by parse_ingredient_line: "200 g di farina" -> "di farina", "sale q.b."
+_NAME_NOISE_RE = re.compile(r"^(di|d'|del|della|dei|degli|delle)\s*|\s*\bq\s*\.?\s*b\b\.?", re.IGNORECASE)
+
+# Runs of this many consecutive short lines outside a section are navigation menus
+_MENU_RUN = 3
+_MENU_LINE_WORDS = 3
+_TITLE_MAX_CHARS = 120  # Longer "titles" are intro paragraphs; the LLM names the recipe itself
+_DESCRIPTION_MIN_CHARS = 60
+_DESCRIPTION_SENTENCES = 2  # The LLM only writes a 1-2 sentence description
+_DESCRIPTION_MAX_CHARS = 300
+_NUTRITION_MAX_LINES = 12
+
+DRAFT_HEADER = "RECIPE DRAFT (extracted from the source page; complete the missing fields and translate)"
+
+
+class PreparsedText(NamedTuple):
+    """What is sent to the LLM, and how much of the recipe was found deterministically."""
+    text: str
+    structured: bool  # False: ingredient or method section not found, text is only cleaned
+    ingredients: int
+    steps: int
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough Gemini token count (about 4 characters per token); offline stand-in for count_tokens."""
+    return (len(text) + 3) // 4
+
+
+def _is_menu_line(line: str) -> bool:
+    return len(line.split()) <= _MENU_LINE_WORDS and not any(c.isdigit() for c in line) and "http" not in line
+
+
+def _drop_menu_runs(lines: list[str]) -> list[str]:
+    """
+    Remove runs of consecutive short, digit-free lines (navigation, category lists).
+    A line at either end of a run with more words than every other line of the
+    run is kept: that is the recipe title next to the menu ("Home", "Dolci",
+    "Crostata di frutta").
+    """
+    kept, run = [], []
+    for line in lines + [""]:
+        if line and _is_menu_line(line):
+            run.append(line)
+            continue
+        if len(run) < _MENU_RUN:
+            kept.extend(run)
+        else:
+            words = [len(item.split()) for item in run]
+            if words[0] > max(words[1:]):
+                kept.append(run[0])
+            if words[-1] > max(words[:-1]):
+                kept.append(run[-1])
+        run = []
+        if line:
+            kept.append(line)
+    return kept
+
+
+def _split_sections(text: str) -> tuple[list[str], list[str], list[str], list[str]]:
+    """
+    One pass over the lines: (preamble, ingredients, method, nutrition).
+    Boilerplate, breadcrumbs and repeated lines are only dropped outside the
+    ingredient and method sections: a recipe can list "2 uova" under both
+    "Per la frolla" and "Per la crema", and its steps can mention cookies.
+    """
+    preamble, ingredients, method, nutrition = [], [], [], []
+    section = preamble
+    seen = set()
+    for raw_line in text.splitlines():
+        line = " ".join(raw_line.split())
+        if not line:
+            continue
+
+        if _INGREDIENTS_RE.match(line):
+            section = ingredients
+        elif _METHOD_RE.match(line):
+            section = method
+        elif _NUTRITION_RE.match(line):
+            section = nutrition
+        elif _END_RE.match(line):
+            section = None
+        elif section is None:
+            continue
+        elif section is ingredients:
+            section.append(line)
+        elif section is method:
+            if not _STEP_LABEL_RE.match(line) and not _URL_RE.match(line):
+                section.append(line)
+        elif line.lower() in seen or _BOILERPLATE_RE.match(line) or _BANNER_RE.search(line):
+            continue
+        elif _BREADCRUMB_RE.match(line) or (_URL_RE.match(line) and section is not preamble):
+            continue
+        else:
+            seen.add(line.lower())
+            section.append(line)
+    return _drop_menu_runs(preamble), ingredients, method, nutrition
+
+
+def preparse_recipe_text(text: str) -> PreparsedText:
+    """
+    Reduce raw recipe text to a compact draft for the LLM.
+
+    Title, source, servings, times, difficulty, tags and nutrition come from
+    the deterministic parser; ingredient and method lines are passed through
+    verbatim. If either section is missing, or the draft would not be
+    shorter, the cleaned text is returned instead.
+    """
+    preamble, ingredients, method, nutrition = _split_sections(text)
+    kept_text = "\n".join(
+        preamble
+        + (["Ingredients:"] + ingredients if ingredients else [])
+        + (["Method:"] + method if method else [])
+        + (["Nutrition:"] + nutrition if nutrition else [])
+    )
+
+    if not ingredients or not method:
+        return PreparsedText(kept_text, False, len(ingredients), len(method))
+
+    recipe = parse_full_recipe_text("\n".join(preamble))
+    facts = scan_recipe_text(kept_text)
+    tags = [tag for keyword, tag in TAG_KEYWORDS.items() if keyword in kept_text]
+    description = next(
+        (line for line in preamble if len(line) >= _DESCRIPTION_MIN_CHARS and line != recipe.name_it and "http" not in line),
+        None,
+    )
+
+    draft = [DRAFT_HEADER]
+    if recipe.name_it and len(recipe.name_it) <= _TITLE_MAX_CHARS:
+        draft.append(f"Title: {recipe.name_it}")
+    if recipe.source_url:
+        draft.append(f"Source: {recipe.source_url}")
+    draft.append(
+        f"Servings: {facts.servings} | Prep: {facts.prep_min} min | Cook: {facts.cook_min} min"
+        f" | Difficulty: {facts.difficulty}"
+    )
+    if tags:
+        draft.append(f"Tags: {', '.join(tags)}")
+    if description:
+        sentences = _SENTENCE_END_RE.split(description)[:_DESCRIPTION_SENTENCES]
+        draft.append(f"Description: {' '.join(sentences)[:_DESCRIPTION_MAX_CHARS]}")
+    nut = facts.nutrition
+    if nut.kcal:
+        values = [f"kcal {nut.kcal}"] + [
+            f"{label} {value:g} g"
+            for label, value in (("protein", nut.protein), ("carbs", nut.carbs), ("fat", nut.fat), ("fiber", nut.fiber))
+            if value
+        ]
+        if nut.serving_weight_g:
+            values.append(f"serving {nut.serving_weight_g} g")
+        draft.append(f"Nutrition per serving (source): {', '.join(values)}")
+    elif nutrition:
+        draft.append("Nutrition (source):")
+        draft.extend(nutrition[:_NUTRITION_MAX_LINES])
+    draft.append("Ingredients:")
+    draft.extend(f"- {line}" for line in ingredients)
+    draft.append("Method:")
+    draft.extend(f"{i}. {line}" for i, line in enumerate(method, 1))
+
+    draft_text = "\n".join(draft)
+    # Short, clean inputs can be smaller than the draft with its labels
+    return PreparsedText(min(draft_text, kept_text, key=len), True, len(ingredients), len(method))
+
+
+def ingredient_names(text: str) -> list[str]:
+    """Names in the ingredient section of a raw text or draft, parsed locally (quantities, units, "q.b." dropped)."""
+    _, ingredients, _, _ = _split_sections(text)
+    parsed = (parse_ingredient_line(_BULLET_RE.sub("", line)) for line in ingredients)
+    names = (_NAME_NOISE_RE.sub("", ing.name).strip() for ing in parsed if ing)
+    return [name for name in names if name]
@@ -5,46 +5,85 @@ Extracts recipe data from supported sites.
 import httpx
 import re
 from typing import Optional
-from bs4 import BeautifulSoup
 
+from .html_doc import HtmlDocument
+from .jsonld import find_recipe_json_ld, is_type
+from .page_cache import PageCache
 from .parser import (
     ParsedRecipe,
-    ParsedIngredient,
     ParsedNutrition,
     parse_ingredient_line,
-    parse_nutrition_text,
-    parse_time_text,
-    parse_servings,
-    parse_difficulty,
+    scan_recipe_text,
 )
 
+# Name given to pages without a title; importers treat such results as "no recipe found"
+UNKNOWN_RECIPE_NAME = "Unknown Recipe"
 
-async def scrape_url(url: str) -> Optional[ParsedRecipe]:
+
+async def scrape_url(
+    url: str, client: Optional[httpx.AsyncClient] = None, cache: Optional[PageCache] = None
+) -> Optional[ParsedRecipe]:
     """
     Scrape a recipe from a supported URL.
     Auto-detects the site and uses appropriate parser.
+    Pass a shared client to reuse pooled connections, and a page cache
+    to revalidate previously fetched pages instead of downloading them.
     """
     if "soscuisine.com" in url:
-        return await scrape_soscuisine(url)
+        return await scrape_soscuisine(url, client, cache)
     elif "giallozafferano" in url:
-        return await scrape_giallozafferano(url)
+        return await scrape_giallozafferano(url, client, cache)
     else:
         # Try generic scraping
-        return await scrape_generic(url)
+        return await scrape_generic(url, client, cache)
+
 
+def parse_recipe_html(url: str, html: str, backend: Optional[str] = None) -> ParsedRecipe:
+    """
+    Parse an already fetched page with the parser for its site.
+    Used to re-scrape cached HTML without any network access.
+    """
+    if "soscuisine.com" in url:
+        return parse_soscuisine(HtmlDocument(html, backend), url)
+    elif "giallozafferano" in url:
+        return parse_giallozafferano(HtmlDocument(html, backend), url)
+    return parse_generic(html, url, backend)
 
-async def fetch_html(url: str) -> str:
-    """Fetch HTML content from URL."""
+
+async def fetch_html(
+    url: str, client: Optional[httpx.AsyncClient] = None, cache: Optional[PageCache] = None
+) -> str:
+    """
+    Fetch HTML content from URL, through the shared client if given.
+    With a cache, a known page is requested conditionally and a 304 reuses the stored body.
+    """
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
     }
-    async with httpx.AsyncClient(follow_redirects=True) as client:
-        response = await client.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        return response.text
-
-
-async def scrape_soscuisine(url: str) -> ParsedRecipe:
+    if client is None:
+        async with httpx.AsyncClient(follow_redirects=True) as own_client:
+            return await fetch_html(url, own_client, cache)
+
+    cached = cache.get(url) if cache else None
+    if cached:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+    response = await client.get(url, headers=headers, timeout=30)
+    if cached and response.status_code == 304:
+        cache.touch(url)
+        return cached.body
+    response.raise_for_status()
+    if cache:
+        cache.set(url, response.text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return response.text
+
+
+async def scrape_soscuisine(
+    url: str, client: Optional[httpx.AsyncClient] = None, cache: Optional[PageCache] = None
+) -> ParsedRecipe:
     """
     Scrape recipe from SOSCuisine.
 
@@ -53,18 +92,17 @@ async def scrape_soscuisine(url: str) -> ParsedRecipe:
     - Ingredients in .recipe-ingredients or similar
     - Nutrition in .nutrition-facts
     """
-    html = await fetch_html(url)
-    soup = BeautifulSoup(html, "html.parser")
+    return parse_soscuisine(HtmlDocument(await fetch_html(url, client, cache)), url)
 
+
+def parse_soscuisine(doc: HtmlDocument, url: str) -> ParsedRecipe:
+    """Extract a recipe from a parsed SOSCuisine page."""
     # Title
-    title_elem = soup.find("h1")
-    name_it = title_elem.get_text(strip=True) if title_elem else "Unknown Recipe"
+    name_it = doc.first_text("h1") or UNKNOWN_RECIPE_NAME
 
     # Meta info
-    page_text = soup.get_text()
-    prep_min, cook_min = parse_time_text(page_text)
-    servings = parse_servings(page_text)
-    difficulty = parse_difficulty(page_text)
+    page_text = doc.page_text
+    nutrition, prep_min, cook_min, servings, difficulty = scan_recipe_text(page_text)
 
     # Ingredients
     ingredients = []
@@ -78,10 +116,9 @@ async def scrape_soscuisine(url: str) -> ParsedRecipe:
     ]
 
     for selector in ingredient_selectors:
-        items = soup.select(selector)
+        items = doc.select_texts(selector)
         if items:
-            for item in items:
-                text = item.get_text(strip=True)
+            for text in items:
                 parsed = parse_ingredient_line(text)
                 if parsed:
                     ingredients.append(parsed)
@@ -90,7 +127,7 @@ async def scrape_soscuisine(url: str) -> ParsedRecipe:
     # If no structured ingredients found, try parsing from text
     if not ingredients:
         # Look for text between "Ingredienti" and "Metodo"
-        text = soup.get_text()
+        text = page_text
         if "Ingredienti" in text:
             start = text.find("Ingredienti")
             end = text.find("Metodo", start) or text.find("Prima di", start) or len(text)
@@ -102,9 +139,6 @@ async def scrape_soscuisine(url: str) -> ParsedRecipe:
                     if parsed and parsed.name and "Ingredienti" not in parsed.name:
                         ingredients.append(parsed)
 
-    # Nutrition
-    nutrition = parse_nutrition_text(page_text)
-
     # Steps
     steps = []
     step_selectors = [
@@ -115,17 +149,16 @@ async def scrape_soscuisine(url: str) -> ParsedRecipe:
     ]
 
     for selector in step_selectors:
-        items = soup.select(selector)
+        items = doc.select_texts(selector)
         if items:
-            for item in items:
-                text = item.get_text(strip=True)
+            for text in items:
                 if text and len(text) > 20:
                     steps.append(text)
             break
 
     # If no structured steps, parse from text
     if not steps:
-        text = soup.get_text()
+        text = page_text
         if "Metodo" in text:
             start = text.find("Metodo")
             end = text.find("Tabella nutrizionale", start) or text.find("Osservazioni", start) or len(text)
@@ -163,35 +196,30 @@ async def scrape_soscuisine(url: str) -> ParsedRecipe:
     )
 
 
-async def scrape_giallozafferano(url: str) -> ParsedRecipe:
+async def scrape_giallozafferano(
+    url: str, client: Optional[httpx.AsyncClient] = None, cache: Optional[PageCache] = None
+) -> ParsedRecipe:
     """Scrape recipe from GialloZafferano."""
-    html = await fetch_html(url)
-    soup = BeautifulSoup(html, "html.parser")
+    return parse_giallozafferano(HtmlDocument(await fetch_html(url, client, cache)), url)
 
+
+def parse_giallozafferano(doc: HtmlDocument, url: str) -> ParsedRecipe:
+    """Extract a recipe from a parsed GialloZafferano page."""
     # Title
-    title_elem = soup.find("h1")
-    name_it = title_elem.get_text(strip=True) if title_elem else "Unknown Recipe"
+    name_it = doc.first_text("h1") or UNKNOWN_RECIPE_NAME
 
-    page_text = soup.get_text()
-    prep_min, cook_min = parse_time_text(page_text)
-    servings = parse_servings(page_text)
-    difficulty = parse_difficulty(page_text)
+    nutrition, prep_min, cook_min, servings, difficulty = scan_recipe_text(doc.page_text)
 
     # Ingredients
     ingredients = []
-    for item in soup.select(".gz-ingredient"):
-        text = item.get_text(strip=True)
+    for text in doc.select_texts(".gz-ingredient"):
         parsed = parse_ingredient_line(text)
         if parsed:
             ingredients.append(parsed)
 
-    # Nutrition
-    nutrition = parse_nutrition_text(page_text)
-
     # Steps
     steps = []
-    for step in soup.select(".gz-content-recipe-step"):
-        text = step.get_text(strip=True)
+    for text in doc.select_texts(".gz-content-recipe-step"):
         if text:
             steps.append(text)
 
@@ -208,37 +236,30 @@ async def scrape_giallozafferano(url: str) -> ParsedRecipe:
     )
 
 
-async def scrape_generic(url: str) -> ParsedRecipe:
+async def scrape_generic(
+    url: str, client: Optional[httpx.AsyncClient] = None, cache: Optional[PageCache] = None
+) -> ParsedRecipe:
     """
     Generic scraping using JSON-LD schema.org Recipe format.
     Many modern recipe sites use this standard.
     """
-    import json
-
-    html = await fetch_html(url)
-    soup = BeautifulSoup(html, "html.parser")
-
-    # Look for JSON-LD Recipe schema
-    for script in soup.find_all("script", type="application/ld+json"):
-        try:
-            data = json.loads(script.string)
+    return parse_generic(await fetch_html(url, client, cache), url)
 
-            # Handle array of schemas
-            if isinstance(data, list):
-                for item in data:
-                    if item.get("@type") == "Recipe":
-                        data = item
-                        break
 
-            if data.get("@type") == "Recipe":
-                return _parse_jsonld_recipe(data, url)
-        except (json.JSONDecodeError, KeyError):
-            continue
+def parse_generic(html: str, url: str, backend: Optional[str] = None) -> ParsedRecipe:
+    """
+    Extract a recipe from a page's JSON-LD (including @graph documents).
+    The raw HTML is scanned for the Recipe node first; the page is parsed
+    into a DOM only when there is none, to fall back to its title.
+    """
+    data = find_recipe_json_ld(html)
+    if data is not None:
+        return _parse_jsonld_recipe(data, url)
 
     # Fallback: basic HTML parsing
-    title = soup.find("h1")
+    doc = HtmlDocument(html, backend)
     return ParsedRecipe(
-        name_it=title.get_text(strip=True) if title else "Unknown Recipe",
+        name_it=doc.first_text("h1") or UNKNOWN_RECIPE_NAME,
         source_url=url,
     )
 
@@ -287,6 +308,12 @@ def _parse_jsonld_recipe(data: dict, url: str) -> ParsedRecipe:
         for step in instructions:
             if isinstance(step, str):
                 steps.append(step)
+            elif is_type(step, "HowToSection"):
+                # Grouped steps ("For the sauce", ...), common in @graph documents
+                steps.extend(
+                    item.get("text", "") if isinstance(item, dict) else str(item)
+                    for item in step.get("itemListElement", [])
+                )
             elif isinstance(step, dict):
                 steps.append(step.get("text", ""))
 
@@ -307,7 +334,7 @@ def _parse_jsonld_recipe(data: dict, url: str) -> ParsedRecipe:
         nutrition.fiber = extract_number(nut_data.get("fiberContent")) or None
 
     return ParsedRecipe(
-        name_it=data.get("name", "Unknown Recipe"),
+        name_it=data.get("name") or UNKNOWN_RECIPE_NAME,
         source_url=url,
         servings=servings,
         prep_time_min=prep_min,
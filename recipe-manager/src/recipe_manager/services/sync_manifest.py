@@ -0,0 +1,56 @@
+"""
+Sync manifest for incremental JSON -> Turso syncs.
+Remembers, per slug, the content hash and recipe ID last written to a given DB.
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional
+
+MANIFEST_NAME = ".sync_manifest"  # no .json suffix, so *.json globs skip it
+
+
+def content_hash(data: dict) -> str:
+    """Hash a recipe document independently of key order and formatting."""
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SyncManifest:
+    """Slug -> {file, hash, id} map stored next to the synced JSON files."""
+
+    def __init__(self, path: Path, db_url: Optional[str]):
+        self.path = path
+        self.db_url = db_url
+        self.entries: dict[str, dict] = {}
+
+    @classmethod
+    def load(cls, directory: Path, db_url: Optional[str]) -> "SyncManifest":
+        """Load the manifest for a directory; a manifest for another DB is ignored."""
+        manifest = cls(directory / MANIFEST_NAME, db_url)
+        if manifest.path.exists():
+            try:
+                data = json.loads(manifest.path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                return manifest
+            if data.get("db_url") == db_url:
+                manifest.entries = data.get("recipes", {})
+        return manifest
+
+    def get(self, slug: str) -> Optional[dict]:
+        return self.entries.get(slug)
+
+    def record(self, slug: str, file_name: str, hash: str, recipe_id: str) -> None:
+        self.entries[slug] = {"file": file_name, "hash": hash, "id": recipe_id}
+
+    def forget(self, slug: str) -> None:
+        self.entries.pop(slug, None)
+
+    def save(self) -> None:
+        """Write the manifest atomically (write to temp file, then rename)."""
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps({"db_url": self.db_url, "recipes": self.entries}, indent=2, sort_keys=True),
+            encoding="utf-8",
+        )
+        tmp_path.replace(self.path)
@@ -0,0 +1,273 @@
+"""
+Persistent Italian <-> English ingredient name dictionary.
+Filled from Gemini results, legacy DB name pairs and manual corrections,
+and consulted before any LLM request, so a name such as
+"olio extravergine d'oliva" is translated once, not once per recipe.
+"""
+import itertools
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+from ..config.settings import Config
+from .usda_matcher import STOPWORDS, agrees_with_dictionary, clean_name
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    key TEXT PRIMARY KEY,
+    name_it TEXT NOT NULL,
+    name_en TEXT NOT NULL,
+    source TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# Elided articles and prepositions ("all'uovo", "dell'orto") that STOPWORDS leaves alone
+_ELIDED = frozenset("all dall dell nell sull un".split())
+
+# A translation only replaces one from a lower-ranked source; manual corrections replace each other
+SOURCE_RANK = {"legacy": 0, "llm": 1, "manual": 2}
+
+
+class Translation(NamedTuple):
+    name_it: str
+    name_en: str
+    source: str  # "legacy", "llm" or "manual"
+
+
+# Regular Italian plurals, singular ending -> plural endings (pomodoro/pomodori, fungo/funghi,
+# formaggio/formaggi, pesca/pesche, mela/mele, arancia/arance, pesce/pesci)
+_PLURAL_ENDINGS = (
+    ("cio", ("ci",)), ("gio", ("gi",)), ("io", ("i",)), ("co", ("chi", "ci")), ("go", ("ghi",)), ("o", ("i",)),
+    ("cia", ("ce", "cie")), ("gia", ("ge", "gie")), ("ca", ("che",)), ("ga", ("ghe",)), ("a", ("e",)),
+    ("e", ("i",)),
+)
+# Combined variants tried per lookup are capped, words beyond this count keep their form
+_MAX_INFLECTED_WORDS = 4
+
+
+def _number_variants(word: str) -> set[str]:
+    """
+    Candidate forms of an Italian word in the other grammatical number: its
+    regular plurals if it is a singular, and the singulars it would be the
+    regular plural of. Without a lexicon the word's own number is unknown, so
+    the candidates include non-words ("limone" also gives "limona", "carote"
+    gives "caroti", "pelati" gives "pelatio"). They only serve to find names
+    already stored, where a non-word never matches; a reverse candidate must
+    take the word back under its own rule, so "pesce" does not give "pesca"
+    (whose plural is "pesche").
+    """
+    if len(word) <= 3 or word.isdigit():
+        return set()
+    variants = set()
+    singular = next(((end, plurals) for end, plurals in _PLURAL_ENDINGS if word.endswith(end)), None)
+    if singular:
+        end, plurals = singular
+        variants.update(word[:-len(end)] + plural for plural in plurals)
+    for end, plurals in _PLURAL_ENDINGS:
+        for plural in plurals:
+            if word.endswith(plural):
+                candidate = word[:-len(plural)] + end
+                # Only the ending rule that really applies to the singular counts
+                if next(e for e, _ in _PLURAL_ENDINGS if candidate.endswith(e)) == end:
+                    variants.add(candidate)
+    variants.discard(word)
+    return variants
+
+
+def translation_key(name: str) -> str:
+    """
+    Dictionary key of an Italian name: notes in parentheses and "q.b." stripped,
+    accents, punctuation, articles and prepositions dropped
+    ("Olio extravergine d'oliva q.b." -> "olio extravergine oliva"). Numbers
+    stay: "farina 0" and "farina 00" are different flours.
+    """
+    return " ".join(word for word in clean_name(name).split() if word not in STOPWORDS and word not in _ELIDED)
+
+
+def inflected_keys(key: str) -> list[str]:
+    """Keys of the same name with words in the other number ("pomodori pelati" -> "pomodoro pelato", ...)."""
+    words = key.split()
+    options = [
+        [word, *sorted(_number_variants(word))] if i < _MAX_INFLECTED_WORDS else [word]
+        for i, word in enumerate(words)
+    ]
+    return [" ".join(combo) for combo in itertools.product(*options)][1:]
+
+
+class TranslationCache:
+    """
+    SQLite-backed ingredient dictionary, read into memory on first use.
+
+    Lookups try the exact key, then the same name with words switched between
+    singular and plural by the regular rules, when exactly one stored name
+    matches that way. New entries are written on flush()/close() together
+    with the hit/miss counters.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or Config.TRANSLATION_CACHE_PATH)
+        self.hits = 0
+        self.misses = 0
+        self._entries: Optional[dict[str, Translation]] = None
+        self._pending: dict[str, Translation] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _load(self) -> dict[str, Translation]:
+        if self._entries is None:
+            self._entries = {}
+            for key, name_it, name_en, source in self._connect().execute(
+                "SELECT key, name_it, name_en, source FROM translations"
+            ):
+                self._entries[key] = Translation(name_it, name_en, source)
+        return self._entries
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def _find(self, name: str, inflected: bool) -> Optional[Translation]:
+        entries = self._load()
+        key = translation_key(name)
+        entry = entries.get(key)
+        if entry is None and key and inflected:
+            # Two stored names reachable this way are ambiguous: no match
+            matches = {k for k in inflected_keys(key) if k in entries}
+            entry = entries[matches.pop()] if len(matches) == 1 else None
+        return entry
+
+    def get(self, name: str, inflected: bool = True) -> Optional[Translation]:
+        """
+        Known translation of an Italian name, or None (counted as a miss).
+        With inflected=False only the exact key is looked up.
+        """
+        entry = self._find(name, inflected)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def known(self, names: Iterable[str]) -> list[str]:
+        """The distinct names get() would translate, without counting hits or misses."""
+        return [name for name in dict.fromkeys(names) if self._find(name, inflected=True) is not None]
+
+    def learn(self, name_it: str, name_en: str, source: str = "llm") -> bool:
+        """
+        Record a translation. Returns False when it was ignored: empty names,
+        a known name whose translation came from a higher-ranked source, or a
+        legacy pair the word dictionary contradicts (the legacy English lists
+        are sometimes paired out of order).
+        """
+        key = translation_key(name_it)
+        name_en = " ".join((name_en or "").split())
+        if not key or not name_en:
+            return False
+        if source == "legacy" and not agrees_with_dictionary(name_it, name_en):
+            return False
+        entries = self._load()
+        known = entries.get(key)
+        if known is not None:
+            rank, known_rank = SOURCE_RANK[source], SOURCE_RANK[known.source]
+            if rank < known_rank:
+                return False
+            # Same rank: the first translation stays, so names stay consistent across recipes
+            if rank == known_rank and (source != "manual" or known.name_en == name_en):
+                return False
+        entry = Translation(" ".join(name_it.split()), name_en, source)
+        entries[key] = entry
+        self._pending[key] = entry
+        return True
+
+    def learn_many(self, pairs: Iterable[tuple[str, str]], source: str = "llm") -> int:
+        """learn() every (name_it, name_en) pair; returns how many were recorded."""
+        return sum(self.learn(name_it, name_en, source) for name_it, name_en in pairs)
+
+    def learn_recipe(self, recipe, source: str = "llm") -> int:
+        """Record the ingredient names of a ParsedRecipe that carry an English name."""
+        return self.learn_many(
+            ((ing.name_it or ing.name, ing.name_en) for ing in recipe.ingredients if ing.name_en),
+            source,
+        )
+
+    def apply(self, recipe) -> list[str]:
+        """
+        Set name_en on the ingredients of a ParsedRecipe from the dictionary.
+        An exact match wins over the English name the recipe came with; a
+        singular/plural match only fills names the recipe does not have.
+        Returns the distinct names still without an English name.
+        """
+        unseen = {}
+        for ing in recipe.ingredients:
+            name = ing.name_it or ing.name
+            entry = self.get(name, inflected=not ing.name_en)
+            if entry is not None:
+                ing.name_en = entry.name_en
+            elif not ing.name_en and translation_key(name):
+                unseen.setdefault(translation_key(name), name)
+        return list(unseen.values())
+
+    def flush(self) -> None:
+        """Persist new translations and hit/miss counters."""
+        if not self._pending and not (self.hits or self.misses):
+            return
+        conn = self._connect()
+        now = time.time()
+        conn.executemany(
+            "INSERT OR REPLACE INTO translations (key, name_it, name_en, source, updated_at) VALUES (?, ?, ?, ?, ?)",
+            [(key, *entry, now) for key, entry in self._pending.items()],
+        )
+        self._pending.clear()
+        conn.executemany(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            [("hits", self.hits), ("misses", self.misses)],
+        )
+        self.hits = self.misses = 0
+        conn.commit()
+
+    def close(self) -> None:
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def clear(self) -> int:
+        """Delete every translation, manual corrections included, and reset counters. Returns entries removed."""
+        conn = self._connect()
+        (count,) = conn.execute("SELECT COUNT(*) FROM translations").fetchone()
+        conn.execute("DELETE FROM translations")
+        conn.execute("DELETE FROM counters")
+        conn.commit()
+        self._entries = None
+        self._pending.clear()
+        self.hits = self.misses = 0
+        return count
+
+    def stats(self) -> dict:
+        """Entries per source, file size and lifetime hit/miss counters."""
+        self.flush()
+        conn = self._connect()
+        sources = dict(conn.execute("SELECT source, COUNT(*) FROM translations GROUP BY source").fetchall())
+        counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        return {
+            "path": str(self.path),
+            "entries": sum(sources.values()),
+            "sources": sources,
+            "size_bytes": self.path.stat().st_size if self.path.exists() else 0,
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+        }
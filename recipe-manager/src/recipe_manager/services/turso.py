@@ -9,6 +9,121 @@ from uuid import UUID
 from ..config.settings import Config
 
 
+# Column order for the INSERT statements built by TursoClient.
+# Timestamp columns are filled server-side with the current epoch millis.
+TABLE_COLUMNS = {
+    "ingredients": (
+        "id", "usda_fdc_id", "name_it", "name_en", "category",
+        "kcal_per_100g", "protein_per_100g", "carbs_per_100g",
+        "fat_per_100g", "fiber_per_100g", "cooked_weight_factor",
+        "default_unit",
+    ),
+    "recipes": (
+        "id", "name_it", "name_en", "slug", "description_it", "description_en",
+        "category", "image_url", "prep_time_min", "cook_time_min", "total_time_min",
+        "servings", "difficulty", "kcal_per_100g", "kcal_per_serving",
+        "protein_per_100g", "carbs_per_100g", "fat_per_100g", "fiber_per_100g",
+        "serving_weight_g", "protein_source", "is_published",
+    ),
+    "recipe_ingredients": (
+        "id", "recipe_id", "ingredient_id", "quantity", "unit",
+        "is_optional", "notes_it", "notes_en", "order", "cooking_factor",
+    ),
+    "recipe_steps": (
+        "id", "recipe_id", "step_number", "instruction_it", "instruction_en", "image_url",
+    ),
+}
+TIMESTAMP_COLUMNS = {
+    "ingredients": ("created_at",),
+    "recipes": ("created_at", "updated_at"),
+}
+NOW_MS = "strftime('%s', 'now') * 1000"
+
+# SQLite's historical SQLITE_MAX_VARIABLE_NUMBER default; newer builds allow
+# more, but staying under 999 keeps multi-row INSERTs portable.
+MAX_SQL_PARAMS = 999
+
+
+def _to_arg(value: Any) -> Any:
+    """Convert Python values to libSQL-compatible arguments."""
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, bool):
+        return 1 if value else 0
+    return value
+
+
+def insert_statements(
+    table: str, rows: list[dict], max_params: int = MAX_SQL_PARAMS
+) -> list[tuple[str, list]]:
+    """
+    Build multi-row INSERT statements for one of the TABLE_COLUMNS tables.
+    Rows are chunked so each statement stays under max_params placeholders.
+    """
+    columns = TABLE_COLUMNS[table]
+    timestamps = TIMESTAMP_COLUMNS.get(table, ())
+    names = ", ".join(f'"{c}"' for c in columns + timestamps)
+    row_sql = "(" + ", ".join(["?"] * len(columns) + [NOW_MS] * len(timestamps)) + ")"
+    chunk_size = max(1, max_params // len(columns))
+
+    statements = []
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        sql = f"INSERT INTO {table} ({names}) VALUES " + ", ".join([row_sql] * len(chunk))
+        params = [_to_arg(row[c]) for row in chunk for c in columns]
+        statements.append((sql, params))
+    return statements
+
+
+def insert_statement(table: str, row: dict) -> tuple[str, list]:
+    """Build a single-row INSERT statement for one of the TABLE_COLUMNS tables."""
+    return insert_statements(table, [row])[0]
+
+
+def update_statement(table: str, row: dict) -> tuple[str, list]:
+    """Build an UPDATE ... WHERE id = ? statement, bumping updated_at if present."""
+    columns = [c for c in TABLE_COLUMNS[table] if c != "id"]
+    assignments = [f'"{c}" = ?' for c in columns]
+    if "updated_at" in TIMESTAMP_COLUMNS.get(table, ()):
+        assignments.append(f'"updated_at" = {NOW_MS}')
+    sql = f"UPDATE {table} SET {', '.join(assignments)} WHERE id = ?"
+    return sql, [_to_arg(row[c]) for c in columns] + [_to_arg(row["id"])]
+
+
+def set_columns_statement(table: str, row: dict) -> tuple[str, list]:
+    """UPDATE only the columns present in row (plus updated_at if the table has it) WHERE id = row["id"]."""
+    columns = [c for c in row if c != "id"]
+    assignments = [f'"{c}" = ?' for c in columns]
+    if "updated_at" in TIMESTAMP_COLUMNS.get(table, ()):
+        assignments.append(f'"updated_at" = {NOW_MS}')
+    sql = f"UPDATE {table} SET {', '.join(assignments)} WHERE id = ?"
+    return sql, [_to_arg(row[c]) for c in columns] + [_to_arg(row["id"])]
+
+
+def _id_chunks(ids: list, size: int = MAX_SQL_PARAMS) -> list[tuple[str, list]]:
+    """(placeholders, ids) per chunk of an IN (...) list."""
+    ids = [str(i) for i in ids]
+    return [
+        (", ".join(["?"] * len(ids[start:start + size])), ids[start:start + size])
+        for start in range(0, len(ids), size)
+    ]
+
+
+def delete_recipe_children_statements(id: UUID) -> list[tuple[str, list]]:
+    """Statements removing a recipe's ingredient links and steps."""
+    return [
+        ("DELETE FROM recipe_ingredients WHERE recipe_id = ?", [str(id)]),
+        ("DELETE FROM recipe_steps WHERE recipe_id = ?", [str(id)]),
+    ]
+
+
+def delete_recipe_statements(id: UUID) -> list[tuple[str, list]]:
+    """Statements removing a recipe and its dependent rows (children first)."""
+    return delete_recipe_children_statements(id) + [
+        ("DELETE FROM recipes WHERE id = ?", [str(id)]),
+    ]
+
+
 class TursoClient:
     """Async client for Turso/libSQL database operations."""
 
@@ -46,6 +161,20 @@ class TursoClient:
                 f"Run Drizzle migrations first: pnpm drizzle-kit push"
             ) from e
 
+    async def batch(self, statements: list[tuple[str, list]]) -> list:
+        """
+        Execute several statements in one round trip.
+        libSQL wraps a batch in a transaction: either all succeed or none do.
+        """
+        client = await self.connect()
+        try:
+            return await client.batch(statements)
+        except KeyError as e:
+            raise RuntimeError(
+                f"Database error (table may not exist). "
+                f"Run Drizzle migrations first: pnpm drizzle-kit push"
+            ) from e
+
     async def test_connection(self) -> tuple[bool, str]:
         """Test database connectivity."""
         try:
@@ -81,20 +210,32 @@ class TursoClient:
         default_unit: str,
     ) -> None:
         """Insert a new ingredient into the database."""
-        sql = """
-            INSERT INTO ingredients (
-                id, usda_fdc_id, name_it, name_en, category,
-                kcal_per_100g, protein_per_100g, carbs_per_100g,
-                fat_per_100g, fiber_per_100g, cooked_weight_factor,
-                default_unit, created_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, strftime('%s', 'now') * 1000)
-        """
-        await self.execute(sql, [
-            str(id), usda_fdc_id, name_it, name_en, category,
-            kcal_per_100g, protein_per_100g, carbs_per_100g,
-            fat_per_100g, fiber_per_100g, cooked_weight_factor,
-            default_unit
-        ])
+        await self.execute(*insert_statement("ingredients", dict(
+            id=id, usda_fdc_id=usda_fdc_id, name_it=name_it, name_en=name_en,
+            category=category, kcal_per_100g=kcal_per_100g,
+            protein_per_100g=protein_per_100g, carbs_per_100g=carbs_per_100g,
+            fat_per_100g=fat_per_100g, fiber_per_100g=fiber_per_100g,
+            cooked_weight_factor=cooked_weight_factor, default_unit=default_unit,
+        )))
+
+    async def insert_ingredients_many(self, rows: list[dict]) -> None:
+        """Insert many ingredients with chunked multi-row INSERTs in one batch."""
+        if rows:
+            await self.batch(insert_statements("ingredients", rows))
+
+    async def delete_unused_ingredients(self, ids: list) -> int:
+        """Delete those of the given ingredients that no recipe links to; returns how many went."""
+        statements = [
+            (
+                f"DELETE FROM ingredients WHERE id IN ({placeholders}) "
+                "AND id NOT IN (SELECT ingredient_id FROM recipe_ingredients)",
+                chunk,
+            )
+            for placeholders, chunk in _id_chunks(ids)
+        ]
+        if not statements:
+            return 0
+        return sum(result.rows_affected for result in await self.batch(statements))
 
     async def get_ingredients(self) -> list[dict]:
         """Fetch all ingredients."""
@@ -102,6 +243,47 @@ class TursoClient:
         result = await self.execute(sql)
         return self._rows_to_dicts(result)
 
+    async def get_ingredient_keys(self) -> list[dict]:
+        """Fetch id, name_it and usda_fdc_id of every ingredient, oldest first."""
+        sql = "SELECT id, name_it, usda_fdc_id FROM ingredients ORDER BY created_at"
+        result = await self.execute(sql)
+        return self._rows_to_dicts(result)
+
+    async def merge_ingredients(self, merges: dict[str, list[str]]) -> None:
+        """
+        Merge duplicate ingredients into canonical rows in one transaction.
+        merges maps canonical_id -> duplicate_ids; links are repointed, duplicates deleted.
+        """
+        statements = []
+        for canonical_id, duplicate_ids in merges.items():
+            for start in range(0, len(duplicate_ids), MAX_SQL_PARAMS - 1):
+                chunk = duplicate_ids[start:start + MAX_SQL_PARAMS - 1]
+                placeholders = ", ".join(["?"] * len(chunk))
+                statements.append((
+                    f"UPDATE recipe_ingredients SET ingredient_id = ? WHERE ingredient_id IN ({placeholders})",
+                    [canonical_id, *chunk],
+                ))
+                statements.append((f"DELETE FROM ingredients WHERE id IN ({placeholders})", chunk))
+        if statements:
+            await self.batch(statements)
+
+    async def get_ingredients_by_ids(self, ids: list) -> list[dict]:
+        """Fetch the ingredients with the given IDs (chunked IN lists)."""
+        rows = []
+        for placeholders, chunk in _id_chunks(ids):
+            result = await self.execute(f"SELECT * FROM ingredients WHERE id IN ({placeholders})", chunk)
+            rows += self._rows_to_dicts(result)
+        return rows
+
+    async def update_ingredient_and_recipes(self, ingredient: dict, recipe_rows: list[dict]) -> None:
+        """
+        Update an ingredient's columns and the nutrient columns of the recipes
+        using it in one transaction; rows hold id plus the columns to set.
+        """
+        statements = [set_columns_statement("ingredients", ingredient)]
+        statements += [set_columns_statement("recipes", row) for row in recipe_rows]
+        await self.batch(statements)
+
     async def get_ingredient_by_id(self, id: UUID) -> Optional[dict]:
         """Fetch a single ingredient by ID."""
         sql = "SELECT * FROM ingredients WHERE id = ?"
@@ -137,22 +319,17 @@ class TursoClient:
         is_published: bool,
     ) -> None:
         """Insert a new recipe into the database."""
-        sql = """
-            INSERT INTO recipes (
-                id, name_it, name_en, slug, description_it, description_en,
-                category, image_url, prep_time_min, cook_time_min, total_time_min,
-                servings, difficulty, kcal_per_100g, kcal_per_serving,
-                protein_per_100g, carbs_per_100g, fat_per_100g, fiber_per_100g,
-                serving_weight_g, protein_source, is_published, created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, strftime('%s', 'now') * 1000, strftime('%s', 'now') * 1000)
-        """
-        await self.execute(sql, [
-            str(id), name_it, name_en, slug, description_it, description_en,
-            category, image_url, prep_time_min, cook_time_min, total_time_min,
-            servings, difficulty, kcal_per_100g, kcal_per_serving,
-            protein_per_100g, carbs_per_100g, fat_per_100g, fiber_per_100g,
-            serving_weight_g, protein_source, 1 if is_published else 0
-        ])
+        await self.execute(*insert_statement("recipes", dict(
+            id=id, name_it=name_it, name_en=name_en, slug=slug,
+            description_it=description_it, description_en=description_en,
+            category=category, image_url=image_url, prep_time_min=prep_time_min,
+            cook_time_min=cook_time_min, total_time_min=total_time_min,
+            servings=servings, difficulty=difficulty, kcal_per_100g=kcal_per_100g,
+            kcal_per_serving=kcal_per_serving, protein_per_100g=protein_per_100g,
+            carbs_per_100g=carbs_per_100g, fat_per_100g=fat_per_100g,
+            fiber_per_100g=fiber_per_100g, serving_weight_g=serving_weight_g,
+            protein_source=protein_source, is_published=is_published,
+        )))
 
     async def get_recipes(self, category: Optional[str] = None) -> list[dict]:
         """Fetch all recipes, optionally filtered by category."""
@@ -170,31 +347,135 @@ class TursoClient:
         result = await self.execute(sql, [str(id)])
         rows = self._rows_to_dicts(result)
         return rows[0] if rows else None
+
     async def get_recipe_by_slug(self, slug: str) -> Optional[dict]:
         """Fetch a single recipe by slug."""
         sql = "SELECT * FROM recipes WHERE slug = ?"
         result = await self.execute(sql, [slug])
         rows = self._rows_to_dicts(result)
         return rows[0] if rows else None
-    async def delete_recipe(self, id: UUID) -> bool:
-        """Delete a recipe and all related data (ingredients, steps)."""
-        # Delete related recipe_ingredients first
-        await self.execute(
-            "DELETE FROM recipe_ingredients WHERE recipe_id = ?",
-            [str(id)]
-        )
-        # Delete related recipe_steps
-        await self.execute(
-            "DELETE FROM recipe_steps WHERE recipe_id = ?",
-            [str(id)]
-        )
-        # Delete the recipe itself
+
+    async def get_recipe_ids_by_slug(self) -> dict[str, UUID]:
+        """Map every recipe slug to its ID in a single query."""
+        result = await self.execute("SELECT id, slug FROM recipes")
+        return {row["slug"]: UUID(row["id"]) for row in self._rows_to_dicts(result)}
+
+    async def get_recipes_by_ids(self, ids: list) -> list[dict]:
+        """Fetch the recipes with the given IDs (chunked IN lists)."""
+        rows = []
+        for placeholders, chunk in _id_chunks(ids):
+            result = await self.execute(f"SELECT * FROM recipes WHERE id IN ({placeholders})", chunk)
+            rows += self._rows_to_dicts(result)
+        return rows
+
+    async def get_recipe_ingredient_links(self) -> list[dict]:
+        """recipe_id, ingredient_id, quantity, unit and cooking_factor of every recipe_ingredients row, in one query."""
         result = await self.execute(
-            "DELETE FROM recipes WHERE id = ?",
-            [str(id)]
+            "SELECT recipe_id, ingredient_id, quantity, unit, cooking_factor FROM recipe_ingredients"
         )
+        return self._rows_to_dicts(result)
+
+    async def get_links_of_recipes_using(self, ingredient_ids: list) -> list[dict]:
+        """
+        Every recipe_ingredients row (id, recipe_id, ingredient_id, quantity, unit,
+        cooking_factor) of
+        the recipes that use any of the ingredients. Both lookups go through the
+        recipe_ingredients indexes, so the cost follows the affected recipes,
+        not the size of the table.
+        """
+        rows = {}
+        for placeholders, chunk in _id_chunks(ingredient_ids):
+            result = await self.execute(
+                "SELECT id, recipe_id, ingredient_id, quantity, unit, cooking_factor FROM recipe_ingredients "
+                "WHERE recipe_id IN "
+                f"(SELECT recipe_id FROM recipe_ingredients WHERE ingredient_id IN ({placeholders}))",
+                chunk,
+            )
+            # A recipe reached from two chunks is returned twice; keep each link once
+            rows.update((row["id"], row) for row in self._rows_to_dicts(result))
+        return list(rows.values())
+
+    async def update_recipe_nutrition(self, rows: list[dict]) -> None:
+        """Set nutrient columns on many recipes in one transaction; rows hold id plus the columns."""
+        if rows:
+            await self.batch([set_columns_statement("recipes", row) for row in rows])
+
+    async def delete_recipe(self, id: UUID) -> bool:
+        """Delete a recipe and all related data (ingredients, steps)."""
+        await self.batch(delete_recipe_statements(id))
         return True
 
+    async def save_recipe_graph(
+        self,
+        recipe: dict,
+        ingredients: list[dict],
+        recipe_ingredients: list[dict],
+        steps: list[dict],
+        replace_id: Optional[UUID] = None,
+    ) -> None:
+        """
+        Write a recipe with its ingredients, links and steps in one batch.
+
+        Rows are dicts keyed like the matching insert_* arguments. If
+        replace_id is given, that recipe is deleted in the same transaction,
+        so a failed write never leaves a half-replaced recipe behind.
+        """
+        statements = delete_recipe_statements(replace_id) if replace_id else []
+        statements += insert_statements("ingredients", ingredients)
+        statements.append(insert_statement("recipes", recipe))
+        statements += insert_statements("recipe_ingredients", recipe_ingredients)
+        statements += insert_statements("recipe_steps", steps)
+        await self.batch(statements)
+
+    async def update_recipe_graph(
+        self,
+        recipe: dict,
+        ingredients: list[dict],
+        recipe_ingredients: list[dict],
+        steps: list[dict],
+    ) -> None:
+        """
+        Rewrite an existing recipe in place, keeping its ID.
+
+        The recipe row is UPDATEd and its links and steps are replaced in one
+        transaction, so rows that reference the recipe (e.g. planned_meals)
+        stay valid.
+        """
+        statements = delete_recipe_children_statements(recipe["id"])
+        statements += insert_statements("ingredients", ingredients)
+        statements.append(update_statement("recipes", recipe))
+        statements += insert_statements("recipe_ingredients", recipe_ingredients)
+        statements += insert_statements("recipe_steps", steps)
+        await self.batch(statements)
+
+    async def save_recipe_graphs(self, graphs: list[dict]) -> None:
+        """
+        Write many recipe graphs in one transaction.
+
+        Each graph is a dict with recipe, ingredients, recipe_ingredients and
+        steps rows (as for save_recipe_graph); graphs with update=True rewrite
+        an existing recipe in place. Rows of the same table are sent as
+        chunked multi-row INSERTs across all graphs.
+        """
+        statements = []
+        new_recipes = []
+        for graph in graphs:
+            if graph.get("update"):
+                statements += delete_recipe_children_statements(graph["recipe"]["id"])
+            else:
+                new_recipes.append(graph["recipe"])
+        statements += insert_statements("ingredients", [row for g in graphs for row in g["ingredients"]])
+        statements += insert_statements("recipes", new_recipes)
+        statements += [update_statement("recipes", g["recipe"]) for g in graphs if g.get("update")]
+        statements += insert_statements("recipe_ingredients", [row for g in graphs for row in g["recipe_ingredients"]])
+        statements += insert_statements("recipe_steps", [row for g in graphs for row in g["steps"]])
+        await self.batch(statements)
+
+    async def delete_recipes(self, ids: list[UUID]) -> None:
+        """Delete several recipes and their related data in one transaction."""
+        if ids:
+            await self.batch([stmt for id in ids for stmt in delete_recipe_statements(id)])
+
     # ============ RecipeIngredient ============
 
     async def insert_recipe_ingredient(
@@ -208,19 +489,20 @@ class TursoClient:
         notes_it: Optional[str],
         notes_en: Optional[str],
         order: int,
+        cooking_factor: Optional[float] = None,
     ) -> None:
-        """Link an ingredient to a recipe."""
-        sql = """
-            INSERT INTO recipe_ingredients (
-                id, recipe_id, ingredient_id, quantity, unit,
-                is_optional, notes_it, notes_en, "order"
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        await self.execute(sql, [
-            str(id), str(recipe_id), str(ingredient_id),
-            quantity, unit, 1 if is_optional else 0,
-            notes_it, notes_en, order
-        ])
+        """Link an ingredient to a recipe; cooking_factor overrides the ingredient's for this line."""
+        await self.execute(*insert_statement("recipe_ingredients", dict(
+            id=id, recipe_id=recipe_id, ingredient_id=ingredient_id,
+            quantity=quantity, unit=unit, is_optional=is_optional,
+            notes_it=notes_it, notes_en=notes_en, order=order,
+            cooking_factor=cooking_factor,
+        )))
+
+    async def insert_recipe_ingredients_many(self, rows: list[dict]) -> None:
+        """Link many ingredients with chunked multi-row INSERTs in one batch."""
+        if rows:
+            await self.batch(insert_statements("recipe_ingredients", rows))
 
     async def get_recipe_ingredients(self, recipe_id: UUID) -> list[dict]:
         """Fetch all ingredients for a recipe with ingredient details."""
@@ -247,15 +529,16 @@ class TursoClient:
         image_url: Optional[str],
     ) -> None:
         """Add a preparation step to a recipe."""
-        sql = """
-            INSERT INTO recipe_steps (
-                id, recipe_id, step_number, instruction_it, instruction_en, image_url
-            ) VALUES (?, ?, ?, ?, ?, ?)
-        """
-        await self.execute(sql, [
-            str(id), str(recipe_id), step_number,
-            instruction_it, instruction_en, image_url
-        ])
+        await self.execute(*insert_statement("recipe_steps", dict(
+            id=id, recipe_id=recipe_id, step_number=step_number,
+            instruction_it=instruction_it, instruction_en=instruction_en,
+            image_url=image_url,
+        )))
+
+    async def insert_recipe_steps_many(self, rows: list[dict]) -> None:
+        """Add many steps with chunked multi-row INSERTs in one batch."""
+        if rows:
+            await self.batch(insert_statements("recipe_steps", rows))
 
     async def get_recipe_steps(self, recipe_id: UUID) -> list[dict]:
         """Fetch all steps for a recipe."""
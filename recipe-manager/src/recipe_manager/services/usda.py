@@ -2,12 +2,15 @@
 USDA FoodData Central API Client.
 Docs: https://fdc.nal.usda.gov/api-guide.html
 """
+import asyncio
 import httpx
 from decimal import Decimal
 from typing import Optional
 
 from ..config.settings import Config
 from ..models import NutrientData, USDAFood
+from .rate_limit import RETRY_STATUSES, TokenBucket, backoff_delay, retry_after_seconds
+from .usda_cache import USDACache, cache_key
 
 
 # USDA Nutrient IDs
@@ -19,63 +22,167 @@ NUTRIENT_IDS = {
     "fiber": 1079,       # g (dietary fiber)
 }
 
+SEARCH_DATA_TYPES = ("Foundation", "SR Legacy", "Survey (FNDDS)")
+FOODS_CHUNK_SIZE = 20  # max fdcIds per POST /foods request
+
 
 class USDAClient:
     """Client for USDA FoodData Central API."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        http: Optional[httpx.AsyncClient] = None,
+        cache: Optional[USDACache] = None,
+        max_concurrency: int = 4,
+        rate_limiter: Optional[TokenBucket] = None,
+        base_url: Optional[str] = None,
+        max_retries: Optional[int] = None,
+    ):
         self.api_key = Config.USDA_KEY
-        self.base_url = Config.USDA_BASE_URL
+        self.base_url = base_url or Config.USDA_BASE_URL
+        self.cache = cache
+        # Bounds in-flight requests for bulk calls
+        self._concurrency = asyncio.Semaphore(max_concurrency)
+        # Pass one bucket to every client sharing the same API key
+        self.rate_limiter = rate_limiter or TokenBucket.per_hour(Config.USDA_RATE_PER_HOUR, Config.USDA_RATE_BURST)
+        self.max_retries = Config.USDA_MAX_RETRIES if max_retries is None else max_retries
+        # Shared pooled client (see AppContext); a private one is created lazily otherwise
+        self._http = http
+        self._owns_http = http is None
+
+    def _client(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client, creating a private one if needed."""
+        if self._http is None:
+            self._http = httpx.AsyncClient()
+        return self._http
+
+    async def close(self):
+        """Close the HTTP client if this instance created it."""
+        if self._owns_http and self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def _request(self, method: str, path: str, params: Optional[dict] = None, **kwargs) -> httpx.Response:
+        """
+        Send one API request under the rate limiter.
+        429 and 5xx responses are retried with jittered exponential backoff,
+        or after Retry-After when the server sends it. The last response is returned.
+        """
+        params = {**(params or {}), "api_key": self.api_key}
+        attempt = 0
+        while True:
+            async with self._concurrency:
+                await self.rate_limiter.acquire()
+                response = await self._client().request(method, f"{self.base_url}{path}", params=params, **kwargs)
+
+            remaining = response.headers.get("X-RateLimit-Remaining")
+            if remaining is not None and remaining.isdigit():
+                self.rate_limiter.observe_remaining(int(remaining))
+
+            if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                return response
+
+            delay = retry_after_seconds(response.headers.get("Retry-After"))
+            if delay is None:
+                delay = backoff_delay(attempt)
+            if response.status_code == 429:
+                # Quota exhausted for the key: hold back every concurrent caller
+                self.rate_limiter.pause(delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _get_json(self, key: str, endpoint: str, path: str, params: dict) -> Optional[dict]:
+        """
+        GET a USDA endpoint through the response cache.
+        Returns None on 404. Falls back to a stale cached copy when offline.
+        """
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        try:
+            response = await self._request("GET", path, params=params)
+        except httpx.TransportError:
+            stale = self.cache.get_stale(key) if self.cache else None
+            if stale is None:
+                raise
+            return stale
+
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        data = response.json()
+        if self.cache:
+            self.cache.set(key, endpoint, data)
+        return data
 
     async def search_food(self, query: str, page_size: int = 10) -> list[USDAFood]:
         """
         Search for foods by name.
         Returns parsed list of USDAFood objects.
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/foods/search",
-                params={
-                    "query": query,
-                    "api_key": self.api_key,
-                    "pageSize": page_size,
-                    "dataType": ["Foundation", "SR Legacy", "Survey (FNDDS)"],
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-
-        foods = []
-        for item in data.get("foods", []):
-            nutrients = self._parse_nutrients(item.get("foodNutrients", []))
-            foods.append(USDAFood(
-                fdc_id=str(item["fdcId"]),
-                description=item.get("description", "Unknown"),
-                brand_owner=item.get("brandOwner"),
-                nutrients=nutrients,
-            ))
-        return foods
+        key = cache_key("foods/search", query, page_size, SEARCH_DATA_TYPES)
+        data = await self._get_json(key, "foods/search", "/foods/search", {
+            "query": query,
+            "pageSize": page_size,
+            "dataType": list(SEARCH_DATA_TYPES),
+        }) or {}
+
+        return [self._food_from_json(item) for item in data.get("foods", [])]
 
     async def get_food_details(self, fdc_id: str) -> Optional[USDAFood]:
         """
         Fetch detailed info for a specific food by FDC ID.
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/food/{fdc_id}",
-                params={"api_key": self.api_key}
-            )
-            if response.status_code == 404:
-                return None
-            response.raise_for_status()
-            data = response.json()
-
-        nutrients = self._parse_nutrients(data.get("foodNutrients", []))
+        key = cache_key("food", fdc_id)
+        data = await self._get_json(key, "food", f"/food/{fdc_id}", {})
+        if data is None:
+            return None
+        return self._food_from_json(data)
+
+    async def get_foods_details(self, fdc_ids: list[str]) -> dict[str, USDAFood]:
+        """
+        Fetch many foods at once via POST /foods, in chunks of 20 IDs run concurrently.
+        Cached IDs are served without a request. Unknown IDs are left out of the result.
+        """
+        ids = list(dict.fromkeys(str(fdc_id) for fdc_id in fdc_ids))
+        results: dict[str, USDAFood] = {}
+
+        missing = []
+        for fdc_id in ids:
+            cached = self.cache.get(cache_key("food", fdc_id)) if self.cache else None
+            if cached is not None:
+                results[fdc_id] = self._food_from_json(cached)
+            else:
+                missing.append(fdc_id)
+
+        chunks = [missing[i:i + FOODS_CHUNK_SIZE] for i in range(0, len(missing), FOODS_CHUNK_SIZE)]
+        for items in await asyncio.gather(*(self._post_foods(chunk) for chunk in chunks)):
+            for item in items:
+                food = self._food_from_json(item)
+                results[food.fdc_id] = food
+        return results
+
+    async def _post_foods(self, fdc_ids: list[str]) -> list[dict]:
+        """POST one chunk of IDs to /foods and cache each food as a detail response."""
+        response = await self._request("POST", "/foods", json={"fdcIds": [int(fdc_id) for fdc_id in fdc_ids]})
+        if response.status_code == 404:
+            return []
+        response.raise_for_status()
+        items = response.json()
+        if self.cache:
+            for item in items:
+                self.cache.set(cache_key("food", str(item["fdcId"])), "food", item)
+        return items
+
+    def _food_from_json(self, data: dict) -> USDAFood:
+        """Build a USDAFood from a search hit or a detail response."""
         return USDAFood(
             fdc_id=str(data["fdcId"]),
             description=data.get("description", "Unknown"),
             brand_owner=data.get("brandOwner"),
-            nutrients=nutrients,
+            nutrients=self._parse_nutrients(data.get("foodNutrients", [])),
         )
 
     def _parse_nutrients(self, nutrients_list: list) -> NutrientData:
@@ -118,3 +225,5 @@ class USDAClient:
             return True, "Connected (no results)"
         except Exception as e:
             return False, str(e)
+        finally:
+            await self.close()
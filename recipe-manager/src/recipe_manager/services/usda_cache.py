@@ -0,0 +1,176 @@
+"""
+Persistent on-disk cache for USDA FoodData Central responses.
+SQLite file keyed by (endpoint, normalized query, page_size, dataType),
+with a TTL, size-bounded LRU eviction and hit/miss counters.
+"""
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+from ..config.settings import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def cache_key(
+    endpoint: str,
+    query: str,
+    page_size: Optional[int] = None,
+    data_types: tuple[str, ...] = (),
+) -> str:
+    """Build a cache key; the query is case- and whitespace-insensitive."""
+    normalized = " ".join(str(query).lower().split())
+    return "|".join([endpoint, normalized, str(page_size or ""), ",".join(sorted(data_types))])
+
+
+class USDACache:
+    """
+    SQLite-backed response cache, opened lazily on first use.
+
+    Hits are served from an in-process memo after the first read, so repeat
+    lookups in the same command skip SQLite entirely. LRU access times and
+    counters are buffered and written on flush()/close().
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ):
+        self.path = Path(path or Config.USDA_CACHE_PATH)
+        self.ttl_seconds = Config.USDA_CACHE_TTL_DAYS * 86400 if ttl_seconds is None else ttl_seconds
+        self.max_entries = Config.USDA_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._memo: dict[str, dict] = {}
+        self._touched: dict[str, float] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return a fresh cached payload, or None (counted as a miss)."""
+        payload = self._memo.get(key)
+        if payload is None:
+            row = self._connect().execute(
+                "SELECT payload, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and time.time() - row[1] <= self.ttl_seconds:
+                payload = json.loads(row[0])
+                self._memo[key] = payload
+
+        if payload is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touched[key] = time.time()
+        return payload
+
+    def get_stale(self, key: str) -> Optional[dict]:
+        """Return a payload regardless of age (offline fallback), without counting."""
+        row = self._connect().execute(
+            "SELECT payload FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, endpoint: str, payload: dict) -> None:
+        """Store a response and evict least recently used entries over the limit."""
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, endpoint, payload, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, endpoint, json.dumps(payload, separators=(",", ":")), now, now),
+        )
+        self._memo[key] = payload
+        self._evict(conn)
+        conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (count,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            )
+
+    def flush(self) -> None:
+        """Persist buffered access times and hit/miss counters."""
+        if self._conn is None or not (self._touched or self.hits or self.misses):
+            return
+        self._conn.executemany(
+            "UPDATE responses SET accessed_at = ? WHERE key = ?",
+            [(ts, key) for key, ts in self._touched.items()],
+        )
+        self._conn.executemany(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            [("hits", self.hits), ("misses", self.misses)],
+        )
+        self._conn.commit()
+        self._touched.clear()
+        self.hits = self.misses = 0
+
+    def close(self) -> None:
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def clear(self) -> int:
+        """Delete every cached response and reset counters. Returns entries removed."""
+        conn = self._connect()
+        (count,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        conn.execute("DELETE FROM responses")
+        conn.execute("DELETE FROM counters")
+        conn.commit()
+        conn.execute("VACUUM")
+        self._memo.clear()
+        self._touched.clear()
+        self.hits = self.misses = 0
+        return count
+
+    def stats(self) -> dict:
+        """Entry count, expired entries, file size and lifetime hit/miss counters."""
+        self.flush()
+        conn = self._connect()
+        (entries,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        (expired,) = conn.execute(
+            "SELECT COUNT(*) FROM responses WHERE created_at < ?",
+            (time.time() - self.ttl_seconds,),
+        ).fetchone()
+        counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "expired": expired,
+            "max_entries": self.max_entries,
+            "size_bytes": self.path.stat().st_size if self.path.exists() else 0,
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+        }
@@ -0,0 +1,244 @@
+"""
+Offline USDA provider backed by the bundled database_alimenti.db.
+The source table stores nutrients as display strings ("1.06E+3 mg"); they are
+decoded once into a columnar SQLite copy with an FTS5 index on description.
+"""
+import json
+import re
+import sqlite3
+from decimal import Decimal
+from pathlib import Path
+from typing import Optional
+
+from ..config.settings import Config
+from ..models import NutrientData, USDAFood
+from .usda import USDAClient
+
+# Source nutrient label -> numeric column in the local copy
+NUTRIENT_COLUMNS = {
+    "Energy (kcal)": "kcal",
+    "Protein (g)": "protein_g",
+    "Carbohydrate (g)": "carbs_g",
+    "Total Fat (g)": "fat_g",
+    "Fiber (g)": "fiber_g",
+    "Total Sugars (g)": "sugars_g",
+    "Sodium (mg)": "sodium_mg",
+}
+
+SCHEMA = f"""
+CREATE TABLE foods (
+    fdc_id INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    {", ".join(f"{col} REAL" for col in NUTRIENT_COLUMNS.values())}
+);
+CREATE VIRTUAL TABLE foods_fts USING fts5(
+    description, content='foods', content_rowid='fdc_id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+_AMOUNT_RE = re.compile(r"^\s*([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)")
+
+
+def parse_amount(text: Optional[str]) -> Optional[float]:
+    """Decode a display amount such as '1.06E+3 mg' or '5.88 g'; 'N/A g' -> None."""
+    match = _AMOUNT_RE.match(text or "")
+    return float(match.group(1)) if match else None
+
+
+def _source_signature(source: Path) -> str:
+    stat = source.stat()
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def build_local_db(source: Path, target: Path) -> int:
+    """
+    Build the columnar copy of the alimenti table at target.
+    Written to a temp file and renamed, so readers never see a partial build.
+    Returns the number of foods.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_suffix(".tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    src = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    dst = sqlite3.connect(tmp_path)
+    try:
+        dst.executescript(SCHEMA)
+        columns = list(NUTRIENT_COLUMNS.values())
+        rows = []
+        for fdc_id, description, nutrients in src.execute("SELECT fdcId, description, nutrients FROM alimenti"):
+            values = json.loads(nutrients or "{}")
+            rows.append((
+                fdc_id,
+                description or "Unknown",
+                *(parse_amount(values.get(label)) for label in NUTRIENT_COLUMNS),
+            ))
+        dst.executemany(
+            f"INSERT INTO foods (fdc_id, description, {', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * (len(columns) + 2))})",
+            rows,
+        )
+        dst.execute("INSERT INTO foods_fts (foods_fts) VALUES ('rebuild')")
+        dst.execute("INSERT INTO meta (key, value) VALUES ('source', ?)", (_source_signature(source),))
+        dst.commit()
+    finally:
+        src.close()
+        dst.close()
+
+    tmp_path.replace(target)
+    return len(rows)
+
+
+def _fts_query(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 prefix query: all terms must match."""
+    terms = re.findall(r"\w+", query.lower())
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _decimal(value: Optional[float]) -> Optional[Decimal]:
+    return Decimal(str(round(value, 2))) if value is not None else None
+
+
+class LocalUSDAProvider:
+    """
+    Same interface as USDAClient, answered from the local copy.
+    Falls back to the remote client only when the local data has no match.
+    """
+
+    def __init__(
+        self,
+        remote: Optional[USDAClient] = None,
+        source: Optional[Path] = None,
+        path: Optional[Path] = None,
+    ):
+        self.remote = remote
+        self.source = Path(source or Config.USDA_LOCAL_SOURCE)
+        self.path = Path(path or Config.USDA_LOCAL_DB_PATH)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @classmethod
+    def available(cls) -> bool:
+        """True if the bundled source database is present."""
+        return Path(Config.USDA_LOCAL_SOURCE).exists()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the local copy, (re)building it when missing or stale."""
+        if self._conn is None:
+            if not self._is_current():
+                build_local_db(self.source, self.path)
+            self._conn = sqlite3.connect(self.path)
+        return self._conn
+
+    def _is_current(self) -> bool:
+        if not self.path.exists():
+            return False
+        conn = sqlite3.connect(self.path)
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+        except sqlite3.DatabaseError:
+            return False
+        finally:
+            conn.close()
+        return row is not None and row[0] == _source_signature(self.source)
+
+    def _food_from_row(self, row: tuple) -> USDAFood:
+        fdc_id, description, kcal, protein, carbs, fat, fiber = row
+        return USDAFood(
+            fdc_id=str(fdc_id),
+            description=description,
+            nutrients=NutrientData(
+                kcal=int(round(kcal)) if kcal else 0,
+                protein=_decimal(protein) or Decimal("0"),
+                carbs=_decimal(carbs) or Decimal("0"),
+                fat=_decimal(fat) or Decimal("0"),
+                fiber=_decimal(fiber),
+            ),
+        )
+
+    def search_local(self, query: str, page_size: int = 10) -> list[USDAFood]:
+        """Full-text search on description, best BM25 match first."""
+        match = _fts_query(query)
+        if match is None:
+            return []
+        rows = self._connect().execute(
+            """
+            SELECT f.fdc_id, f.description, f.kcal, f.protein_g, f.carbs_g, f.fat_g, f.fiber_g
+            FROM foods_fts
+            JOIN foods f ON f.fdc_id = foods_fts.rowid
+            WHERE foods_fts MATCH ?
+            ORDER BY bm25(foods_fts), length(f.description)
+            LIMIT ?
+            """,
+            (match, page_size),
+        ).fetchall()
+        return [self._food_from_row(row) for row in rows]
+
+    def get_local(self, fdc_id: str) -> Optional[USDAFood]:
+        """Look up a food by FDC ID in the local copy."""
+        try:
+            key = int(fdc_id)
+        except (TypeError, ValueError):
+            return None
+        row = self._connect().execute(
+            "SELECT fdc_id, description, kcal, protein_g, carbs_g, fat_g, fiber_g FROM foods WHERE fdc_id = ?",
+            (key,),
+        ).fetchone()
+        return self._food_from_row(row) if row else None
+
+    async def search_food(self, query: str, page_size: int = 10) -> list[USDAFood]:
+        """
+        Search locally; ask the remote API only if nothing matches.
+        Remote errors other than 404 (bad key, quota, network) propagate.
+        """
+        foods = self.search_local(query, page_size)
+        if foods or self.remote is None:
+            return foods
+        return await self.remote.search_food(query, page_size)
+
+    async def get_food_details(self, fdc_id: str) -> Optional[USDAFood]:
+        """Look up locally; ask the remote API only if the ID is unknown (None on 404)."""
+        food = self.get_local(fdc_id)
+        if food or self.remote is None:
+            return food
+        return await self.remote.get_food_details(fdc_id)
+
+    async def get_foods_details(self, fdc_ids: list[str]) -> dict[str, USDAFood]:
+        """Resolve IDs locally in one query; fetch only the unknown ones remotely."""
+        ids = list(dict.fromkeys(str(fdc_id) for fdc_id in fdc_ids))
+        keys = [int(fdc_id) for fdc_id in ids if fdc_id.isdigit()]
+        results = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self._connect().execute(
+                "SELECT fdc_id, description, kcal, protein_g, carbs_g, fat_g, fiber_g FROM foods "
+                f"WHERE fdc_id IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            for row in rows:
+                food = self._food_from_row(row)
+                results[food.fdc_id] = food
+
+        missing = [fdc_id for fdc_id in ids if fdc_id not in results]
+        if missing and self.remote is not None:
+            results.update(await self.remote.get_foods_details(missing))
+        return results
+
+    async def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self.remote:
+            await self.remote.close()
+
+    async def test_connection(self) -> tuple[bool, str]:
+        """Check the local copy can be built and queried."""
+        try:
+            (count,) = self._connect().execute("SELECT COUNT(*) FROM foods").fetchone()
+            return True, f"Local database ({count} foods)"
+        except Exception as e:
+            return False, str(e)
+        finally:
+            await self.close()
@@ -0,0 +1,532 @@
+"""
+Automatic ingredient -> USDA food matcher.
+TF-IDF cosine over word, head-word and character-trigram features of the
+bundled alimenti descriptions plus synonym documents learned from the legacy
+database. The inverted index is built once into .npy files and memory-mapped,
+so loading costs milliseconds and a match is a few array gathers.
+"""
+import json
+import math
+import re
+import shutil
+import sqlite3
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+import numpy as np
+
+from ..config.settings import Config
+from .ingredient_index import normalize_name
+from .legacy_db import pair_english_names
+
+INDEX_VERSION = 2
+
+# Italian ingredient words -> the English words USDA descriptions use.
+# Looked up by exact word first, then by stem (final vowel dropped) for plurals.
+ITALIAN_SYNONYMS = {
+    # Pantry
+    "olio": "oil", "oliva": "olive", "olive": "olives", "extravergine": "extra virgin", "burro": "butter",
+    "strutto": "lard", "sale": "salt", "pepe": "pepper", "zucchero": "sugar granulated", "farina": "flour",
+    "semola": "semolina", "amido": "starch", "fecola": "potato starch", "lievito": "yeast",
+    "aceto": "vinegar", "balsamico": "balsamic", "miele": "honey", "cioccolato": "chocolate",
+    "fondente": "dark", "cacao": "cocoa", "caffe": "coffee", "vaniglia": "vanilla", "acqua": "beverages water tap",
+    "brodo": "broth", "vino": "wine", "birra": "beer", "pane": "bread white", "biscotti": "cookies", "pangrattato": "bread crumbs",
+    "riso": "rice white", "mais": "corn", "orzo": "barley", "avena": "oats", "farro": "spelt",
+    "grano": "wheat", "integrale": "whole wheat", "senape": "mustard", "maionese": "mayonnaise",
+    # Pasta shapes: USDA only has generic dry pasta
+    "pasta": "pasta", "spaghetti": "pasta dry", "spaghettone": "pasta dry", "rigatoni": "pasta dry",
+    "penne": "pasta dry", "fusilli": "pasta dry", "linguine": "pasta dry", "bucatini": "pasta dry",
+    "farfalle": "pasta dry", "paccheri": "pasta dry", "orecchiette": "pasta dry", "tortiglioni": "pasta dry",
+    "maccheroni": "pasta dry", "mezze": "pasta dry", "ditalini": "pasta dry", "tagliatelle": "noodles egg",
+    "lasagne": "noodles egg", "gnocchi": "potatoes",
+    # Dairy and eggs
+    "latte": "milk", "panna": "cream", "formaggio": "cheese", "uovo": "egg whole", "uova": "egg whole",
+    "tuorlo": "egg yolk", "albume": "egg white", "parmigiano": "parmesan cheese",
+    "grana": "parmesan cheese", "pecorino": "romano cheese", "mozzarella": "mozzarella cheese",
+    "ricotta": "ricotta cheese", "gorgonzola": "blue cheese", "mascarpone": "cream cheese",
+    "provola": "provolone cheese", "scamorza": "provolone cheese", "fontina": "fontina cheese",
+    "stracchino": "cheese", "yogurt": "yogurt", "scremato": "skim", "intero": "whole",
+    # Vegetables
+    "aglio": "garlic", "cipolla": "onion", "cipollotto": "scallions", "scalogno": "shallots",
+    "porro": "leeks", "sedano": "celery", "carota": "carrots", "patata": "potatoes",
+    "pomodoro": "tomatoes", "pomodorino": "tomatoes cherry", "passata": "tomato puree",
+    "concentrato": "tomato paste", "zucchina": "squash zucchini",
+    "zucca": "pumpkin", "melanzana": "eggplant", "peperone": "peppers sweet", "spinaci": "spinach",
+    "bietola": "chard", "lattuga": "lettuce", "rucola": "arugula", "radicchio": "radicchio",
+    "cavolo": "cabbage", "cavolfiore": "cauliflower", "broccolo": "broccoli", "carciofo": "artichokes",
+    "asparago": "asparagus", "fungo": "mushrooms", "funghi": "mushrooms", "porcini": "mushrooms",
+    "champignon": "mushrooms white", "pisello": "peas", "fagiolo": "beans", "fagiolino": "beans snap green",
+    "cece": "chickpeas", "ceci": "chickpeas", "lenticchia": "lentils", "fave": "broad beans",
+    "finocchio": "fennel", "ravanello": "radishes", "cetriolo": "cucumber", "avocado": "avocados",
+    "germogli": "sprouts",
+    # Herbs and spices
+    "basilico": "basil", "prezzemolo": "parsley", "rosmarino": "rosemary", "salvia": "sage",
+    "timo": "thyme", "origano": "oregano", "menta": "spearmint", "alloro": "bay leaf",
+    "maggiorana": "marjoram", "aneto": "dill", "coriandolo": "coriander", "peperoncino": "hot chili peppers",
+    "cannella": "cinnamon", "zafferano": "saffron", "curcuma": "turmeric", "zenzero": "ginger",
+    "cumino": "cumin", "paprika": "paprika", "curry": "curry powder", "chiodi": "cloves",
+    "cappero": "capers", "capperi": "capers",
+    # Fruit and nuts
+    "limone": "lemons", "scorza": "peel", "arancia": "oranges", "arance": "oranges", "mela": "apples", "pera": "pears", "banana": "bananas",
+    "fragola": "strawberries", "lampone": "raspberries", "mirtillo": "blueberries", "uva": "grapes",
+    "uvetta": "raisins", "pesca": "peaches", "pesche": "peaches", "albicocca": "apricots",
+    "ciliegia": "cherries", "fico": "figs", "cocco": "coconut", "mandorla": "nuts almonds",
+    "nocciola": "nuts hazelnuts", "noce": "nuts walnuts", "noci": "nuts walnuts", "pinolo": "nuts pine nuts",
+    "pistacchio": "nuts pistachio nuts", "arachide": "peanuts", "sesamo": "sesame", "semi": "seeds",
+    "girasole": "sunflower",
+    # Meat and fish
+    "pollo": "chicken", "petto": "breast", "coscia": "thigh", "tacchino": "turkey", "manzo": "beef",
+    "vitello": "veal", "maiale": "pork", "agnello": "lamb", "coniglio": "rabbit", "salsiccia": "sausage",
+    "prosciutto": "ham", "pancetta": "pork bacon", "guanciale": "pork bacon", "speck": "ham smoked",
+    "mortadella": "bologna", "salame": "salami", "pesce": "fish", "pesci": "fish", "tonno": "tuna",
+    "salmone": "salmon", "merluzzo": "cod", "baccala": "cod", "acciuga": "anchovy", "alice": "anchovy",
+    "gambero": "shrimp", "gamberetto": "shrimp", "calamaro": "squid", "polpo": "octopus",
+    "seppia": "cuttlefish", "cozza": "mussels", "vongola": "clam", "sgombro": "mackerel",
+    "orata": "sea bream", "branzino": "sea bass", "spigola": "sea bass",
+    # States
+    "fresco": "raw", "secco": "dried", "grattugiato": "grated", "tritato": "ground",
+    "macinato": "ground", "affumicato": "smoked", "cotto": "cooked", "crudo": "raw",
+    "dolce": "sweet", "bianco": "white", "nero": "black", "rosso": "red", "verde": "green",
+    "giallo": "yellow", "vegetale": "vegetable", "liquida": "fluid", "polvere": "powder",
+}
+# Multi-word names whose words mean something else on their own
+ITALIAN_PHRASES = {
+    "noce moscata": "nutmeg",
+    "erba cipollina": "chives",
+    "pan grattato": "bread crumbs",
+    "lievito di birra": "yeast baker",
+    "zucchero a velo": "sugar powdered",
+    "olio di semi": "oil vegetable",
+    "panna da cucina": "cream fluid light",
+    "fior di latte": "mozzarella cheese",
+    "pasta sfoglia": "puff pastry",
+    "pasta frolla": "pie crust",
+    "patata dolce": "sweet potato",
+    "pomodori pelati": "tomatoes whole canned",
+    "zucchero di canna": "sugar brown",
+}
+
+STOPWORDS = frozenset(
+    "a ad al alla alle allo ai agli con d da dal dalla dei degli del della delle dello di e ed "
+    "gli i il in l la le lo per q b qb un una uno "
+    "and as from in of or the to with nfs ns".split()
+)
+
+# Feature classes: whole words, head words, char trigrams. The head of a description is its
+# first two comma segments: "Tomatoes, grape", "Spices, pepper" (USDA often leads with a category)
+_CLASS_WEIGHTS = {"w": 1.0, "h": 1.0, "g": 0.35}
+# Weight of a phrase translation against single-word ones: "pomodori pelati" is canned
+# tomatoes before it is tomatoes
+_PHRASE_WEIGHT = 1.5
+# Weight of an implicit "raw" in queries without a phrase translation: a plain ingredient
+# name means the raw food. A head word too, as in "Oranges, raw"
+_RAW_WEIGHT = 0.5
+# Weight of the Italian words of a query once the dictionary has translated some of them
+_ITALIAN_WEIGHT = 0.5
+
+# Legacy ingredienti rows below this Similarity_score are too often wrong (pasta -> red rice) to learn from
+LEGACY_MIN_SCORE = 100.0
+
+_NOTES_RE = re.compile(r"\(.*?\)")
+_QB_RE = re.compile(r"\bq\s*\.?\s*b\b\.?", re.IGNORECASE)
+
+_FILES = ("ptr", "docs", "weights", "idf", "doc_fdc", "text", "text_offsets")
+
+
+class MatchCandidate(NamedTuple):
+    fdc_id: str
+    description: str
+    score: float   # cosine similarity, 0-1; 1.0 for a feedback correction
+    source: str    # "feedback", "synonym" (learned name) or "usda" (description)
+
+
+def _stem(word: str) -> str:
+    """English plural -> singular, enough for USDA descriptions (tomatoes, berries, leaves)."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith(("oes", "ches", "shes", "xes", "sses")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def _italian_stem(word: str) -> str:
+    return word[:-1] if len(word) > 3 and word[-1] in "aeiou" else word
+
+
+def _build_stem_synonyms() -> dict[str, str]:
+    stems: dict[str, set[str]] = {}
+    for word, english in ITALIAN_SYNONYMS.items():
+        stems.setdefault(_italian_stem(word), set()).add(english)
+    # pesce / pesca share a stem: ambiguous stems only resolve by exact word
+    return {stem: next(iter(values)) for stem, values in stems.items() if len(values) == 1}
+
+
+_STEM_SYNONYMS = _build_stem_synonyms()
+
+
+def clean_name(name: str) -> str:
+    """Normalized ingredient name without notes in parentheses and "q.b."."""
+    return normalize_name(_QB_RE.sub(" ", _NOTES_RE.sub(" ", name or "")))
+
+
+def translate_words(name: str) -> str:
+    """Word-by-word English rendering of an Italian name; unknown words are dropped."""
+    return _translate(clean_name(name))
+
+
+def _translate(text: str) -> str:
+    return " ".join(_translate_parts(text))
+
+
+def _translate_parts(text: str) -> tuple[str, str]:
+    """English renderings of the known phrases and of the remaining known words of normalized text."""
+    phrases, words = [], []
+    for phrase, translation in ITALIAN_PHRASES.items():
+        if phrase in text:
+            phrases.append(translation)
+            text = text.replace(phrase, " ")
+    for word in text.split():
+        if word in STOPWORDS:
+            continue
+        translation = ITALIAN_SYNONYMS.get(word) or _STEM_SYNONYMS.get(_italian_stem(word))
+        if translation:
+            words.append(translation)
+    return " ".join(phrases), " ".join(words)
+
+
+def agrees_with_dictionary(name_it: str, name_en: str) -> bool:
+    """
+    Whether an English name is a plausible translation: it has content words,
+    and shares one with the word dictionary's rendering when that knows any.
+    """
+    english = set(_words(normalize_name(name_en)))
+    translated = set(_words(translate_words(name_it)))
+    return bool(english) and (not translated or bool(translated & english))
+
+
+def _words(text: str) -> list[str]:
+    """Stemmed content words of normalized text."""
+    return [_stem(w) for w in text.split() if w not in STOPWORDS and not w.isdigit()]
+
+
+def _features(text: str, head: Optional[str] = None) -> dict[str, float]:
+    """
+    Feature -> weight before IDF, for normalized text: class weight x (1 + log count). Words count
+    once ("Butter, Clarified butter" is not more butter); head words (default:
+    all words) also count as h: features.
+    """
+    counts: dict[str, int] = {}
+    words = list(dict.fromkeys(_words(text)))
+    for word in words:
+        counts[f"w:{word}"] = 1
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            key = f"g:{padded[i:i + 3]}"
+            counts[key] = counts.get(key, 0) + 1
+    for word in (_words(head) if head is not None else words):
+        counts[f"h:{word}"] = 1
+    return {key: _CLASS_WEIGHTS[key[0]] * (1 + math.log(count)) for key, count in counts.items()}
+
+
+def _query_features(key: str) -> dict[str, float]:
+    """
+    Features of a cleaned Italian name plus its dictionary translation: phrase
+    translations above word translations above the Italian words, and the
+    implicit "raw" unless a phrase says what form the food is in.
+    """
+    phrases, words = _translate_parts(key)
+    features = {}
+    for text, text_weight in ((words, 1.0), (phrases, _PHRASE_WEIGHT)):
+        for feature, weight in (_features(text) if text else {}).items():
+            features[feature] = max(features.get(feature, 0), weight * text_weight)
+    italian_weight = _ITALIAN_WEIGHT if phrases or words else 1.0
+    for feature, weight in _features(key).items():
+        features[feature] = max(features.get(feature, 0), weight * italian_weight)
+    if not phrases:
+        for feature in ("w:raw", "h:raw"):
+            features[feature] = max(features.get(feature, 0), _RAW_WEIGHT)
+    return features
+
+
+def _source_signature(*paths: Path) -> str:
+    parts = [f"v{INDEX_VERSION}"]
+    for path in paths:
+        stat = path.stat() if path.exists() else None
+        parts.append(f"{path.name}:{stat.st_size}:{int(stat.st_mtime)}" if stat else f"{path.name}:-")
+    return "|".join(parts)
+
+
+def load_learned_names(legacy_db: Path, descriptions: dict[str, int]) -> tuple[list[tuple[str, int]], dict, dict]:
+    """
+    What the legacy ricette.db teaches the matcher:
+    - synonyms: (name, fdc_id) for Italian and English ingredient names whose
+      legacy USDA match scored at least LEGACY_MIN_SCORE
+    - aliases: feedback corrections that name a USDA description, {name: fdc_id}
+    - rewrites: other feedback corrections, {name: corrected name} searched instead
+
+    descriptions maps normalized USDA descriptions to FDC IDs.
+    """
+    synonyms, aliases, rewrites = [], {}, {}
+    if not legacy_db.exists():
+        return synonyms, aliases, rewrites
+
+    conn = sqlite3.connect(f"file:{legacy_db}?mode=ro", uri=True)
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        matched = {}  # English name -> fdc_id
+        if "ingredienti" in tables:
+            for name_en, description, score in conn.execute(
+                "SELECT Nome_ingrediente, Descrizione_USDA, Similarity_score FROM ingredienti "
+                "WHERE USDA_match = 1 AND Similarity_score >= ?",
+                (LEGACY_MIN_SCORE,),
+            ):
+                fdc_id = descriptions.get(normalize_name(description))
+                if fdc_id is not None:
+                    matched[name_en] = fdc_id
+                    synonyms.append((name_en, fdc_id))
+        if "ricette" in tables and matched:
+            # Italian names reach a match through the recipe's English ingredient list, which
+            # is sometimes paired out of order: keep names that always agree, and agree with
+            # the word dictionary when it knows them
+            seen: dict[str, set[int]] = {}
+            for italian, english in conn.execute("SELECT Ingredienti_JSON, Ingredients_JSON FROM ricette"):
+                pairs = pair_english_names(json.loads(italian or "{}"), json.loads(english or "{}"))
+                for name_it, name_en in pairs.items():
+                    if name_en in matched:
+                        seen.setdefault(clean_name(name_it), set()).add(matched[name_en])
+            english_words: dict[int, set[str]] = {}
+            for name, fdc_id in matched.items():
+                english_words.setdefault(fdc_id, set()).update(_words(normalize_name(name)))
+            for name_it, fdc_ids in seen.items():
+                fdc_id = next(iter(fdc_ids))
+                translated = set(_words(_translate(name_it)))
+                if len(fdc_ids) == 1 and (not translated or translated & english_words[fdc_id]):
+                    synonyms.append((name_it, fdc_id))
+        if "feedback" in tables:
+            for original, corrected in conn.execute("SELECT original_ingredient, corrected_ingredient FROM feedback"):
+                key, fixed = clean_name(original), normalize_name(corrected)
+                if not key or not fixed:
+                    continue
+                if fixed in descriptions:
+                    aliases[key] = descriptions[fixed]
+                else:
+                    rewrites[key] = corrected
+    finally:
+        conn.close()
+    return list(dict.fromkeys(synonyms)), aliases, rewrites
+
+
+def build_matcher_index(source: Path, legacy_db: Path, target: Path) -> int:
+    """
+    Build the matcher index directory at target from the alimenti table and
+    what the legacy database teaches. Written to a temp directory and swapped
+    in, so readers never see a partial build. Returns the number of documents.
+    """
+    src = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    try:
+        foods = [(int(fdc_id), description or "") for fdc_id, description in
+                 src.execute("SELECT fdcId, description FROM alimenti ORDER BY fdcId")]
+    finally:
+        src.close()
+    by_description = {}
+    for fdc_id, description in foods:
+        by_description.setdefault(normalize_name(description), fdc_id)
+    description_of = dict(foods)
+    synonyms, aliases, rewrites = load_learned_names(legacy_db, by_description)
+
+    # Documents: one per USDA description, then one per learned synonym
+    doc_fdc, doc_features, doc_text = [], [], []
+    for fdc_id, description in foods:
+        doc_fdc.append(fdc_id)
+        head = " ".join(description.split(",")[:2])
+        doc_features.append(_features(normalize_name(description), head=normalize_name(head)))
+        doc_text.append(description)
+    for name, fdc_id in synonyms:
+        doc_fdc.append(fdc_id)
+        doc_features.append(_features(normalize_name(name)))
+        doc_text.append(description_of[fdc_id])
+
+    vocab: dict[str, int] = {}
+    for features in doc_features:
+        for key in features:
+            vocab.setdefault(key, len(vocab))
+    df = np.zeros(len(vocab))
+    for features in doc_features:
+        df[[vocab[key] for key in features]] += 1
+    idf = np.log((1 + len(doc_features)) / (1 + df)) + 1
+
+    # Inverted index in CSR form: postings of feature f are docs[ptr[f]:ptr[f + 1]]
+    rows, cols, values = [], [], []
+    for doc, features in enumerate(doc_features):
+        ids = np.fromiter((vocab[key] for key in features), dtype=np.int64, count=len(features))
+        weights = np.fromiter(features.values(), dtype=float, count=len(features)) * idf[ids]
+        rows.append(np.full(len(ids), doc, dtype=np.int32))
+        cols.append(ids)
+        values.append(weights / np.linalg.norm(weights))
+    rows, cols, values = np.concatenate(rows), np.concatenate(cols), np.concatenate(values)
+    order = np.argsort(cols, kind="stable")
+    ptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(cols, minlength=len(vocab)), out=ptr[1:])
+
+    encoded = [text.encode("utf-8") for text in doc_text]
+    arrays = {
+        "ptr": ptr,
+        "docs": rows[order],
+        "weights": values[order].astype(np.float32),
+        "idf": idf.astype(np.float32),
+        "doc_fdc": np.asarray(doc_fdc, dtype=np.int64),
+        "text": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "text_offsets": np.concatenate([[0], np.cumsum([len(b) for b in encoded])]).astype(np.int64),
+    }
+
+    tmp_dir = target.with_name(target.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    for name, array in arrays.items():
+        np.save(tmp_dir / f"{name}.npy", array)
+    (tmp_dir / "vocab.json").write_text(json.dumps(list(vocab)), encoding="utf-8")
+    (tmp_dir / "learned.json").write_text(
+        json.dumps({"aliases": aliases, "rewrites": rewrites}, ensure_ascii=False), encoding="utf-8"
+    )
+    (tmp_dir / "meta.json").write_text(json.dumps({
+        "source": _source_signature(source, legacy_db),
+        "documents": len(doc_fdc),
+        "foods": len(foods),
+        "synonyms": len(synonyms),
+        "features": len(vocab),
+    }), encoding="utf-8")
+
+    old_dir = target.with_name(target.name + ".old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if target.exists():
+        target.replace(old_dir)
+    tmp_dir.replace(target)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return len(doc_fdc)
+
+
+class USDAMatcher:
+    """
+    Top-k USDA candidates for ingredient names, from the memory-mapped index.
+
+    Usage:
+        matcher = USDAMatcher.load()
+        best = matcher.best("pomodori ramati")   # None when not confident
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        # Plain ndarray views of the mappings: same pages, without np.memmap's per-access overhead
+        arrays = {name: np.load(directory / f"{name}.npy", mmap_mode="r").view(np.ndarray) for name in _FILES}
+        self._ptr = arrays["ptr"]
+        self._docs = arrays["docs"]
+        self._weights = arrays["weights"]
+        self._idf = arrays["idf"]
+        self._doc_fdc = arrays["doc_fdc"]
+        self._text = arrays["text"]
+        self._text_offsets = arrays["text_offsets"]
+        self._vocab = {key: i for i, key in enumerate(json.loads((directory / "vocab.json").read_text("utf-8")))}
+        learned = json.loads((directory / "learned.json").read_text("utf-8"))
+        self._aliases: dict[str, int] = learned["aliases"]
+        self._rewrites: dict[str, str] = learned["rewrites"]
+        self.meta = json.loads((directory / "meta.json").read_text("utf-8"))
+        self._synonym_start = self.meta["foods"]
+        self._unknown_idf = float(self._idf.max()) if len(self._idf) else 1.0
+        self._descriptions: dict[int, str] = {}
+
+    @classmethod
+    def available(cls) -> bool:
+        """True if the bundled alimenti database is present."""
+        return Path(Config.USDA_LOCAL_SOURCE).exists()
+
+    @classmethod
+    def load(
+        cls,
+        source: Optional[Path] = None,
+        legacy_db: Optional[Path] = None,
+        directory: Optional[Path] = None,
+        rebuild: bool = False,
+    ) -> "USDAMatcher":
+        """Open the index, (re)building it when missing, stale or rebuild is set."""
+        source = Path(source or Config.USDA_LOCAL_SOURCE)
+        legacy_db = Path(legacy_db or Config.USDA_MATCHER_LEGACY_DB)
+        directory = Path(directory or Config.USDA_MATCHER_DIR)
+        meta_path = directory / "meta.json"
+        current = meta_path.exists() and json.loads(meta_path.read_text("utf-8")).get("source") == \
+            _source_signature(source, legacy_db)
+        if rebuild or not current:
+            build_matcher_index(source, legacy_db, directory)
+        return cls(directory)
+
+    def _description(self, doc: int) -> str:
+        fdc_id = int(self._doc_fdc[doc])
+        if fdc_id not in self._descriptions:
+            start, end = self._text_offsets[doc], self._text_offsets[doc + 1]
+            self._descriptions[fdc_id] = bytes(self._text[start:end]).decode("utf-8")
+        return self._descriptions[fdc_id]
+
+    def _scores(self, key: str) -> np.ndarray:
+        """Cosine similarity of a cleaned query with every document."""
+        features = _query_features(key)
+        ids = np.fromiter((self._vocab.get(f, -1) for f in features), dtype=np.int64, count=len(features))
+        weights = np.fromiter(features.values(), dtype=float, count=len(features))
+        known = ids >= 0
+        # Features no document has still count in the query norm: they are unmatched words
+        idf = np.full(len(ids), self._unknown_idf)
+        idf[known] = self._idf[ids[known]]
+        weights *= idf
+        weights /= np.linalg.norm(weights)
+        ids, weights = ids[known], weights[known]
+
+        # Gather the postings lists of all query features at once
+        starts = self._ptr[ids]
+        lengths = self._ptr[ids + 1] - starts
+        offsets = np.cumsum(lengths) - lengths
+        postings = np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())
+        return np.bincount(
+            self._docs[postings],
+            weights=self._weights[postings] * np.repeat(weights, lengths),
+            minlength=len(self._doc_fdc),
+        )
+
+    def match(self, name: str, k: int = 5) -> list[MatchCandidate]:
+        """Best k distinct USDA foods for an Italian (or English) ingredient name."""
+        return self._match(clean_name(name), k)
+
+    def _match(self, key: str, k: int) -> list[MatchCandidate]:
+        if key in self._aliases:
+            fdc_id = self._aliases[key]
+            doc = int(np.flatnonzero(self._doc_fdc[:self._synonym_start] == fdc_id)[0])
+            return [MatchCandidate(str(fdc_id), self._description(doc), 1.0, "feedback")]
+
+        scores = self._scores(clean_name(self._rewrites[key]) if key in self._rewrites else key)
+        top = np.argpartition(-scores, min(4 * k, len(scores) - 1))[:4 * k]
+        candidates, seen = [], set()
+        for doc in top[np.argsort(-scores[top], kind="stable")]:
+            fdc_id, description = int(self._doc_fdc[doc]), self._description(doc)
+            # alimenti lists some foods twice under different FDC IDs
+            if scores[doc] <= 0 or fdc_id in seen or description in seen:
+                continue
+            seen.update((fdc_id, description))
+            source = "synonym" if doc >= self._synonym_start else "usda"
+            candidates.append(MatchCandidate(str(fdc_id), description, float(scores[doc]), source))
+            if len(candidates) == k:
+                break
+        return candidates
+
+    def match_many(self, names: Iterable[str], k: int = 1) -> list[list[MatchCandidate]]:
+        """match() for many names; repeated names are scored once."""
+        results: dict[str, list[MatchCandidate]] = {}
+        keys = [clean_name(name) for name in names]
+        for key in keys:
+            if key not in results:
+                results[key] = self._match(key, k)
+        return [results[key] for key in keys]
+
+    def best(self, name: str, min_score: Optional[float] = None) -> Optional[MatchCandidate]:
+        """Top candidate if it scores at least min_score (default USDA_AUTO_MATCH_MIN_SCORE)."""
+        min_score = Config.USDA_AUTO_MATCH_MIN_SCORE if min_score is None else min_score
+        candidates = self.match(name, k=1)
+        return candidates[0] if candidates and candidates[0].score >= min_score else None
@@ -0,0 +1,113 @@
+"""
+Regression tests for the local pre-parse (services/preparse.py).
+
+Recipe content must survive the boilerplate, menu and duplicate-line filters:
+repeated ingredients in sub-lists, steps mentioning cookies or sharing, and a
+short title next to the navigation menu.
+"""
+
+import re
+
+from recipe_manager.services.preparse import preparse_recipe_text
+
+MENU = ["Home", "Ricette", "Dolci", "Blog", "Accedi"]
+COOKIE_BANNER = (
+    "Questo sito utilizza cookie tecnici e, previo tuo consenso, cookie di profilazione di terze parti. "
+    "Leggi la privacy policy. Accetta Rifiuta"
+)
+
+CROSTATA = "\n".join([
+    *MENU,
+    "Crostata di frutta",
+    COOKIE_BANNER,
+    "Condividi su Facebook",
+    "Stampa",
+    "Una crostata con frolla friabile, crema pasticcera e frutta fresca di stagione.",
+    "Dosi per: 8 persone",
+    "Ingredienti",
+    "Per la frolla",
+    "250 g farina 00",
+    "100 g zucchero",
+    "2 uova",
+    "125 g burro",
+    "Per la crema",
+    "500 ml latte",
+    "100 g zucchero",
+    "2 uova",
+    "Preparazione",
+    "Impastare la farina con il burro, lo zucchero e le uova.",
+    "Cuocere la crema mescolando.",
+    "Mescolando di continuo fino a che si addensa.",
+    "Mescolando di continuo fino a che si addensa.",
+    "Commenti (3)",
+    "Condividi su WhatsApp",
+])
+
+COOKIES = "\n".join([
+    "Chocolate chip cookies",
+    "Share",
+    "Print",
+    "Soft and chewy cookies ready in thirty minutes, with dark chocolate chips.",
+    "Servings: 24",
+    "Ingredients",
+    "250 g flour",
+    "150 g butter",
+    "200 g dark chocolate chips",
+    "Method",
+    "Cream the butter with the sugar, then mix in the flour and chocolate chips.",
+    "Shape the cookie dough into balls and bake for 12 minutes.",
+    "Share among the plates and print the recipe card for later.",
+    "Privacy policy",
+])
+
+
+def content_lines(text: str) -> list[str]:
+    """Lines without the draft's list markers, whether the draft or the cleaned text was returned."""
+    return [re.sub(r"^(- |\d+\. |Title: )", "", line) for line in text.splitlines()]
+
+
+def test_crostata_is_structured():
+    assert preparse_recipe_text(CROSTATA).structured
+
+
+def test_repeated_ingredients_kept_in_both_sub_lists():
+    lines = content_lines(preparse_recipe_text(CROSTATA).text)
+    assert lines.count("2 uova") == 2
+    assert lines.count("100 g zucchero") == 2
+
+
+def test_sub_list_headings_kept():
+    lines = content_lines(preparse_recipe_text(CROSTATA).text)
+    assert "Per la frolla" in lines and "Per la crema" in lines
+
+
+def test_title_next_to_the_menu_kept():
+    assert "Crostata di frutta" in content_lines(preparse_recipe_text(CROSTATA).text)
+
+
+def test_menu_banner_and_share_buttons_dropped():
+    text = preparse_recipe_text(CROSTATA).text
+    assert not any(word in text for word in ("Home", "Blog", "cookie", "Condividi", "Stampa"))
+
+
+def test_repeated_method_line_kept():
+    assert preparse_recipe_text(CROSTATA).text.count("Mescolando di continuo") == 2
+
+
+def test_cookies_is_structured():
+    assert preparse_recipe_text(COOKIES).structured
+
+
+def test_title_mentioning_cookies_kept():
+    assert "Chocolate chip cookies" in content_lines(preparse_recipe_text(COOKIES).text)
+
+
+def test_steps_mentioning_cookies_or_sharing_kept():
+    text = preparse_recipe_text(COOKIES).text
+    assert "Shape the cookie dough into balls" in text
+    assert "Share among the plates" in text
+
+
+def test_share_print_buttons_and_footer_dropped():
+    lines = content_lines(preparse_recipe_text(COOKIES).text)
+    assert not {"Share", "Print", "Privacy policy"} & set(lines)
@@ -1,4 +1,4 @@
-import { integer, real, sqliteTable, text } from "drizzle-orm/sqlite-core";
+import { index, integer, real, sqliteTable, text } from "drizzle-orm/sqlite-core";
 
 // ============================================================================
 // USERS TABLE
@@ -158,7 +158,13 @@ export const recipeIngredients = sqliteTable("recipe_ingredients", {
   notesIt: text("notes_it"), // "peso sgocciolato"
   notesEn: text("notes_en"), // "drained weight"
   order: integer("order").notNull().default(0),
-});
+  // Cooked / raw weight of this line; null falls back to the ingredient's cookedWeightFactor
+  cookingFactor: real("cooking_factor"),
+}, (table) => [
+  index("recipe_ingredients_recipe_id_idx").on(table.recipeId),
+  // Reverse lookup ingredient → recipes (nutrient propagation on ingredient edits)
+  index("recipe_ingredients_ingredient_id_idx").on(table.ingredientId),
+]);
 
 // ============================================================================
 // RECIPE_STEPS TABLE